@@ -0,0 +1,128 @@
+// Autotune the cache blocking of the MatrixOps GEMM kernel for this machine.
+//
+//   bench_gemm [size] [threads]
+//
+// Times size x size products (default 1024, single-threaded) for a grid of tile
+// sizes, checks each against the plain triple loop and prints the fastest as a
+// GEMM_TILES line for the compute service's environment.
+
+#include "matrix_ops.hpp"
+#include "utils/thread_pool.hpp"
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <memory>
+#include <random>
+
+using namespace compute;
+
+namespace {
+
+MatrixOps::Matrix randomMatrix(size_t rows, size_t cols, unsigned seed) {
+    MatrixOps::Matrix m(rows, cols);
+    std::mt19937_64 gen(seed);
+    std::uniform_real_distribution<double> dist(-1.0, 1.0);
+    for (auto& x : m.data) {
+        x = dist(gen);
+    }
+    return m;
+}
+
+MatrixOps::Matrix naiveMultiply(const MatrixOps::Matrix& a, const MatrixOps::Matrix& b) {
+    MatrixOps::Matrix result(a.rows, b.cols);
+    for (size_t i = 0; i < a.rows; ++i) {
+        for (size_t k = 0; k < a.cols; ++k) {
+            double a_ik = a.at(i, k);
+            for (size_t j = 0; j < b.cols; ++j) {
+                result.at(i, j) += a_ik * b.at(k, j);
+            }
+        }
+    }
+    return result;
+}
+
+double maxAbsDiff(const MatrixOps::Matrix& x, const MatrixOps::Matrix& y) {
+    double diff = 0.0;
+    for (size_t i = 0; i < x.data.size(); ++i) {
+        diff = std::max(diff, std::abs(x.data[i] - y.data[i]));
+    }
+    return diff;
+}
+
+// Best of a few runs, in seconds
+template <typename F>
+double timeBest(const F& f, int runs = 3) {
+    double best = 1e300;
+    for (int r = 0; r < runs; ++r) {
+        auto start = std::chrono::steady_clock::now();
+        f();
+        auto end = std::chrono::steady_clock::now();
+        best = std::min(best, std::chrono::duration<double>(end - start).count());
+    }
+    return best;
+}
+
+} // namespace
+
+int main(int argc, char** argv) {
+    size_t n = argc > 1 ? std::strtoul(argv[1], nullptr, 10) : 1024;
+    size_t threads = argc > 2 ? std::strtoul(argv[2], nullptr, 10) : 0;
+
+    std::unique_ptr<utils::ThreadPool> pool;
+    if (threads > 0) {
+        pool = std::make_unique<utils::ThreadPool>(threads);
+    }
+
+    auto a = randomMatrix(n, n, 1);
+    auto b = randomMatrix(n, n, 2);
+    double flops = 2.0 * n * n * n;
+
+    MatrixOps::Matrix reference(0, 0);
+    double naive = timeBest([&]() { reference = naiveMultiply(a, b); }, 1);
+    std::printf("size %zu, threads %zu\n", n, threads);
+    std::printf("%-24s %9.3f s %8.2f GFLOP/s\n", "naive i-k-j", naive, flops / naive * 1e-9);
+
+    if (MatrixOps::hasBlas()) {
+        MatrixOps::GemmConfig blas;
+        double seconds = timeBest([&]() { MatrixOps::multiplyParallel(a, b, pool.get(), blas); });
+        std::printf("%-24s %9.3f s %8.2f GFLOP/s\n", "system BLAS", seconds, flops / seconds * 1e-9);
+    }
+
+    MatrixOps::GemmConfig best;
+    double best_seconds = 1e300;
+    for (size_t mc : {48, 96, 144, 192}) {
+        for (size_t kc : {128, 256, 384, 512}) {
+            for (size_t nc : {512, 2048, 4096}) {
+                MatrixOps::GemmConfig config;
+                config.mc = mc;
+                config.kc = kc;
+                config.nc = nc;
+                config.use_blas = false;
+
+                MatrixOps::Matrix result(0, 0);
+                double seconds = timeBest([&]() {
+                    result = MatrixOps::multiplyParallel(a, b, pool.get(), config);
+                });
+                double diff = maxAbsDiff(result, reference);
+                if (diff > 1e-9 * n) {
+                    std::fprintf(stderr, "mismatch for %zu,%zu,%zu: %g\n", mc, kc, nc, diff);
+                    return 1;
+                }
+
+                char label[64];
+                std::snprintf(label, sizeof(label), "mc=%zu kc=%zu nc=%zu", mc, kc, nc);
+                std::printf("%-24s %9.3f s %8.2f GFLOP/s\n", label, seconds, flops / seconds * 1e-9);
+                if (seconds < best_seconds) {
+                    best_seconds = seconds;
+                    best = config;
+                }
+            }
+        }
+    }
+
+    std::printf("\nfastest: %.2f GFLOP/s (%.1fx naive)\n",
+                flops / best_seconds * 1e-9, naive / best_seconds);
+    std::printf("GEMM_TILES=%zu,%zu,%zu\n", best.mc, best.kc, best.nc);
+    return 0;
+}
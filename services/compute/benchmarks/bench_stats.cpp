@@ -0,0 +1,89 @@
+// Compare StatsOps::analyze against the previous sort-per-percentile approach.
+//
+//   bench_stats [max_size] [threads]
+//
+// Sizes run from 1e3 up to max_size (default 1e8, about 1.6 GB of memory at the
+// top size) with all operations requested, as a full statistics request would.
+
+#include "stats_ops.hpp"
+#include "utils/thread_pool.hpp"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <memory>
+#include <numeric>
+#include <random>
+
+using namespace compute;
+
+namespace {
+
+// The previous implementation: separate passes for min, max and mean, a variance
+// pass, an nth_element copy for the median and a sorted copy per percentile
+double sortBased(const std::vector<double>& data) {
+    double lo = *std::min_element(data.begin(), data.end());
+    double hi = *std::max_element(data.begin(), data.end());
+    double m = std::accumulate(data.begin(), data.end(), 0.0) / data.size();
+    double variance = StatsOps::variance(data, m);
+
+    std::vector<double> copy = data;
+    std::nth_element(copy.begin(), copy.begin() + copy.size() / 2, copy.end());
+    double checksum = lo + hi + variance + copy[copy.size() / 2];
+
+    for (int p : {25, 50, 75, 95, 99}) {
+        std::vector<double> sorted = data;
+        std::sort(sorted.begin(), sorted.end());
+        checksum += sorted[static_cast<size_t>(p / 100.0 * (sorted.size() - 1))];
+    }
+    return checksum;
+}
+
+template <typename F>
+double timeBest(const F& f, int runs) {
+    double best = 1e300;
+    for (int r = 0; r < runs; ++r) {
+        auto start = std::chrono::steady_clock::now();
+        f();
+        auto end = std::chrono::steady_clock::now();
+        best = std::min(best, std::chrono::duration<double>(end - start).count());
+    }
+    return best;
+}
+
+} // namespace
+
+int main(int argc, char** argv) {
+    size_t max_size = argc > 1 ? static_cast<size_t>(std::atof(argv[1])) : 100000000;
+    size_t threads = argc > 2 ? std::strtoul(argv[2], nullptr, 10) : 0;
+
+    std::unique_ptr<utils::ThreadPool> pool;
+    if (threads > 0) {
+        pool = std::make_unique<utils::ThreadPool>(threads);
+    }
+
+    const std::vector<std::string> ops = {"mean", "median", "stddev", "variance", "percentiles"};
+    std::mt19937_64 gen(42);
+    std::lognormal_distribution<double> dist(0.0, 1.0);
+
+    std::printf("threads %zu\n", threads);
+    std::printf("%12s %14s %14s %9s\n", "points", "sort (ms)", "analyze (ms)", "speedup");
+    for (size_t n = 1000; n <= max_size; n *= 10) {
+        std::vector<double> data(n);
+        for (auto& x : data) {
+            x = dist(gen);
+        }
+
+        int runs = n <= 100000 ? 20 : (n <= 10000000 ? 3 : 1);
+        volatile double sink = 0.0;
+        double old_seconds = timeBest([&]() { sink = sortBased(data); }, runs);
+        double new_seconds = timeBest([&]() {
+            sink = StatsOps::analyze(data, ops, pool.get()).percentiles[99];
+        }, runs);
+
+        std::printf("%12zu %14.3f %14.3f %8.1fx\n", n, old_seconds * 1e3, new_seconds * 1e3,
+                    old_seconds / new_seconds);
+    }
+    return 0;
+}
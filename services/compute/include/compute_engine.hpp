@@ -3,6 +3,7 @@
 #include <memory>
 #include <string>
 #include "matrix_ops.hpp"
+#include "sparse_ops.hpp"
 #include "stats_ops.hpp"
 #include "monte_carlo.hpp"
 #include "utils/thread_pool.hpp"
@@ -18,6 +19,16 @@ public:
     MatrixOps::Matrix multiplyMatrices(const MatrixOps::Matrix& a, 
                                        const MatrixOps::Matrix& b);
 
+    // Products with a sparse left operand; the sparse kernel runs unless the dense
+    // GEMM is expected to be faster at the operands' density (see SparseOps::preferDense).
+    // kernel receives the choice: "spmm", "spgemm" or "dense"
+    MatrixOps::Matrix multiplySparse(const SparseOps::CsrMatrix& a,
+                                     const MatrixOps::Matrix& b,
+                                     std::string* kernel = nullptr);
+    SparseOps::CsrMatrix multiplySparse(const SparseOps::CsrMatrix& a,
+                                        const SparseOps::CsrMatrix& b,
+                                        std::string* kernel = nullptr);
+
     // Statistical operations
     StatsOps::Statistics analyzeStatistics(const std::vector<double>& data,
                                           const std::vector<std::string>& operations);
@@ -26,7 +37,8 @@ public:
     MonteCarlo::SimulationResult runMonteCarlo(size_t iterations, 
                                               int dimensions,
                                               int seed,
-                                              const std::string& type);
+                                              const std::string& type,
+                                              const std::string& sampling = "pseudo_random");
 
     // Vector operations
     double dotProduct(const std::vector<double>& a, const std::vector<double>& b);
@@ -3,9 +3,14 @@
 #include <vector>
 #include <memory>
 #include <chrono>
+#include <string>
 
 namespace compute {
 
+namespace utils {
+class ThreadPool;
+}
+
 class MatrixOps {
 public:
     struct Matrix {
@@ -24,11 +29,37 @@ public:
         }
     };
 
-    // Matrix multiplication with optimization
+    // Cache blocking of the GEMM kernel: C is computed in mc x nc blocks, each from
+    // packed panels of A (mc x kc) and B (kc x nc). Tune with benchmarks/bench_gemm.
+    struct GemmConfig {
+        size_t mc = 96;
+        size_t kc = 256;
+        size_t nc = 2048;
+        bool use_blas = true;  // Hand large products to the system CBLAS if compiled in
+    };
+
+    // Register tile of the micro-kernel (rows x columns of C kept in registers)
+    static constexpr size_t kMR = 4;
+    static constexpr size_t kNR = 8;
+
+    // Process-wide tile sizes; set once at startup, before serving requests
+    static const GemmConfig& gemmConfig();
+    static void setGemmConfig(const GemmConfig& config);
+
+    // Parse "mc,kc,nc" (as printed by bench_gemm); throws std::invalid_argument
+    static GemmConfig parseGemmConfig(const std::string& spec);
+
+    // True when built against a system CBLAS
+    static bool hasBlas();
+
+    // Matrix multiplication (blocked, packed kernel)
     static Matrix multiply(const Matrix& a, const Matrix& b);
+    static Matrix multiply(const Matrix& a, const Matrix& b, const GemmConfig& config);
     
-    // Parallel matrix multiplication
-    static Matrix multiplyParallel(const Matrix& a, const Matrix& b, size_t num_threads = 4);
+    // Matrix multiplication with row blocks of C spread over the thread pool
+    static Matrix multiplyParallel(const Matrix& a, const Matrix& b, utils::ThreadPool* pool);
+    static Matrix multiplyParallel(const Matrix& a, const Matrix& b, utils::ThreadPool* pool,
+                                   const GemmConfig& config);
     
     // Transpose matrix
     static Matrix transpose(const Matrix& m);
@@ -40,8 +71,12 @@ public:
     static Matrix scalarMultiply(const Matrix& m, double scalar);
 
 private:
+    // Plain i-k-j loop; cheaper than packing for small products
     static void multiplyBlock(const Matrix& a, const Matrix& b, Matrix& result,
                              size_t start_row, size_t end_row);
+
+    static void gemm(const Matrix& a, const Matrix& b, Matrix& result,
+                     const GemmConfig& config, utils::ThreadPool* pool);
 };
 
 } // namespace compute
@@ -0,0 +1,84 @@
+#pragma once
+
+#include <cstdint>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "neural_network.hpp"
+
+namespace compute {
+
+/**
+ * Cache of loaded ONNX models shared by all requests
+ * Each model is loaded (and its graph optimized) once, at warmup or on
+ * first use. Ort::Session::Run is thread-safe, so concurrent requests
+ * run on the same session instead of loading the model per request.
+ */
+class ModelCache {
+public:
+    struct ModelStats {
+        std::string model_name;
+        bool loaded = false;
+        double load_time_ms = 0.0;
+        uint64_t inference_count = 0;
+        double total_inference_time_ms = 0.0;
+        double max_inference_time_ms = 0.0;
+        std::string error;
+    };
+
+    /**
+     * Constructor
+     * @param model_dir Directory containing <name>_model.onnx files
+     * @param use_gpu Whether sessions use GPU acceleration (if available)
+     */
+    explicit ModelCache(std::string model_dir = "models", bool use_gpu = false);
+
+    /**
+     * Get the engine for a model, loading it on first use
+     * @param model_name Model name, e.g. "mnist"
+     * @return Shared engine; safe to call predict() from several threads
+     * @throws std::invalid_argument for invalid or unknown model names
+     */
+    std::shared_ptr<NeuralNetworkEngine> get(const std::string& model_name);
+
+    /**
+     * Load models and run one inference on each, so the first request
+     * does not pay for loading and graph optimization
+     * @param model_names Models to warm up; failures are logged, not thrown
+     */
+    void warmup(const std::vector<std::string>& model_names);
+
+    /**
+     * Record the duration of one inference run
+     */
+    void record_inference(const std::string& model_name, double duration_ms);
+
+    /**
+     * Get load and inference statistics for every known model
+     */
+    std::vector<ModelStats> stats() const;
+
+    /**
+     * Path of the ONNX file for a model name
+     */
+    std::string model_path(const std::string& model_name) const;
+
+private:
+    struct Entry {
+        std::mutex load_mutex;
+        std::shared_ptr<NeuralNetworkEngine> engine;
+        ModelStats stats;
+    };
+
+    std::string model_dir_;
+    bool use_gpu_;
+    mutable std::mutex mutex_;
+    std::unordered_map<std::string, std::unique_ptr<Entry>> entries_;
+
+    Entry& entry(const std::string& model_name);
+    void load(Entry& entry);
+};
+
+} // namespace compute
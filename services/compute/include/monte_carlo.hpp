@@ -1,54 +1,162 @@
-#pragma once
-
-#include <random>
-#include <vector>
-#include <map>
-#include <string>
-#include <functional>
-
-namespace compute {
-
-class MonteCarlo {
-public:
-    struct SimulationResult {
-        double result = 0.0;
-        double confidence_lower = 0.0;
-        double confidence_upper = 0.0;
-        size_t iterations_completed = 0;
-        std::map<std::string, double> additional_metrics;
-    };
-
-    // Run Monte Carlo simulation
-    static SimulationResult run(size_t iterations, int dimensions, 
-                               int seed, const std::string& type);
-
-private:
-    // Simulation types
-    static SimulationResult estimatePi(size_t iterations, int seed);
-    static SimulationResult priceOption(size_t iterations, int seed, int dimensions);
-    static SimulationResult integrate(size_t iterations, int seed, int dimensions);
-    
-    // Helper functions
-    static double calculateConfidenceInterval(const std::vector<double>& samples, 
-                                              double confidence_level = 0.95);
-    
-    class RandomGenerator {
-    public:
-        explicit RandomGenerator(int seed) : gen_(seed), dist_(0.0, 1.0) {}
-        
-        double uniform() {
-            return dist_(gen_);
-        }
-        
-        double normal(double mean = 0.0, double stddev = 1.0) {
-            std::normal_distribution<double> norm(mean, stddev);
-            return norm(gen_);
-        }
-        
-    private:
-        std::mt19937_64 gen_;
-        std::uniform_real_distribution<double> dist_;
-    };
-};
-
-} // namespace compute
+#pragma once
+
+#include <random>
+#include <vector>
+#include <map>
+#include <string>
+#include <functional>
+#include <cstdint>
+
+namespace compute {
+
+namespace utils {
+class ThreadPool;
+}
+
+class MonteCarlo {
+public:
+    struct SimulationResult {
+        double result = 0.0;
+        double confidence_lower = 0.0;
+        double confidence_upper = 0.0;
+        size_t iterations_completed = 0;
+        // Plain Monte Carlo variance over the variance achieved by the sampling strategy
+        double variance_reduction_factor = 1.0;
+        std::map<std::string, double> additional_metrics;
+    };
+
+    // Running mean/variance that can be merged across chunks (Welford / Chan et al.)
+    struct Moments {
+        size_t count = 0;
+        double mean = 0.0;
+        double m2 = 0.0;  // Sum of squared deviations from the mean
+
+        void add(double x);
+        void merge(const Moments& other);
+        double variance() const;
+        double stdError() const;
+    };
+
+    // Running moments of (x, y) pairs including their covariance, mergeable like Moments
+    struct CoMoments {
+        Moments x;
+        Moments y;
+        double cxy = 0.0;  // Sum of products of deviations from the means
+
+        void add(double x_value, double y_value);
+        void merge(const CoMoments& other);
+        double covariance() const;
+    };
+
+    // Iterations per chunk; each chunk has its own RNG stream derived from
+    // (seed, chunk index), so results depend on the seed but not on the
+    // number of threads the chunks run on
+    static constexpr size_t kChunkSize = 1 << 16;
+
+    // Strata for "stratified" sampling (a 16x16 grid over the first two
+    // coordinates, or 256 intervals of the first one)
+    static constexpr size_t kStrata = 256;
+
+    // Randomly shifted copies of the sequence for "sobol" and "halton";
+    // the spread of their estimates gives the confidence interval
+    static constexpr size_t kReplicates = 16;
+
+    static constexpr int kMaxSobolDimensions = 12;
+    static constexpr int kMaxHaltonDimensions = 32;
+
+    // Run Monte Carlo simulation; chunks run in parallel when a pool is given.
+    // sampling: pseudo_random, antithetic, control_variate, stratified, sobol, halton
+    static SimulationResult run(size_t iterations, int dimensions,
+                               int seed, const std::string& type,
+                               utils::ThreadPool* pool = nullptr,
+                               const std::string& sampling = "pseudo_random");
+
+    // Point of the Sobol sequence (Joe & Kuo direction numbers) as 32 fraction bits
+    static uint32_t sobol(uint64_t index, int dimension);
+
+    // Point of the Halton sequence (radical inverse in the dimension's prime base)
+    static double halton(uint64_t index, int dimension);
+
+    // Standard normal quantile (Acklam's approximation, relative error < 1.2e-9);
+    // p is clamped to [1e-16, 1 - 1e-16] so points on the cube's boundary stay finite
+    static double inverseNormal(double p);
+
+private:
+    class RandomGenerator;
+
+    // Chunk statistics for every sampling strategy, merged like Moments
+    struct SampleStats {
+        Moments values;               // Every function evaluation
+        std::vector<Moments> groups;  // Antithetic pair means, strata or QMC replicates
+        CoMoments control;            // (value, control) pairs for control variates
+
+        void merge(const SampleStats& other);
+    };
+
+    struct Estimate {
+        double mean = 0.0;
+        double std_error = 0.0;
+        double variance_reduction_factor = 1.0;
+        size_t evaluations = 0;
+    };
+
+    // Simulation types
+    static SimulationResult estimatePi(size_t iterations, int seed, utils::ThreadPool* pool,
+                                       const std::string& sampling);
+    static SimulationResult priceOption(size_t iterations, int seed, int dimensions,
+                                        utils::ThreadPool* pool, const std::string& sampling);
+    static SimulationResult integrate(size_t iterations, int seed, int dimensions,
+                                      utils::ThreadPool* pool, const std::string& sampling);
+
+    // Split iterations into chunks, run them (on the pool if given) and merge in chunk order;
+    // chunk(first_index, count, rng) returns the chunk's Stats
+    template <typename Stats, typename ChunkFn>
+    static Stats runChunks(size_t iterations, int seed, utils::ThreadPool* pool,
+                           const ChunkFn& chunk);
+
+    // Evaluate f(u, control) at points u in [0,1)^dimensions drawn by the sampling strategy;
+    // f returns the sample value and stores the control variate's value if control is set
+    template <typename F>
+    static SampleStats sample(const std::string& sampling, size_t iterations, int dimensions,
+                              int seed, utils::ThreadPool* pool, const F& f);
+
+    // Estimate and standard error from the merged statistics
+    static Estimate estimate(const SampleStats& stats, const std::string& sampling,
+                             double control_mean = 0.0);
+
+    // Result and 95% confidence interval of an estimate scaled by a constant factor
+    static SimulationResult toResult(const Estimate& estimate, double scale = 1.0);
+
+    class RandomGenerator {
+    public:
+        explicit RandomGenerator(int seed) : gen_(seed), dist_(0.0, 1.0) {}
+
+        // Independent stream for one chunk of a seeded run
+        RandomGenerator(int seed, uint64_t stream)
+            : dist_(0.0, 1.0) {
+            std::seed_seq seq{static_cast<uint32_t>(seed),
+                              static_cast<uint32_t>(stream),
+                              static_cast<uint32_t>(stream >> 32)};
+            gen_.seed(seq);
+        }
+
+        double uniform() {
+            return dist_(gen_);
+        }
+
+        uint32_t bits() {
+            return static_cast<uint32_t>(gen_() >> 32);
+        }
+
+        double normal(double mean = 0.0, double stddev = 1.0) {
+            return mean + stddev * norm_(gen_);
+        }
+
+    private:
+        std::mt19937_64 gen_;
+        std::uniform_real_distribution<double> dist_;
+        std::normal_distribution<double> norm_{0.0, 1.0};
+    };
+};
+
+} // namespace compute
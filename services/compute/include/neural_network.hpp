@@ -36,6 +36,9 @@ public:
     
     /**
      * Run batch inference on multiple inputs
+     * Inputs are concatenated along the batch axis and run in a single
+     * Session::Run when the model's batch dimension is dynamic; models with
+     * a fixed batch dimension run one input at a time.
      * @param batch_data Vector of input vectors
      * @param input_shape Shape of single input (batch size will be determined automatically)
      * @return Vector of output predictions for each input
@@ -3,20 +3,34 @@
 #include <grpcpp/grpcpp.h>
 #include <memory>
 #include <string>
+#include <vector>
 #include "compute_engine.hpp"
 #include "compute.grpc.pb.h"
 
+#ifdef USE_ONNXRUNTIME
+#include "model_cache.hpp"
+#endif
+
 namespace compute {
 
 class ComputeServiceImpl final : public ComputeService::Service {
 public:
-    explicit ComputeServiceImpl(std::shared_ptr<ComputeEngine> engine);
+    explicit ComputeServiceImpl(std::shared_ptr<ComputeEngine> engine,
+                                const std::string& model_dir = "models");
+
+    // Load ML models before serving so first requests skip model loading
+    void warmupModels(const std::vector<std::string>& model_names);
 
     grpc::Status MultiplyMatrices(
         grpc::ServerContext* context,
         const MatrixMultiplyRequest* request,
         MatrixMultiplyResponse* response) override;
 
+    grpc::Status MultiplySparseMatrices(
+        grpc::ServerContext* context,
+        const SparseMatrixMultiplyRequest* request,
+        SparseMatrixMultiplyResponse* response) override;
+
     grpc::Status AnalyzeStatistics(
         grpc::ServerContext* context,
         const StatsAnalysisRequest* request,
@@ -53,12 +67,17 @@ private:
     std::atomic<uint64_t> total_requests_{0};
     std::mutex metrics_mutex_;
     double total_response_time_{0.0};
+#ifdef USE_ONNXRUNTIME
+    ModelCache models_;
+#endif
 };
 
 class Server {
 public:
-    explicit Server(const std::string& address, int thread_pool_size = 8);
+    explicit Server(const std::string& address, int thread_pool_size = 8,
+                    const std::string& model_dir = "models");
     
+    void warmup(const std::vector<std::string>& model_names);
     void run();
     void shutdown();
 
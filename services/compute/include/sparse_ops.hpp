@@ -0,0 +1,63 @@
+#pragma once
+
+#include <cstdint>
+#include <vector>
+#include "matrix_ops.hpp"
+
+namespace compute {
+
+namespace utils {
+class ThreadPool;
+}
+
+class SparseOps {
+public:
+    // Compressed sparse row matrix: row i holds entries row_offsets[i] to
+    // row_offsets[i + 1] - 1 of col_indices/values, columns ascending
+    struct CsrMatrix {
+        size_t rows = 0;
+        size_t cols = 0;
+        std::vector<size_t> row_offsets;
+        std::vector<uint32_t> col_indices;
+        std::vector<double> values;
+
+        CsrMatrix() : row_offsets(1, 0) {}
+        CsrMatrix(size_t r, size_t c) : rows(r), cols(c), row_offsets(r + 1, 0) {}
+
+        size_t nonZeros() const { return values.size(); }
+        double density() const;
+    };
+
+    // A sparse multiply-add costs about this many multiply-adds of the packed
+    // dense kernel (indirect loads, no register tiling)
+    static constexpr double kSparseCostFactor = 8.0;
+
+    // Rows per parallel task of the sparse kernels
+    static constexpr size_t kRowChunk = 64;
+
+    // Throws std::invalid_argument unless offsets, indices and sizes are consistent
+    static void validate(const CsrMatrix& m);
+
+    static CsrMatrix fromDense(const MatrixOps::Matrix& m);
+    static MatrixOps::Matrix toDense(const CsrMatrix& m);
+
+    // Multiply-adds of the sparse kernels: nnz(A) * cols for sparse x dense,
+    // the sum over A's entries of the matching B row's nonzeros for sparse x sparse
+    static size_t multiplyAdds(const CsrMatrix& a, size_t b_cols);
+    static size_t multiplyAdds(const CsrMatrix& a, const CsrMatrix& b);
+
+    // True when the dense GEMM of the (a.rows x a.cols) x (a.cols x b_cols) product
+    // is expected to be faster than a sparse kernel doing sparse_multiply_adds
+    static bool preferDense(const CsrMatrix& a, size_t b_cols, size_t sparse_multiply_adds);
+
+    // Sparse x dense, row by row: O(nnz(A) * cols(B))
+    static MatrixOps::Matrix multiply(const CsrMatrix& a, const MatrixOps::Matrix& b,
+                                      utils::ThreadPool* pool = nullptr);
+
+    // Sparse x sparse (Gustavson): each result row is accumulated in a dense
+    // row buffer; exact zeros from cancellation are dropped
+    static CsrMatrix multiply(const CsrMatrix& a, const CsrMatrix& b,
+                              utils::ThreadPool* pool = nullptr);
+};
+
+} // namespace compute
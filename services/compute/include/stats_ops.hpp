@@ -9,6 +9,10 @@
 
 namespace compute {
 
+namespace utils {
+class ThreadPool;
+}
+
 class StatsOps {
 public:
     struct Statistics {
@@ -22,9 +26,35 @@ public:
         std::map<int, double> percentiles;
     };
 
-    // Calculate comprehensive statistics
+    // Count, mean, sum of squared deviations, min and max from one pass over the data;
+    // summaries of consecutive ranges merge like MonteCarlo::Moments
+    struct Summary {
+        size_t count = 0;
+        double mean = 0.0;
+        double m2 = 0.0;
+        double min = 0.0;
+        double max = 0.0;
+
+        void merge(const Summary& other);
+        double variance() const;  // Population variance
+    };
+
+    // Inputs of at least this many values are summarized in parallel chunks
+    static constexpr size_t kParallelThreshold = 1 << 18;
+    static constexpr size_t kChunkSize = 1 << 16;
+
+    // Calculate comprehensive statistics; large inputs use the pool when given
     static Statistics analyze(const std::vector<double>& data, 
-                             const std::vector<std::string>& operations);
+                             const std::vector<std::string>& operations,
+                             utils::ThreadPool* pool = nullptr);
+
+    static Summary summarize(const double* data, size_t n);
+    static Summary summarize(const std::vector<double>& data, utils::ThreadPool* pool = nullptr);
+
+    // Linearly interpolated quantiles (probabilities in [0, 1]) from one copy of the
+    // data, selecting the needed order statistics instead of sorting
+    static std::vector<double> quantiles(std::vector<double> data,
+                                         const std::vector<double>& probabilities);
     
     // Individual operations
     static double mean(const std::vector<double>& data);
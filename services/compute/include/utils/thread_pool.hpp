@@ -1,5 +1,7 @@
 #pragma once
 
+#include <algorithm>
+#include <atomic>
 #include <vector>
 #include <queue>
 #include <thread>
@@ -33,6 +35,12 @@ private:
     std::atomic<size_t> active_threads_{0};
 };
 
+// Run body(i) for every i in [0, count). One task per pool thread pulls indices and
+// the calling thread works too, so the call progresses even while the pool is busy
+// with other requests. Runs inline without a pool; rethrows after all tasks finish.
+template<typename F>
+void parallelFor(ThreadPool* pool, size_t count, const F& body);
+
 // Template implementation
 template<typename F, typename... Args>
 auto ThreadPool::enqueue(F&& f, Args&&... args) 
@@ -56,5 +64,32 @@ auto ThreadPool::enqueue(F&& f, Args&&... args)
     return res;
 }
 
+template<typename F>
+void parallelFor(ThreadPool* pool, size_t count, const F& body) {
+    std::atomic<size_t> next{0};
+    auto worker = [&]() {
+        for (size_t i = next++; i < count; i = next++) {
+            body(i);
+        }
+    };
+
+    std::vector<std::future<void>> futures;
+    if (pool != nullptr && count > 1) {
+        size_t tasks = std::min(pool->size(), count - 1);
+        for (size_t t = 0; t < tasks; ++t) {
+            futures.push_back(pool->enqueue(worker));
+        }
+    }
+    worker();
+
+    // Wait for every task before get() may rethrow, since they reference this frame
+    for (auto& future : futures) {
+        future.wait();
+    }
+    for (auto& future : futures) {
+        future.get();
+    }
+}
+
 } // namespace utils
 } // namespace compute
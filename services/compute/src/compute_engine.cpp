@@ -18,28 +18,60 @@ MatrixOps::Matrix ComputeEngine::multiplyMatrices(const MatrixOps::Matrix& a,
     
     // Use parallel multiplication for large matrices
     if (a.rows > 100 && b.cols > 100) {
-        return MatrixOps::multiplyParallel(a, b, thread_pool_size_);
+        return MatrixOps::multiplyParallel(a, b, thread_pool_.get());
     }
     
     return MatrixOps::multiply(a, b);
 }
 
+MatrixOps::Matrix ComputeEngine::multiplySparse(const SparseOps::CsrMatrix& a,
+                                                const MatrixOps::Matrix& b,
+                                                std::string* kernel) {
+    bool dense = a.cols == b.rows &&
+                 SparseOps::preferDense(a, b.cols, SparseOps::multiplyAdds(a, b.cols));
+    if (kernel != nullptr) {
+        *kernel = dense ? "dense" : "spmm";
+    }
+    if (dense) {
+        return multiplyMatrices(SparseOps::toDense(a), b);
+    }
+    total_operations_++;
+    return SparseOps::multiply(a, b, thread_pool_.get());
+}
+
+SparseOps::CsrMatrix ComputeEngine::multiplySparse(const SparseOps::CsrMatrix& a,
+                                                   const SparseOps::CsrMatrix& b,
+                                                   std::string* kernel) {
+    bool dense = a.cols == b.rows &&
+                 SparseOps::preferDense(a, b.cols, SparseOps::multiplyAdds(a, b));
+    if (kernel != nullptr) {
+        *kernel = dense ? "dense" : "spgemm";
+    }
+    if (dense) {
+        return SparseOps::fromDense(
+            multiplyMatrices(SparseOps::toDense(a), SparseOps::toDense(b)));
+    }
+    total_operations_++;
+    return SparseOps::multiply(a, b, thread_pool_.get());
+}
+
 StatsOps::Statistics ComputeEngine::analyzeStatistics(
     const std::vector<double>& data,
     const std::vector<std::string>& operations) {
     
     total_operations_++;
-    return StatsOps::analyze(data, operations);
+    return StatsOps::analyze(data, operations, thread_pool_.get());
 }
 
 MonteCarlo::SimulationResult ComputeEngine::runMonteCarlo(
     size_t iterations,
     int dimensions,
     int seed,
-    const std::string& type) {
+    const std::string& type,
+    const std::string& sampling) {
     
     total_operations_++;
-    return MonteCarlo::run(iterations, dimensions, seed, type);
+    return MonteCarlo::run(iterations, dimensions, seed, type, thread_pool_.get(), sampling);
 }
 
 double ComputeEngine::dotProduct(const std::vector<double>& a,
@@ -1,8 +1,12 @@
 #include "server.hpp"
+#include "matrix_ops.hpp"
 #include "utils/logger.hpp"
 #include <csignal>
 #include <memory>
 #include <cstdlib>
+#include <sstream>
+#include <string>
+#include <vector>
 
 namespace {
     std::unique_ptr<compute::Server> g_server;
@@ -41,6 +45,20 @@ int main(int argc, char** argv) {
     const char* threads_env = std::getenv("THREAD_POOL_SIZE");
     int thread_pool_size = threads_env ? std::atoi(threads_env) : 8;
     
+    const char* model_dir_env = std::getenv("MODEL_DIR");
+    std::string model_dir = model_dir_env ? model_dir_env : "models";
+    
+    // Models loaded before serving; comma-separated, empty to disable warmup
+    const char* models_env = std::getenv("ML_WARMUP_MODELS");
+    std::vector<std::string> warmup_models;
+    std::stringstream models_stream(models_env ? models_env : "mnist");
+    for (std::string name; std::getline(models_stream, name, ',');) {
+        if (!name.empty()) warmup_models.push_back(name);
+    }
+    
+    // GEMM cache blocking as "mc,kc,nc", e.g. the line printed by bench_gemm
+    const char* gemm_tiles_env = std::getenv("GEMM_TILES");
+    
     std::string server_address = "0.0.0.0:" + port;
     
     LOG_INFO("=== Compute Service Starting ===");
@@ -48,7 +66,15 @@ int main(int argc, char** argv) {
     LOG_INFO("Thread pool size:", thread_pool_size);
     
     try {
-        g_server = std::make_unique<compute::Server>(server_address, thread_pool_size);
+        if (gemm_tiles_env) {
+            compute::MatrixOps::setGemmConfig(compute::MatrixOps::parseGemmConfig(gemm_tiles_env));
+        }
+        const auto& gemm = compute::MatrixOps::gemmConfig();
+        LOG_INFO("GEMM tiles:", gemm.mc, gemm.kc, gemm.nc,
+                 compute::MatrixOps::hasBlas() ? "(system BLAS for large products)" : "");
+        
+        g_server = std::make_unique<compute::Server>(server_address, thread_pool_size, model_dir);
+        g_server->warmup(warmup_models);
         g_server->run();
     } catch (const std::exception& e) {
         LOG_ERROR("Fatal error:", e.what());
@@ -1,61 +1,228 @@
 #include "matrix_ops.hpp"
 #include "utils/logger.hpp"
+#include "utils/thread_pool.hpp"
+#include <algorithm>
+#include <sstream>
 #include <stdexcept>
-#include <thread>
-#include <future>
+
+#ifdef USE_CBLAS
+#include <cblas.h>
+#endif
 
 namespace compute {
 
-MatrixOps::Matrix MatrixOps::multiply(const Matrix& a, const Matrix& b) {
-    if (a.cols != b.rows) {
-        throw std::invalid_argument("Matrix dimensions don't match for multiplication");
+namespace {
+
+// Products with fewer multiply-adds than this skip packing and BLAS
+constexpr size_t kSmallProduct = 64 * 64 * 64;
+
+MatrixOps::GemmConfig g_gemm_config;
+
+size_t roundUp(size_t value, size_t multiple) {
+    return (value + multiple - 1) / multiple * multiple;
+}
+
+// Copy rows [row, row + mb) x columns [col, col + kb) of A as kMR-row slivers,
+// each stored column by column and zero-padded to kMR rows
+void packA(const MatrixOps::Matrix& a, size_t row, size_t col, size_t mb, size_t kb,
+           double* packed) {
+    constexpr size_t MR = MatrixOps::kMR;
+    for (size_t i0 = 0; i0 < mb; i0 += MR) {
+        size_t rows = std::min(MR, mb - i0);
+        for (size_t p = 0; p < kb; ++p) {
+            for (size_t i = 0; i < MR; ++i) {
+                *packed++ = i < rows ? a.at(row + i0 + i, col + p) : 0.0;
+            }
+        }
     }
+}
 
-    Matrix result(a.rows, b.cols);
-    
-    // Cache-friendly matrix multiplication
-    for (size_t i = 0; i < a.rows; ++i) {
-        for (size_t k = 0; k < a.cols; ++k) {
-            double a_ik = a.at(i, k);
-            for (size_t j = 0; j < b.cols; ++j) {
-                result.at(i, j) += a_ik * b.at(k, j);
+// Copy rows [row, row + kb) x columns [col, col + nb) of B as kNR-column slivers,
+// each stored row by row and zero-padded to kNR columns
+void packB(const MatrixOps::Matrix& b, size_t row, size_t col, size_t kb, size_t nb,
+           double* packed) {
+    constexpr size_t NR = MatrixOps::kNR;
+    for (size_t j0 = 0; j0 < nb; j0 += NR) {
+        size_t cols = std::min(NR, nb - j0);
+        for (size_t p = 0; p < kb; ++p) {
+            const double* src = &b.at(row + p, col + j0);
+            for (size_t j = 0; j < NR; ++j) {
+                *packed++ = j < cols ? src[j] : 0.0;
             }
         }
     }
-    
-    return result;
 }
 
-MatrixOps::Matrix MatrixOps::multiplyParallel(const Matrix& a, const Matrix& b, size_t num_threads) {
+// C[0:rows, 0:cols] += A sliver * B sliver. The kMR x kNR accumulator has
+// compile-time bounds, so the compiler keeps it in vector registers
+void microKernel(size_t kb, const double* __restrict a, const double* __restrict b,
+                 double* c, size_t ldc, size_t rows, size_t cols) {
+    constexpr size_t MR = MatrixOps::kMR;
+    constexpr size_t NR = MatrixOps::kNR;
+    double acc[MR][NR] = {};
+
+    for (size_t p = 0; p < kb; ++p) {
+        for (size_t i = 0; i < MR; ++i) {
+            double a_ip = a[i];
+            for (size_t j = 0; j < NR; ++j) {
+                acc[i][j] += a_ip * b[j];
+            }
+        }
+        a += MR;
+        b += NR;
+    }
+
+    for (size_t i = 0; i < rows; ++i) {
+        for (size_t j = 0; j < cols; ++j) {
+            c[i * ldc + j] += acc[i][j];
+        }
+    }
+}
+
+#ifdef USE_CBLAS
+void blasMultiply(const MatrixOps::Matrix& a, const MatrixOps::Matrix& b,
+                  MatrixOps::Matrix& result) {
+    cblas_dgemm(CblasRowMajor, CblasNoTrans, CblasNoTrans,
+                static_cast<int>(a.rows), static_cast<int>(b.cols), static_cast<int>(a.cols),
+                1.0, a.data.data(), static_cast<int>(a.cols),
+                b.data.data(), static_cast<int>(b.cols),
+                0.0, result.data.data(), static_cast<int>(result.cols));
+}
+#endif
+
+bool isSmallProduct(const MatrixOps::Matrix& a, const MatrixOps::Matrix& b) {
+    return a.rows * a.cols * b.cols < kSmallProduct;
+}
+
+} // namespace
+
+const MatrixOps::GemmConfig& MatrixOps::gemmConfig() {
+    return g_gemm_config;
+}
+
+void MatrixOps::setGemmConfig(const GemmConfig& config) {
+    if (config.mc == 0 || config.kc == 0 || config.nc == 0) {
+        throw std::invalid_argument("GEMM tile sizes must be positive");
+    }
+
+    // Blocks of C are whole register tiles
+    g_gemm_config = config;
+    g_gemm_config.mc = roundUp(config.mc, kMR);
+    g_gemm_config.nc = roundUp(config.nc, kNR);
+}
+
+MatrixOps::GemmConfig MatrixOps::parseGemmConfig(const std::string& spec) {
+    std::vector<size_t> values;
+    std::stringstream stream(spec);
+    try {
+        for (std::string field; std::getline(stream, field, ',');) {
+            values.push_back(std::stoul(field));
+        }
+    } catch (const std::exception&) {
+        values.clear();
+    }
+
+    if (values.size() != 3) {
+        throw std::invalid_argument("GEMM tiles must be given as mc,kc,nc: " + spec);
+    }
+
+    GemmConfig config;
+    config.mc = values[0];
+    config.kc = values[1];
+    config.nc = values[2];
+    return config;
+}
+
+bool MatrixOps::hasBlas() {
+#ifdef USE_CBLAS
+    return true;
+#else
+    return false;
+#endif
+}
+
+MatrixOps::Matrix MatrixOps::multiply(const Matrix& a, const Matrix& b) {
+    return multiply(a, b, gemmConfig());
+}
+
+MatrixOps::Matrix MatrixOps::multiply(const Matrix& a, const Matrix& b,
+                                      const GemmConfig& config) {
+    return multiplyParallel(a, b, nullptr, config);
+}
+
+MatrixOps::Matrix MatrixOps::multiplyParallel(const Matrix& a, const Matrix& b,
+                                              utils::ThreadPool* pool) {
+    return multiplyParallel(a, b, pool, gemmConfig());
+}
+
+MatrixOps::Matrix MatrixOps::multiplyParallel(const Matrix& a, const Matrix& b,
+                                              utils::ThreadPool* pool,
+                                              const GemmConfig& config) {
     if (a.cols != b.rows) {
         throw std::invalid_argument("Matrix dimensions don't match for multiplication");
     }
 
     Matrix result(a.rows, b.cols);
-    
-    // Determine rows per thread
-    size_t rows_per_thread = a.rows / num_threads;
-    std::vector<std::future<void>> futures;
-    
-    for (size_t t = 0; t < num_threads; ++t) {
-        size_t start_row = t * rows_per_thread;
-        size_t end_row = (t == num_threads - 1) ? a.rows : (t + 1) * rows_per_thread;
-        
-        futures.push_back(std::async(std::launch::async, 
-            [&a, &b, &result, start_row, end_row]() {
-                multiplyBlock(a, b, result, start_row, end_row);
-            }
-        ));
+
+    if (isSmallProduct(a, b)) {
+        multiplyBlock(a, b, result, 0, a.rows);
+        return result;
     }
-    
-    // Wait for all threads to complete
-    for (auto& future : futures) {
-        future.get();
+
+#ifdef USE_CBLAS
+    // The BLAS library runs its own threads
+    if (config.use_blas) {
+        blasMultiply(a, b, result);
+        return result;
     }
-    
+#endif
+
+    gemm(a, b, result, config, pool);
     return result;
 }
 
+void MatrixOps::gemm(const Matrix& a, const Matrix& b, Matrix& result,
+                     const GemmConfig& config, utils::ThreadPool* pool) {
+    size_t M = a.rows;
+    size_t K = a.cols;
+    size_t N = b.cols;
+    size_t mc = roundUp(config.mc, kMR);
+    size_t kc = config.kc;
+    size_t nc = roundUp(config.nc, kNR);
+    size_t row_blocks = (M + mc - 1) / mc;
+
+    std::vector<double> packed_b(kc * roundUp(std::min(nc, N), kNR));
+
+    for (size_t jc = 0; jc < N; jc += nc) {
+        size_t nb = std::min(nc, N - jc);
+
+        for (size_t pc = 0; pc < K; pc += kc) {
+            size_t kb = std::min(kc, K - pc);
+
+            // The B panel is shared; each task packs and multiplies its own block of A
+            packB(b, pc, jc, kb, nb, packed_b.data());
+
+            utils::parallelFor(pool, row_blocks, [&](size_t block) {
+                thread_local std::vector<double> packed_a;
+
+                size_t ic = block * mc;
+                size_t mb = std::min(mc, M - ic);
+                packed_a.resize(std::max(packed_a.size(), roundUp(mb, kMR) * kb));
+                packA(a, ic, pc, mb, kb, packed_a.data());
+
+                // The B sliver stays in L1 while the A slivers stream from L2
+                for (size_t jr = 0; jr < nb; jr += kNR) {
+                    for (size_t ir = 0; ir < mb; ir += kMR) {
+                        microKernel(kb, &packed_a[ir * kb], &packed_b[jr * kb],
+                                    &result.at(ic + ir, jc + jr), N,
+                                    std::min(kMR, mb - ir), std::min(kNR, nb - jr));
+                    }
+                }
+            });
+        }
+    }
+}
+
 void MatrixOps::multiplyBlock(const Matrix& a, const Matrix& b, Matrix& result,
                               size_t start_row, size_t end_row) {
     for (size_t i = start_row; i < end_row; ++i) {
@@ -0,0 +1,133 @@
+#include "model_cache.hpp"
+#include "utils/logger.hpp"
+#include <algorithm>
+#include <cctype>
+#include <chrono>
+#include <filesystem>
+#include <numeric>
+#include <stdexcept>
+
+namespace compute {
+
+ModelCache::ModelCache(std::string model_dir, bool use_gpu)
+    : model_dir_(std::move(model_dir)), use_gpu_(use_gpu) {
+}
+
+std::string ModelCache::model_path(const std::string& model_name) const {
+    return model_dir_ + "/" + model_name + "_model.onnx";
+}
+
+ModelCache::Entry& ModelCache::entry(const std::string& model_name) {
+    std::lock_guard<std::mutex> lock(mutex_);
+
+    auto it = entries_.find(model_name);
+    if (it != entries_.end()) {
+        return *it->second;
+    }
+
+    // Model names become file names; only known models get an entry
+    bool valid = !model_name.empty() && std::all_of(
+        model_name.begin(), model_name.end(),
+        [](unsigned char c) { return std::isalnum(c) || c == '_' || c == '-'; });
+    if (!valid) {
+        throw std::invalid_argument("Invalid model name: " + model_name);
+    }
+    if (!std::filesystem::exists(model_path(model_name))) {
+        throw std::invalid_argument("Unknown model: " + model_name);
+    }
+
+    auto created = std::make_unique<Entry>();
+    created->stats.model_name = model_name;
+    auto& result = *created;
+    entries_.emplace(model_name, std::move(created));
+    return result;
+}
+
+void ModelCache::load(Entry& entry) {
+    const std::string& model_name = entry.stats.model_name;
+    auto start = std::chrono::steady_clock::now();
+
+    try {
+        auto engine = std::make_shared<NeuralNetworkEngine>(model_path(model_name), use_gpu_);
+        auto end = std::chrono::steady_clock::now();
+        double load_ms = std::chrono::duration<double, std::milli>(end - start).count();
+
+        {
+            std::lock_guard<std::mutex> lock(mutex_);
+            entry.stats.loaded = true;
+            entry.stats.load_time_ms = load_ms;
+            entry.stats.error.clear();
+        }
+        entry.engine = std::move(engine);
+        LOG_INFO("Model", model_name, "loaded in", load_ms, "ms");
+
+    } catch (const std::exception& e) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        entry.stats.error = e.what();
+        throw;
+    }
+}
+
+std::shared_ptr<NeuralNetworkEngine> ModelCache::get(const std::string& model_name) {
+    auto& model = entry(model_name);
+
+    // Concurrent first requests wait for a single load instead of each loading
+    std::lock_guard<std::mutex> lock(model.load_mutex);
+    if (!model.engine) {
+        load(model);
+    }
+    return model.engine;
+}
+
+void ModelCache::warmup(const std::vector<std::string>& model_names) {
+    for (const auto& model_name : model_names) {
+        try {
+            auto engine = get(model_name);
+
+            // One run with a zero input; dynamic dimensions (batch) set to 1
+            auto shape = engine->get_input_shape();
+            for (auto& dim : shape) {
+                if (dim <= 0) dim = 1;
+            }
+            int64_t size = std::accumulate(
+                shape.begin(), shape.end(), 1LL, std::multiplies<int64_t>());
+
+            auto start = std::chrono::steady_clock::now();
+            engine->predict(std::vector<float>(size, 0.0f), shape);
+            auto end = std::chrono::steady_clock::now();
+
+            LOG_INFO("Model", model_name, "warmed up, first inference",
+                     std::chrono::duration<double, std::milli>(end - start).count(), "ms");
+        } catch (const std::exception& e) {
+            LOG_WARNING("Warmup of model", model_name, "failed:", e.what());
+        }
+    }
+}
+
+void ModelCache::record_inference(const std::string& model_name, double duration_ms) {
+    std::lock_guard<std::mutex> lock(mutex_);
+
+    auto it = entries_.find(model_name);
+    if (it == entries_.end()) {
+        return;
+    }
+    auto& stats = it->second->stats;
+    stats.inference_count++;
+    stats.total_inference_time_ms += duration_ms;
+    stats.max_inference_time_ms = std::max(stats.max_inference_time_ms, duration_ms);
+}
+
+std::vector<ModelCache::ModelStats> ModelCache::stats() const {
+    std::lock_guard<std::mutex> lock(mutex_);
+
+    std::vector<ModelStats> result;
+    result.reserve(entries_.size());
+    for (const auto& [name, model] : entries_) {
+        result.push_back(model->stats);
+    }
+    std::sort(result.begin(), result.end(),
+              [](const auto& a, const auto& b) { return a.model_name < b.model_name; });
+    return result;
+}
+
+} // namespace compute
@@ -1,162 +1,525 @@
-#include "monte_carlo.hpp"
-#include "stats_ops.hpp"
-#include "utils/logger.hpp"
-#include <cmath>
-#include <algorithm>
-#include <stdexcept>
-
-namespace compute {
-
-MonteCarlo::SimulationResult MonteCarlo::run(size_t iterations, int dimensions,
-                                             int seed, const std::string& type) {
-    LOG_INFO("Running Monte Carlo simulation:", type, "iterations:", iterations);
-    
-    if (type == "pi_estimation") {
-        return estimatePi(iterations, seed);
-    } else if (type == "option_pricing") {
-        return priceOption(iterations, seed, dimensions);
-    } else if (type == "integration") {
-        return integrate(iterations, seed, dimensions);
-    }
-    
-    throw std::invalid_argument("Unknown simulation type: " + type);
-}
-
-MonteCarlo::SimulationResult MonteCarlo::estimatePi(size_t iterations, int seed) {
-    RandomGenerator rng(seed);
-    size_t inside_circle = 0;
-    std::vector<double> estimates;
-    
-    // Run simulation with periodic estimates
-    size_t checkpoint = iterations / 100;
-    if (checkpoint == 0) checkpoint = 1;
-    
-    for (size_t i = 0; i < iterations; ++i) {
-        double x = rng.uniform();
-        double y = rng.uniform();
-        
-        if (x * x + y * y <= 1.0) {
-            inside_circle++;
-        }
-        
-        if ((i + 1) % checkpoint == 0) {
-            double pi_estimate = 4.0 * inside_circle / (i + 1);
-            estimates.push_back(pi_estimate);
-        }
-    }
-    
-    SimulationResult result;
-    result.result = 4.0 * inside_circle / iterations;
-    result.iterations_completed = iterations;
-    
-    // Calculate confidence interval
-    double mean = StatsOps::mean(estimates);
-    double stddev = StatsOps::stddev(estimates, mean);
-    double margin = 1.96 * stddev / std::sqrt(estimates.size());
-    
-    result.confidence_lower = mean - margin;
-    result.confidence_upper = mean + margin;
-    result.additional_metrics["actual_pi"] = M_PI;
-    result.additional_metrics["error"] = std::abs(result.result - M_PI);
-    result.additional_metrics["error_percentage"] = 
-        std::abs(result.result - M_PI) / M_PI * 100.0;
-    
-    return result;
-}
-
-MonteCarlo::SimulationResult MonteCarlo::priceOption(size_t iterations, int seed, 
-                                                     int dimensions) {
-    RandomGenerator rng(seed);
-    
-    // European call option parameters
-    double S0 = 100.0;      // Initial stock price
-    double K = 100.0;       // Strike price
-    double r = 0.05;        // Risk-free rate
-    double sigma = 0.2;     // Volatility
-    double T = 1.0;         // Time to maturity
-    int steps = dimensions; // Time steps
-    
-    std::vector<double> payoffs;
-    payoffs.reserve(iterations);
-    
-    double dt = T / steps;
-    double drift = (r - 0.5 * sigma * sigma) * dt;
-    double diffusion = sigma * std::sqrt(dt);
-    
-    for (size_t i = 0; i < iterations; ++i) {
-        double S = S0;
-        
-        // Simulate price path
-        for (int step = 0; step < steps; ++step) {
-            double Z = rng.normal();
-            S *= std::exp(drift + diffusion * Z);
-        }
-        
-        // Calculate payoff
-        double payoff = std::max(S - K, 0.0);
-        payoffs.push_back(payoff);
-    }
-    
-    // Discount to present value
-    double discount = std::exp(-r * T);
-    double option_price = discount * StatsOps::mean(payoffs);
-    
-    SimulationResult result;
-    result.result = option_price;
-    result.iterations_completed = iterations;
-    
-    // Calculate confidence interval
-    double stddev = StatsOps::stddev(payoffs, StatsOps::mean(payoffs));
-    double std_error = stddev / std::sqrt(iterations);
-    double margin = 1.96 * discount * std_error;
-    
-    result.confidence_lower = option_price - margin;
-    result.confidence_upper = option_price + margin;
-    result.additional_metrics["strike"] = K;
-    result.additional_metrics["spot"] = S0;
-    result.additional_metrics["volatility"] = sigma;
-    result.additional_metrics["time_steps"] = static_cast<double>(steps);
-    
-    return result;
-}
-
-MonteCarlo::SimulationResult MonteCarlo::integrate(size_t iterations, int seed, 
-                                                   int dimensions) {
-    RandomGenerator rng(seed);
-    
-    // Integrate f(x) = exp(-x^2) over [0,1]^dimensions
-    std::vector<double> samples;
-    samples.reserve(iterations);
-    
-    for (size_t i = 0; i < iterations; ++i) {
-        double sum_sq = 0.0;
-        
-        for (int d = 0; d < dimensions; ++d) {
-            double x = rng.uniform();
-            sum_sq += x * x;
-        }
-        
-        double value = std::exp(-sum_sq);
-        samples.push_back(value);
-    }
-    
-    double integral = StatsOps::mean(samples);
-    
-    SimulationResult result;
-    result.result = integral;
-    result.iterations_completed = iterations;
-    
-    // Calculate confidence interval
-    double stddev = StatsOps::stddev(samples, integral);
-    double std_error = stddev / std::sqrt(iterations);
-    double margin = 1.96 * std_error;
-    
-    result.confidence_lower = integral - margin;
-    result.confidence_upper = integral + margin;
-    result.additional_metrics["dimensions"] = static_cast<double>(dimensions);
-    result.additional_metrics["std_error"] = std_error;
-    
-    return result;
-}
-
-} // namespace compute
+#include "monte_carlo.hpp"
+#include "utils/logger.hpp"
+#include "utils/thread_pool.hpp"
+#include <cmath>
+#include <algorithm>
+#include <array>
+#include <stdexcept>
+
+namespace compute {
+
+namespace {
+
+const char* const kSamplingStrategies[] = {
+    "pseudo_random", "antithetic", "control_variate", "stratified", "sobol", "halton"
+};
+
+// Cells per axis of the stratified grid over the first two coordinates
+constexpr size_t kStrataPerAxis = 16;
+
+// Sobol direction numbers (Joe & Kuo, new-joe-kuo-6.21201) for dimensions 2..12:
+// degree s, coefficients a and initial numbers m_1..m_s
+struct SobolParams {
+    int s;
+    uint32_t a;
+    uint32_t m[5];
+};
+
+constexpr SobolParams kSobolParams[] = {
+    {1, 0, {1}},
+    {2, 1, {1, 3}},
+    {3, 1, {1, 3, 1}},
+    {3, 2, {1, 1, 1}},
+    {4, 1, {1, 1, 3, 3}},
+    {4, 4, {1, 3, 5, 13}},
+    {5, 2, {1, 1, 5, 5, 17}},
+    {5, 4, {1, 1, 5, 5, 5}},
+    {5, 7, {1, 1, 7, 11, 19}},
+    {5, 11, {1, 1, 5, 1, 1}},
+    {5, 13, {1, 1, 1, 3, 11}},
+};
+
+constexpr int kHaltonPrimes[] = {
+    2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53,
+    59, 61, 67, 71, 73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131
+};
+
+using DirectionNumbers = std::array<std::array<uint32_t, 32>, MonteCarlo::kMaxSobolDimensions>;
+
+DirectionNumbers buildDirectionNumbers() {
+    DirectionNumbers v{};
+
+    // The first dimension is the van der Corput sequence in base 2
+    for (int k = 0; k < 32; ++k) {
+        v[0][k] = 1u << (31 - k);
+    }
+
+    for (int d = 1; d < MonteCarlo::kMaxSobolDimensions; ++d) {
+        const SobolParams& params = kSobolParams[d - 1];
+        int s = params.s;
+        for (int k = 0; k < 32; ++k) {
+            if (k < s) {
+                v[d][k] = params.m[k] << (31 - k);
+                continue;
+            }
+            uint32_t value = v[d][k - s] ^ (v[d][k - s] >> s);
+            for (int j = 1; j < s; ++j) {
+                if ((params.a >> (s - 1 - j)) & 1u) {
+                    value ^= v[d][k - j];
+                }
+            }
+            v[d][k] = value;
+        }
+    }
+    return v;
+}
+
+} // namespace
+
+void MonteCarlo::Moments::add(double x) {
+    count++;
+    double delta = x - mean;
+    mean += delta / count;
+    m2 += delta * (x - mean);
+}
+
+void MonteCarlo::Moments::merge(const Moments& other) {
+    if (other.count == 0) return;
+    if (count == 0) {
+        *this = other;
+        return;
+    }
+
+    double total = static_cast<double>(count + other.count);
+    double delta = other.mean - mean;
+    mean += delta * other.count / total;
+    m2 += other.m2 + delta * delta * count * other.count / total;
+    count += other.count;
+}
+
+double MonteCarlo::Moments::variance() const {
+    return count > 1 ? m2 / (count - 1) : 0.0;
+}
+
+double MonteCarlo::Moments::stdError() const {
+    return count > 0 ? std::sqrt(variance() / count) : 0.0;
+}
+
+void MonteCarlo::CoMoments::add(double x_value, double y_value) {
+    double dx = x_value - x.mean;
+    x.add(x_value);
+    y.add(y_value);
+    cxy += dx * (y_value - y.mean);
+}
+
+void MonteCarlo::CoMoments::merge(const CoMoments& other) {
+    if (other.x.count == 0) return;
+    if (x.count == 0) {
+        *this = other;
+        return;
+    }
+
+    double total = static_cast<double>(x.count + other.x.count);
+    double dx = other.x.mean - x.mean;
+    double dy = other.y.mean - y.mean;
+    cxy += other.cxy + dx * dy * x.count * other.x.count / total;
+    x.merge(other.x);
+    y.merge(other.y);
+}
+
+double MonteCarlo::CoMoments::covariance() const {
+    return x.count > 1 ? cxy / (x.count - 1) : 0.0;
+}
+
+void MonteCarlo::SampleStats::merge(const SampleStats& other) {
+    values.merge(other.values);
+    if (groups.size() < other.groups.size()) {
+        groups.resize(other.groups.size());
+    }
+    for (size_t g = 0; g < other.groups.size(); ++g) {
+        groups[g].merge(other.groups[g]);
+    }
+    control.merge(other.control);
+}
+
+MonteCarlo::SimulationResult MonteCarlo::run(size_t iterations, int dimensions,
+                                             int seed, const std::string& type,
+                                             utils::ThreadPool* pool,
+                                             const std::string& sampling) {
+    std::string strategy = sampling.empty() ? "pseudo_random" : sampling;
+    LOG_INFO("Running Monte Carlo simulation:", type, "sampling:", strategy,
+             "iterations:", iterations);
+
+    if (iterations == 0) {
+        throw std::invalid_argument("Iterations must be positive");
+    }
+    if (std::find(std::begin(kSamplingStrategies), std::end(kSamplingStrategies), strategy) ==
+        std::end(kSamplingStrategies)) {
+        throw std::invalid_argument("Unknown sampling strategy: " + strategy);
+    }
+    if (strategy == "control_variate" && type != "option_pricing") {
+        throw std::invalid_argument("control_variate sampling is only supported for option_pricing");
+    }
+
+    if (type == "pi_estimation") {
+        return estimatePi(iterations, seed, pool, strategy);
+    } else if (type == "option_pricing") {
+        return priceOption(iterations, seed, dimensions, pool, strategy);
+    } else if (type == "integration") {
+        return integrate(iterations, seed, dimensions, pool, strategy);
+    }
+
+    throw std::invalid_argument("Unknown simulation type: " + type);
+}
+
+uint32_t MonteCarlo::sobol(uint64_t index, int dimension) {
+    static const DirectionNumbers directions = buildDirectionNumbers();
+
+    const auto& v = directions.at(dimension);
+    uint32_t x = 0;
+    for (int k = 0; index != 0 && k < 32; ++k, index >>= 1) {
+        if (index & 1) {
+            x ^= v[k];
+        }
+    }
+    return x;
+}
+
+double MonteCarlo::halton(uint64_t index, int dimension) {
+    const uint64_t base = kHaltonPrimes[dimension];
+    double inv_base = 1.0 / base;
+    double factor = inv_base;
+    double x = 0.0;
+    while (index != 0) {
+        x += factor * (index % base);
+        index /= base;
+        factor *= inv_base;
+    }
+    return x;
+}
+
+double MonteCarlo::inverseNormal(double p) {
+    static const double a[] = {-3.969683028665376e+01, 2.209460984245205e+02,
+                               -2.759285104469687e+02, 1.383577518672690e+02,
+                               -3.066479806614716e+01, 2.506628277459239e+00};
+    static const double b[] = {-5.447609879822406e+01, 1.615858368580409e+02,
+                               -1.556989798598866e+02, 6.680131188771972e+01,
+                               -1.328068155288572e+01};
+    static const double c[] = {-7.784894002430293e-03, -3.223964580411365e-01,
+                               -2.400758277161838e+00, -2.549732539343734e+00,
+                               4.374664141464968e+00, 2.938163982698783e+00};
+    static const double d[] = {7.784695709041462e-03, 3.224671290700398e-01,
+                               2.445134137142996e+00, 3.754408661907416e+00};
+    const double p_low = 0.02425;
+
+    p = std::clamp(p, 1e-16, 1.0 - 1e-16);
+
+    if (p < p_low || p > 1.0 - p_low) {
+        // Tails: rational function in sqrt(-2 log(tail probability))
+        double q = std::sqrt(-2.0 * std::log(p < p_low ? p : 1.0 - p));
+        double x = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) /
+                   ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1.0);
+        return p < p_low ? x : -x;
+    }
+
+    double q = p - 0.5;
+    double r = q * q;
+    return (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q /
+           (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1.0);
+}
+
+template <typename Stats, typename ChunkFn>
+Stats MonteCarlo::runChunks(size_t iterations, int seed, utils::ThreadPool* pool,
+                            const ChunkFn& chunk) {
+    size_t num_chunks = (iterations + kChunkSize - 1) / kChunkSize;
+    std::vector<Stats> partials(num_chunks);
+
+    // The chunk index alone decides the RNG stream, whichever thread runs it
+    utils::parallelFor(pool, num_chunks, [&](size_t c) {
+        RandomGenerator rng(seed, c);
+        size_t count = std::min(kChunkSize, iterations - c * kChunkSize);
+        partials[c] = chunk(c * kChunkSize, count, rng);
+    });
+
+    // Merge in chunk order so the result is identical for any thread count
+    Stats total;
+    for (const auto& partial : partials) {
+        total.merge(partial);
+    }
+    return total;
+}
+
+template <typename F>
+MonteCarlo::SampleStats MonteCarlo::sample(const std::string& sampling, size_t iterations,
+                                           int dimensions, int seed, utils::ThreadPool* pool,
+                                           const F& f) {
+    size_t dims = static_cast<size_t>(dimensions);
+
+    if (sampling == "antithetic") {
+        // Every draw u is paired with its mirror image 1 - u
+        size_t pairs = std::max<size_t>(iterations / 2, 1);
+        return runChunks<SampleStats>(pairs, seed, pool,
+                                      [&](size_t, size_t n, RandomGenerator& rng) {
+            SampleStats stats;
+            stats.groups.resize(1);
+            std::vector<double> u(dims), mirror(dims);
+            for (size_t i = 0; i < n; ++i) {
+                for (size_t d = 0; d < dims; ++d) {
+                    u[d] = rng.uniform();
+                    mirror[d] = 1.0 - u[d];
+                }
+                double first = f(u.data(), nullptr);
+                double second = f(mirror.data(), nullptr);
+                stats.values.add(first);
+                stats.values.add(second);
+                stats.groups[0].add(0.5 * (first + second));
+            }
+            return stats;
+        });
+    }
+
+    if (sampling == "stratified") {
+        if (iterations < 2 * kStrata) {
+            throw std::invalid_argument("stratified sampling needs at least " +
+                                        std::to_string(2 * kStrata) + " iterations");
+        }
+        // Samples go to the strata round-robin by global index, so every stratum
+        // gets the same number of samples (give or take one)
+        return runChunks<SampleStats>(iterations, seed, pool,
+                                      [&](size_t first, size_t n, RandomGenerator& rng) {
+            SampleStats stats;
+            stats.groups.resize(kStrata);
+            std::vector<double> u(dims);
+            for (size_t i = 0; i < n; ++i) {
+                size_t stratum = (first + i) % kStrata;
+                for (size_t d = 0; d < dims; ++d) {
+                    u[d] = rng.uniform();
+                }
+                if (dims >= 2) {
+                    u[0] = (stratum % kStrataPerAxis + u[0]) / kStrataPerAxis;
+                    u[1] = (stratum / kStrataPerAxis + u[1]) / kStrataPerAxis;
+                } else {
+                    u[0] = (stratum + u[0]) / kStrata;
+                }
+                double value = f(u.data(), nullptr);
+                stats.values.add(value);
+                stats.groups[stratum].add(value);
+            }
+            return stats;
+        });
+    }
+
+    if (sampling == "sobol" || sampling == "halton") {
+        bool use_sobol = sampling == "sobol";
+        int max_dimensions = use_sobol ? kMaxSobolDimensions : kMaxHaltonDimensions;
+        if (dimensions > max_dimensions) {
+            throw std::invalid_argument(sampling + " sampling supports at most " +
+                                        std::to_string(max_dimensions) + " dimensions");
+        }
+        size_t points = iterations / kReplicates;
+        if (points == 0) {
+            throw std::invalid_argument(sampling + " sampling needs at least " +
+                                        std::to_string(kReplicates) + " iterations");
+        }
+        if (points > UINT32_MAX) {
+            throw std::invalid_argument("Too many iterations for " + sampling + " sampling");
+        }
+
+        // Each replicate is the same point set under its own random shift
+        // (a digital XOR shift for Sobol, a rotation modulo 1 for Halton)
+        RandomGenerator shift_rng(seed);
+        std::vector<uint32_t> shifts(kReplicates * dims);
+        for (auto& shift : shifts) {
+            shift = shift_rng.bits();
+        }
+
+        return runChunks<SampleStats>(points * kReplicates, seed, pool,
+                                      [&](size_t first, size_t n, RandomGenerator&) {
+            SampleStats stats;
+            stats.groups.resize(kReplicates);
+            std::vector<double> u(dims);
+            for (size_t i = 0; i < n; ++i) {
+                size_t replicate = (first + i) / points;
+                uint64_t index = (first + i) % points;
+                const uint32_t* shift = &shifts[replicate * dims];
+                for (size_t d = 0; d < dims; ++d) {
+                    int dim = static_cast<int>(d);
+                    if (use_sobol) {
+                        u[d] = ((sobol(index, dim) ^ shift[d]) + 0.5) * 0x1p-32;
+                    } else {
+                        double x = halton(index, dim) + shift[d] * 0x1p-32;
+                        u[d] = x >= 1.0 ? x - 1.0 : x;
+                    }
+                }
+                double value = f(u.data(), nullptr);
+                stats.values.add(value);
+                stats.groups[replicate].add(value);
+            }
+            return stats;
+        });
+    }
+
+    bool with_control = sampling == "control_variate";
+    return runChunks<SampleStats>(iterations, seed, pool,
+                                  [&](size_t, size_t n, RandomGenerator& rng) {
+        SampleStats stats;
+        std::vector<double> u(dims);
+        for (size_t i = 0; i < n; ++i) {
+            for (size_t d = 0; d < dims; ++d) {
+                u[d] = rng.uniform();
+            }
+            double control = 0.0;
+            double value = f(u.data(), with_control ? &control : nullptr);
+            stats.values.add(value);
+            if (with_control) {
+                stats.control.add(value, control);
+            }
+        }
+        return stats;
+    });
+}
+
+MonteCarlo::Estimate MonteCarlo::estimate(const SampleStats& stats, const std::string& sampling,
+                                          double control_mean) {
+    Estimate result;
+    result.evaluations = stats.values.count;
+
+    // Variance of the plain Monte Carlo mean over the same number of evaluations
+    double plain_variance = stats.values.count > 0
+        ? stats.values.variance() / stats.values.count : 0.0;
+    double variance = plain_variance;
+    result.mean = stats.values.mean;
+
+    if (sampling == "antithetic") {
+        const Moments& pairs = stats.groups[0];
+        result.mean = pairs.mean;
+        variance = pairs.count > 0 ? pairs.variance() / pairs.count : 0.0;
+    } else if (sampling == "control_variate") {
+        // Regression estimator: subtract beta times the control's deviation from its known mean
+        const CoMoments& control = stats.control;
+        double control_variance = control.y.variance();
+        double covariance = control.covariance();
+        double beta = control_variance > 0.0 ? covariance / control_variance : 0.0;
+        double residual_variance = std::max(control.x.variance() - beta * covariance, 0.0);
+        result.mean = control.x.mean - beta * (control.y.mean - control_mean);
+        variance = control.x.count > 0 ? residual_variance / control.x.count : 0.0;
+    } else if (sampling == "stratified") {
+        // Equal-probability strata: average the stratum means and their variances
+        double strata = static_cast<double>(stats.groups.size());
+        double mean = 0.0;
+        variance = 0.0;
+        for (const auto& stratum : stats.groups) {
+            mean += stratum.mean;
+            variance += stratum.variance() / stratum.count;
+        }
+        result.mean = mean / strata;
+        variance /= strata * strata;
+    } else if (sampling == "sobol" || sampling == "halton") {
+        // The replicate estimates are independent, so their spread gives the error
+        Moments replicates;
+        for (const auto& replicate : stats.groups) {
+            replicates.add(replicate.mean);
+        }
+        result.mean = replicates.mean;
+        variance = replicates.variance() / replicates.count;
+    }
+
+    result.std_error = std::sqrt(variance);
+    result.variance_reduction_factor = variance > 0.0 ? plain_variance / variance : 1.0;
+    return result;
+}
+
+MonteCarlo::SimulationResult MonteCarlo::toResult(const Estimate& estimate, double scale) {
+    SimulationResult result;
+    result.result = scale * estimate.mean;
+    result.iterations_completed = estimate.evaluations;
+    result.variance_reduction_factor = estimate.variance_reduction_factor;
+
+    // 95% confidence interval
+    double margin = 1.96 * scale * estimate.std_error;
+    result.confidence_lower = result.result - margin;
+    result.confidence_upper = result.result + margin;
+    return result;
+}
+
+MonteCarlo::SimulationResult MonteCarlo::estimatePi(size_t iterations, int seed,
+                                                    utils::ThreadPool* pool,
+                                                    const std::string& sampling) {
+    // Each sample is 4 if the point falls inside the quarter circle, else 0
+    auto stats = sample(sampling, iterations, 2, seed, pool, [](const double* u, double*) {
+        return u[0] * u[0] + u[1] * u[1] <= 1.0 ? 4.0 : 0.0;
+    });
+
+    SimulationResult result = toResult(estimate(stats, sampling));
+    result.additional_metrics["actual_pi"] = M_PI;
+    result.additional_metrics["error"] = std::abs(result.result - M_PI);
+    result.additional_metrics["error_percentage"] =
+        std::abs(result.result - M_PI) / M_PI * 100.0;
+
+    return result;
+}
+
+MonteCarlo::SimulationResult MonteCarlo::priceOption(size_t iterations, int seed,
+                                                     int dimensions, utils::ThreadPool* pool,
+                                                     const std::string& sampling) {
+    // European call option parameters
+    double S0 = 100.0;      // Initial stock price
+    double K = 100.0;       // Strike price
+    double r = 0.05;        // Risk-free rate
+    double sigma = 0.2;     // Volatility
+    double T = 1.0;         // Time to maturity
+    int steps = std::max(dimensions, 1); // Time steps
+
+    double dt = T / steps;
+    double drift = (r - 0.5 * sigma * sigma) * dt;
+    double diffusion = sigma * std::sqrt(dt);
+
+    // One coordinate of u per time step; the terminal price is the control variate,
+    // with known expectation S0 * exp(r * T)
+    auto stats = sample(sampling, iterations, steps, seed, pool,
+                        [&](const double* u, double* control) {
+        double log_return = 0.0;
+        for (int step = 0; step < steps; ++step) {
+            log_return += drift + diffusion * inverseNormal(u[step]);
+        }
+        double S = S0 * std::exp(log_return);
+        if (control != nullptr) {
+            *control = S;
+        }
+        return std::max(S - K, 0.0);
+    });
+
+    // Discount to present value
+    double discount = std::exp(-r * T);
+    SimulationResult result = toResult(estimate(stats, sampling, S0 * std::exp(r * T)), discount);
+
+    result.additional_metrics["strike"] = K;
+    result.additional_metrics["spot"] = S0;
+    result.additional_metrics["volatility"] = sigma;
+    result.additional_metrics["time_steps"] = static_cast<double>(steps);
+
+    return result;
+}
+
+MonteCarlo::SimulationResult MonteCarlo::integrate(size_t iterations, int seed,
+                                                   int dimensions, utils::ThreadPool* pool,
+                                                   const std::string& sampling) {
+    // Integrate f(x) = exp(-x^2) over [0,1]^dimensions
+    int dims = std::max(dimensions, 1);
+    auto stats = sample(sampling, iterations, dims, seed, pool, [dims](const double* u, double*) {
+        double sum_sq = 0.0;
+        for (int d = 0; d < dims; ++d) {
+            sum_sq += u[d] * u[d];
+        }
+        return std::exp(-sum_sq);
+    });
+
+    Estimate integral = estimate(stats, sampling);
+    SimulationResult result = toResult(integral);
+    result.additional_metrics["dimensions"] = static_cast<double>(dims);
+    result.additional_metrics["std_error"] = integral.std_error;
+
+    return result;
+}
+
+} // namespace compute
@@ -131,8 +131,48 @@ std::vector<std::vector<float>> NeuralNetworkEngine::predict_batch(
     std::vector<std::vector<float>> results;
     results.reserve(batch_data.size());
     
-    for (const auto& input : batch_data) {
-        results.push_back(predict(input, input_shape));
+    if (batch_data.empty()) {
+        return results;
+    }
+    
+    // Fixed batch dimension: the model only accepts its own batch size
+    bool dynamic_batch = !input_shape_.empty() && input_shape_[0] <= 0;
+    if (!dynamic_batch || input_shape.empty() || batch_data.size() == 1) {
+        for (const auto& input : batch_data) {
+            results.push_back(predict(input, input_shape));
+        }
+        return results;
+    }
+    
+    // Concatenate along the batch axis: [n, ...] -> [N * n, ...]
+    size_t item_size = std::accumulate(
+        input_shape.begin(), input_shape.end(), 1LL, std::multiplies<int64_t>());
+    std::vector<float> batch_input;
+    batch_input.reserve(item_size * batch_data.size());
+    for (size_t i = 0; i < batch_data.size(); i++) {
+        if (batch_data[i].size() != item_size) {
+            throw std::invalid_argument(
+                "Batch item " + std::to_string(i) + " size mismatch. Expected: " +
+                std::to_string(item_size) + ", Got: " + std::to_string(batch_data[i].size()));
+        }
+        batch_input.insert(batch_input.end(), batch_data[i].begin(), batch_data[i].end());
+    }
+    
+    std::vector<int64_t> batch_shape(input_shape);
+    batch_shape[0] *= static_cast<int64_t>(batch_data.size());
+    
+    auto output = predict(batch_input, batch_shape);
+    
+    // Split the output back into one slice per input
+    if (output.size() % batch_data.size() != 0) {
+        throw std::runtime_error("Batch output size " + std::to_string(output.size()) +
+                                 " is not divisible by batch size " +
+                                 std::to_string(batch_data.size()));
+    }
+    size_t output_size = output.size() / batch_data.size();
+    for (size_t i = 0; i < batch_data.size(); i++) {
+        auto begin = output.begin() + i * output_size;
+        results.emplace_back(begin, begin + output_size);
     }
     
     return results;
@@ -1,18 +1,140 @@
 #include "server.hpp"
 #include "utils/logger.hpp"
+#include <algorithm>
 #include <chrono>
+#include <stdexcept>
+
+namespace compute {
+
+namespace {
+
+// Correlation IDs sent by the gateway in gRPC metadata (x-request-id and the
+// W3C traceparent header), formatted for log lines
+std::string requestTag(const grpc::ServerContext* context) {
+    const auto& metadata = context->client_metadata();
+    std::string tag;
+    
+    auto request_id = metadata.find("x-request-id");
+    if (request_id != metadata.end()) {
+        tag += "request_id=" + std::string(request_id->second.data(), request_id->second.size());
+    }
+    
+    // traceparent: version-trace_id-parent_id-flags
+    auto traceparent = metadata.find("traceparent");
+    if (traceparent != metadata.end() && traceparent->second.size() >= 35) {
+        std::string value(traceparent->second.data(), traceparent->second.size());
+        if (!tag.empty()) tag += " ";
+        tag += "trace_id=" + value.substr(3, 32);
+    }
+    
+    return tag;
+}
+
+// CSR matrix from its proto form; throws std::invalid_argument if it is inconsistent
+SparseOps::CsrMatrix csrFromProto(const SparseMatrix& proto) {
+    if (proto.rows() < 0 || proto.cols() < 0) {
+        throw std::invalid_argument("Matrix dimensions must not be negative");
+    }
+    SparseOps::CsrMatrix m(proto.rows(), proto.cols());
+    // Negative offsets or indices wrap around and fail validation
+    m.row_offsets.assign(proto.row_offsets().begin(), proto.row_offsets().end());
+    m.col_indices.assign(proto.col_indices().begin(), proto.col_indices().end());
+    m.values.assign(proto.values().begin(), proto.values().end());
+    SparseOps::validate(m);
+    return m;
+}
+
+void csrToProto(const SparseOps::CsrMatrix& m, SparseMatrix* proto) {
+    proto->set_rows(m.rows);
+    proto->set_cols(m.cols);
+    proto->mutable_row_offsets()->Reserve(m.row_offsets.size());
+    for (size_t offset : m.row_offsets) {
+        proto->add_row_offsets(offset);
+    }
+    proto->mutable_col_indices()->Reserve(m.col_indices.size());
+    for (uint32_t col : m.col_indices) {
+        proto->add_col_indices(col);
+    }
+    proto->mutable_values()->Add(m.values.begin(), m.values.end());
+}
+
+void denseToProto(const MatrixOps::Matrix& m, DenseMatrix* proto) {
+    proto->set_rows(m.rows);
+    proto->set_cols(m.cols);
+    proto->mutable_values()->Add(m.data.begin(), m.data.end());
+}
 
 #ifdef USE_ONNXRUNTIME
-#include "neural_network.hpp"
+// Model tensor shapes for the model_info field, e.g. "Input: [-1,1,28,28] Output: [-1,10]"
+std::string modelInfo(const NeuralNetworkEngine& engine) {
+    auto input_shape_model = engine.get_input_shape();
+    auto output_shape_model = engine.get_output_shape();
+    std::string model_info = "Input: [";
+    for (size_t i = 0; i < input_shape_model.size(); i++) {
+        model_info += std::to_string(input_shape_model[i]);
+        if (i < input_shape_model.size() - 1) model_info += ",";
+    }
+    model_info += "] Output: [";
+    for (size_t i = 0; i < output_shape_model.size(); i++) {
+        model_info += std::to_string(output_shape_model[i]);
+        if (i < output_shape_model.size() - 1) model_info += ",";
+    }
+    model_info += "]";
+    return model_info;
+}
+
+// Raw output, probabilities (softmax if requested) and top-k classes of one input
+void setInferenceOutput(const std::vector<float>& output, bool apply_softmax, int top_k,
+                        MLInferenceResponse* response) {
+    std::vector<float> probabilities;
+    if (apply_softmax) {
+        probabilities = NeuralNetworkEngine::softmax(output);
+    } else {
+        probabilities = output;
+    }
+    
+    for (const auto& val : output) {
+        response->add_output(val);
+    }
+    
+    for (const auto& prob : probabilities) {
+        response->add_probabilities(prob);
+    }
+    
+    if (top_k > 0) {
+        for (const auto& [cls, prob] : NeuralNetworkEngine::get_top_k(probabilities, top_k)) {
+            response->add_top_classes(cls);
+            response->add_top_probabilities(prob);
+        }
+    }
+}
 #endif
 
-namespace compute {
+} // namespace
 
-ComputeServiceImpl::ComputeServiceImpl(std::shared_ptr<ComputeEngine> engine)
-    : engine_(engine), start_time_(std::chrono::steady_clock::now()) {
+ComputeServiceImpl::ComputeServiceImpl(std::shared_ptr<ComputeEngine> engine,
+                                       const std::string& model_dir)
+    : engine_(engine), start_time_(std::chrono::steady_clock::now())
+#ifdef USE_ONNXRUNTIME
+    , models_(model_dir)
+#endif
+{
+#ifndef USE_ONNXRUNTIME
+    (void)model_dir;
+#endif
     LOG_INFO("ComputeServiceImpl initialized");
 }
 
+void ComputeServiceImpl::warmupModels(const std::vector<std::string>& model_names) {
+#ifdef USE_ONNXRUNTIME
+    models_.warmup(model_names);
+#else
+    if (!model_names.empty()) {
+        LOG_INFO("ONNX Runtime not compiled - skipping model warmup");
+    }
+#endif
+}
+
 grpc::Status ComputeServiceImpl::MultiplyMatrices(
     grpc::ServerContext* context,
     const MatrixMultiplyRequest* request,
@@ -47,11 +169,74 @@ grpc::Status ComputeServiceImpl::MultiplyMatrices(
             total_response_time_ += elapsed;
         }
         
-        LOG_INFO("Matrix multiplication completed in", elapsed, "ms");
+        LOG_INFO("Matrix multiplication completed in", elapsed, "ms", requestTag(context));
         return grpc::Status::OK;
         
     } catch (const std::exception& e) {
-        LOG_ERROR("Matrix multiplication failed:", e.what());
+        LOG_ERROR("Matrix multiplication failed:", e.what(), requestTag(context));
+        return grpc::Status(grpc::StatusCode::INTERNAL, e.what());
+    }
+}
+
+grpc::Status ComputeServiceImpl::MultiplySparseMatrices(
+    grpc::ServerContext* context,
+    const SparseMatrixMultiplyRequest* request,
+    SparseMatrixMultiplyResponse* response) {
+    
+    auto start = std::chrono::high_resolution_clock::now();
+    total_requests_++;
+    
+    try {
+        auto a = csrFromProto(request->matrix_a());
+        std::string kernel;
+        
+        if (request->has_sparse_b()) {
+            auto b = csrFromProto(request->sparse_b());
+            if (a.cols != b.rows) {
+                throw std::invalid_argument("Matrix dimensions incompatible for multiplication");
+            }
+            auto result = engine_->multiplySparse(a, b, &kernel);
+            
+            // Sparse encoding: a value and a column index per nonzero
+            size_t sparse_bytes = result.nonZeros() * (sizeof(double) + sizeof(int32_t));
+            if (sparse_bytes < result.rows * result.cols * sizeof(double)) {
+                csrToProto(result, response->mutable_sparse_result());
+            } else {
+                denseToProto(SparseOps::toDense(result), response->mutable_dense_result());
+            }
+        } else if (request->has_dense_b()) {
+            const auto& dense_b = request->dense_b();
+            if (dense_b.rows() < 0 || dense_b.cols() < 0 ||
+                static_cast<size_t>(dense_b.rows()) != a.cols ||
+                static_cast<size_t>(dense_b.values_size()) !=
+                    static_cast<size_t>(dense_b.rows()) * dense_b.cols()) {
+                throw std::invalid_argument("Matrix dimensions incompatible for multiplication");
+            }
+            MatrixOps::Matrix b(dense_b.rows(), dense_b.cols());
+            std::copy(dense_b.values().begin(), dense_b.values().end(), b.data.begin());
+            denseToProto(engine_->multiplySparse(a, b, &kernel), response->mutable_dense_result());
+        } else {
+            throw std::invalid_argument("matrix_b is missing");
+        }
+        response->set_kernel(kernel);
+        
+        auto end = std::chrono::high_resolution_clock::now();
+        double elapsed = std::chrono::duration<double, std::milli>(end - start).count();
+        response->set_computation_time_ms(elapsed);
+        {
+            std::lock_guard<std::mutex> lock(metrics_mutex_);
+            total_response_time_ += elapsed;
+        }
+        
+        LOG_INFO("Sparse matrix multiplication (" + kernel + ") completed in", elapsed, "ms",
+                 requestTag(context));
+        return grpc::Status::OK;
+        
+    } catch (const std::invalid_argument& e) {
+        LOG_ERROR("Sparse matrix multiplication rejected:", e.what(), requestTag(context));
+        return grpc::Status(grpc::StatusCode::INVALID_ARGUMENT, e.what());
+    } catch (const std::exception& e) {
+        LOG_ERROR("Sparse matrix multiplication failed:", e.what(), requestTag(context));
         return grpc::Status(grpc::StatusCode::INTERNAL, e.what());
     }
 }
@@ -90,11 +275,11 @@ grpc::Status ComputeServiceImpl::AnalyzeStatistics(
             total_response_time_ += elapsed;
         }
         
-        LOG_INFO("Statistical analysis completed in", elapsed, "ms");
+        LOG_INFO("Statistical analysis completed in", elapsed, "ms", requestTag(context));
         return grpc::Status::OK;
         
     } catch (const std::exception& e) {
-        LOG_ERROR("Statistical analysis failed:", e.what());
+        LOG_ERROR("Statistical analysis failed:", e.what(), requestTag(context));
         return grpc::Status(grpc::StatusCode::INTERNAL, e.what());
     }
 }
@@ -112,13 +297,15 @@ grpc::Status ComputeServiceImpl::RunMonteCarlo(
             request->iterations(),
             request->dimensions(),
             request->seed(),
-            request->simulation_type()
+            request->simulation_type(),
+            request->sampling()
         );
         
         response->set_result(result.result);
         response->set_confidence_interval_lower(result.confidence_lower);
         response->set_confidence_interval_upper(result.confidence_upper);
         response->set_iterations_completed(result.iterations_completed);
+        response->set_variance_reduction_factor(result.variance_reduction_factor);
         
         for (const auto& [key, value] : result.additional_metrics) {
             (*response->mutable_additional_metrics())[key] = value;
@@ -132,11 +319,14 @@ grpc::Status ComputeServiceImpl::RunMonteCarlo(
             total_response_time_ += elapsed;
         }
         
-        LOG_INFO("Monte Carlo simulation completed in", elapsed, "ms");
+        LOG_INFO("Monte Carlo simulation completed in", elapsed, "ms", requestTag(context));
         return grpc::Status::OK;
         
+    } catch (const std::invalid_argument& e) {
+        LOG_ERROR("Monte Carlo simulation rejected:", e.what(), requestTag(context));
+        return grpc::Status(grpc::StatusCode::INVALID_ARGUMENT, e.what());
     } catch (const std::exception& e) {
-        LOG_ERROR("Monte Carlo simulation failed:", e.what());
+        LOG_ERROR("Monte Carlo simulation failed:", e.what(), requestTag(context));
         return grpc::Status(grpc::StatusCode::INTERNAL, e.what());
     }
 }
@@ -180,7 +370,7 @@ grpc::Status ComputeServiceImpl::VectorOperation(
         return grpc::Status::OK;
         
     } catch (const std::exception& e) {
-        LOG_ERROR("Vector operation failed:", e.what());
+        LOG_ERROR("Vector operation failed:", e.what(), requestTag(context));
         return grpc::Status(grpc::StatusCode::INTERNAL, e.what());
     }
 }
@@ -204,6 +394,21 @@ grpc::Status ComputeServiceImpl::HealthCheck(
         }
     }
     
+#ifdef USE_ONNXRUNTIME
+    for (const auto& stats : models_.stats()) {
+        auto* model = response->add_models();
+        model->set_model_name(stats.model_name);
+        model->set_loaded(stats.loaded);
+        model->set_load_time_ms(stats.load_time_ms);
+        model->set_inference_count(stats.inference_count);
+        if (stats.inference_count > 0) {
+            model->set_avg_inference_time_ms(stats.total_inference_time_ms / stats.inference_count);
+        }
+        model->set_max_inference_time_ms(stats.max_inference_time_ms);
+        model->set_error(stats.error);
+    }
+#endif
+    
     return grpc::Status::OK;
 }
 
@@ -213,64 +418,31 @@ grpc::Status ComputeServiceImpl::MLInference(
     MLInferenceResponse* response) {
     
     try {
-        auto start = std::chrono::high_resolution_clock::now();
         total_requests_++;
         
-        LOG_INFO("ML Inference request for model: " + request->model_name());
+        LOG_INFO("ML Inference request for model: " + request->model_name(), requestTag(context));
         
 #ifdef USE_ONNXRUNTIME
-        // Initialize neural network engine
-        std::string model_path = "models/" + request->model_name() + "_model.onnx";
-        compute::NeuralNetworkEngine engine(model_path, false);
+        auto start = std::chrono::high_resolution_clock::now();
+        
+        // Shared session from the model cache, loaded once per model
+        auto engine = models_.get(request->model_name());
         
         // Convert input data
         std::vector<float> input_data(request->input_data().begin(), request->input_data().end());
         std::vector<int64_t> input_shape(request->input_shape().begin(), request->input_shape().end());
         
         // Run inference
-        auto output = engine.predict(input_data, input_shape);
+        auto run_start = std::chrono::high_resolution_clock::now();
+        auto output = engine->predict(input_data, input_shape);
+        auto run_end = std::chrono::high_resolution_clock::now();
+        models_.record_inference(
+            request->model_name(),
+            std::chrono::duration<double, std::milli>(run_end - run_start).count());
         
-        // Apply softmax if requested
-        std::vector<float> probabilities;
-        if (request->apply_softmax()) {
-            probabilities = compute::NeuralNetworkEngine::softmax(output);
-        } else {
-            probabilities = output;
-        }
-        
-        // Set output
-        for (const auto& val : output) {
-            response->add_output(val);
-        }
-        
-        for (const auto& prob : probabilities) {
-            response->add_probabilities(prob);
-        }
-        
-        // Get top-k if requested
-        if (request->top_k() > 0) {
-            auto top_k = compute::NeuralNetworkEngine::get_top_k(probabilities, request->top_k());
-            for (const auto& [cls, prob] : top_k) {
-                response->add_top_classes(cls);
-                response->add_top_probabilities(prob);
-            }
-        }
-        
-        // Add model info
-        auto input_shape_model = engine.get_input_shape();
-        auto output_shape_model = engine.get_output_shape();
-        std::string model_info = "Input: [";
-        for (size_t i = 0; i < input_shape_model.size(); i++) {
-            model_info += std::to_string(input_shape_model[i]);
-            if (i < input_shape_model.size() - 1) model_info += ",";
-        }
-        model_info += "] Output: [";
-        for (size_t i = 0; i < output_shape_model.size(); i++) {
-            model_info += std::to_string(output_shape_model[i]);
-            if (i < output_shape_model.size() - 1) model_info += ",";
-        }
-        model_info += "]";
-        response->set_model_info(model_info);
+        // Softmax and top-k if requested
+        setInferenceOutput(output, request->apply_softmax(), request->top_k(), response);
+        response->set_model_info(modelInfo(*engine));
         
         auto end = std::chrono::high_resolution_clock::now();
         double duration = std::chrono::duration<double, std::milli>(end - start).count();
@@ -286,8 +458,11 @@ grpc::Status ComputeServiceImpl::MLInference(
         return grpc::Status(grpc::StatusCode::UNIMPLEMENTED, "ML inference not available - ONNX Runtime not compiled");
 #endif
         
+    } catch (const std::invalid_argument& e) {
+        LOG_ERROR("ML Inference rejected: " + std::string(e.what()), requestTag(context));
+        return grpc::Status(grpc::StatusCode::INVALID_ARGUMENT, e.what());
     } catch (const std::exception& e) {
-        LOG_ERROR("ML Inference error: " + std::string(e.what()));
+        LOG_ERROR("ML Inference error: " + std::string(e.what()), requestTag(context));
         return grpc::Status(grpc::StatusCode::INTERNAL, e.what());
     }
 }
@@ -297,13 +472,89 @@ grpc::Status ComputeServiceImpl::MLBatchInference(
     const MLBatchInferenceRequest* request,
     MLBatchInferenceResponse* response) {
     
-    return grpc::Status(grpc::StatusCode::UNIMPLEMENTED, "Batch inference not yet implemented");
+    try {
+        total_requests_++;
+        
+        const auto& items = request->batch_requests();
+        if (items.empty()) {
+            return grpc::Status(grpc::StatusCode::INVALID_ARGUMENT, "Batch is empty");
+        }
+        
+        // The batch-level model name wins; otherwise all items name the model
+        std::string model_name = request->model_name().empty()
+            ? items[0].model_name() : request->model_name();
+        
+        LOG_INFO("ML Batch Inference request for model: " + model_name,
+                 "batch_size=" + std::to_string(items.size()), requestTag(context));
+        
+#ifdef USE_ONNXRUNTIME
+        auto start = std::chrono::high_resolution_clock::now();
+        auto engine = models_.get(model_name);
+        
+        // Items are stacked into one tensor, so they must share one shape
+        std::vector<int64_t> input_shape(items[0].input_shape().begin(), items[0].input_shape().end());
+        std::vector<std::vector<float>> batch_data;
+        batch_data.reserve(items.size());
+        for (const auto& item : items) {
+            if (!item.model_name().empty() && item.model_name() != model_name) {
+                return grpc::Status(grpc::StatusCode::INVALID_ARGUMENT,
+                                    "All batch items must use model " + model_name);
+            }
+            if (!std::equal(item.input_shape().begin(), item.input_shape().end(),
+                            input_shape.begin(), input_shape.end())) {
+                return grpc::Status(grpc::StatusCode::INVALID_ARGUMENT,
+                                    "All batch items must have the same input_shape");
+            }
+            batch_data.emplace_back(item.input_data().begin(), item.input_data().end());
+        }
+        
+        // One Session::Run over the whole [N, ...] batch
+        auto run_start = std::chrono::high_resolution_clock::now();
+        auto outputs = engine->predict_batch(batch_data, input_shape);
+        auto run_end = std::chrono::high_resolution_clock::now();
+        double run_ms = std::chrono::duration<double, std::milli>(run_end - run_start).count();
+        models_.record_inference(model_name, run_ms);
+        
+        std::string model_info = modelInfo(*engine);
+        for (int i = 0; i < static_cast<int>(items.size()); i++) {
+            auto* item_response = response->add_batch_responses();
+            setInferenceOutput(outputs[i], items[i].apply_softmax(), items[i].top_k(), item_response);
+            item_response->set_model_info(model_info);
+            // Share of the batched run attributed to each input
+            item_response->set_inference_time_ms(run_ms / items.size());
+        }
+        
+        auto end = std::chrono::high_resolution_clock::now();
+        double duration = std::chrono::duration<double, std::milli>(end - start).count();
+        response->set_total_inference_time_ms(duration);
+        
+        {
+            std::lock_guard<std::mutex> lock(metrics_mutex_);
+            total_response_time_ += duration;
+        }
+        
+        return grpc::Status::OK;
+#else
+        return grpc::Status(grpc::StatusCode::UNIMPLEMENTED, "ML inference not available - ONNX Runtime not compiled");
+#endif
+        
+    } catch (const std::invalid_argument& e) {
+        LOG_ERROR("ML Batch Inference rejected: " + std::string(e.what()), requestTag(context));
+        return grpc::Status(grpc::StatusCode::INVALID_ARGUMENT, e.what());
+    } catch (const std::exception& e) {
+        LOG_ERROR("ML Batch Inference error: " + std::string(e.what()), requestTag(context));
+        return grpc::Status(grpc::StatusCode::INTERNAL, e.what());
+    }
 }
 
-Server::Server(const std::string& address, int thread_pool_size)
+Server::Server(const std::string& address, int thread_pool_size, const std::string& model_dir)
     : server_address_(address),
       engine_(std::make_shared<ComputeEngine>(thread_pool_size)),
-      service_(std::make_unique<ComputeServiceImpl>(engine_)) {
+      service_(std::make_unique<ComputeServiceImpl>(engine_, model_dir)) {
+}
+
+void Server::warmup(const std::vector<std::string>& model_names) {
+    service_->warmupModels(model_names);
 }
 
 void Server::run() {
@@ -0,0 +1,183 @@
+#include "sparse_ops.hpp"
+#include "utils/thread_pool.hpp"
+#include <algorithm>
+#include <stdexcept>
+#include <string>
+
+namespace compute {
+
+namespace {
+
+// Rows of one chunk of a sparse x sparse product, with the nonzero count of each row
+struct RowChunk {
+    std::vector<size_t> row_nonzeros;
+    std::vector<uint32_t> col_indices;
+    std::vector<double> values;
+};
+
+} // namespace
+
+double SparseOps::CsrMatrix::density() const {
+    if (rows == 0 || cols == 0) {
+        return 0.0;
+    }
+    return static_cast<double>(nonZeros()) / (static_cast<double>(rows) * cols);
+}
+
+void SparseOps::validate(const CsrMatrix& m) {
+    if (m.row_offsets.size() != m.rows + 1 || m.row_offsets.front() != 0) {
+        throw std::invalid_argument("CSR row offsets must have rows + 1 entries starting at 0");
+    }
+    if (m.col_indices.size() != m.values.size() || m.row_offsets.back() != m.values.size()) {
+        throw std::invalid_argument("CSR column indices and values must match the row offsets");
+    }
+    for (size_t i = 0; i < m.rows; ++i) {
+        if (m.row_offsets[i] > m.row_offsets[i + 1] || m.row_offsets[i + 1] > m.values.size()) {
+            throw std::invalid_argument("CSR row offsets must not decrease or pass the values");
+        }
+        for (size_t p = m.row_offsets[i]; p < m.row_offsets[i + 1]; ++p) {
+            if (m.col_indices[p] >= m.cols) {
+                throw std::invalid_argument(
+                    "CSR column index " + std::to_string(m.col_indices[p]) + " out of range");
+            }
+            if (p > m.row_offsets[i] && m.col_indices[p] <= m.col_indices[p - 1]) {
+                throw std::invalid_argument("CSR column indices must ascend within a row");
+            }
+        }
+    }
+}
+
+SparseOps::CsrMatrix SparseOps::fromDense(const MatrixOps::Matrix& m) {
+    CsrMatrix result(m.rows, m.cols);
+    for (size_t i = 0; i < m.rows; ++i) {
+        for (size_t j = 0; j < m.cols; ++j) {
+            double value = m.at(i, j);
+            if (value != 0.0) {
+                result.col_indices.push_back(static_cast<uint32_t>(j));
+                result.values.push_back(value);
+            }
+        }
+        result.row_offsets[i + 1] = result.values.size();
+    }
+    return result;
+}
+
+MatrixOps::Matrix SparseOps::toDense(const CsrMatrix& m) {
+    MatrixOps::Matrix result(m.rows, m.cols);
+    for (size_t i = 0; i < m.rows; ++i) {
+        for (size_t p = m.row_offsets[i]; p < m.row_offsets[i + 1]; ++p) {
+            result.at(i, m.col_indices[p]) = m.values[p];
+        }
+    }
+    return result;
+}
+
+size_t SparseOps::multiplyAdds(const CsrMatrix& a, size_t b_cols) {
+    return a.nonZeros() * b_cols;
+}
+
+size_t SparseOps::multiplyAdds(const CsrMatrix& a, const CsrMatrix& b) {
+    size_t total = 0;
+    for (uint32_t k : a.col_indices) {
+        total += b.row_offsets[k + 1] - b.row_offsets[k];
+    }
+    return total;
+}
+
+bool SparseOps::preferDense(const CsrMatrix& a, size_t b_cols, size_t sparse_multiply_adds) {
+    double dense_multiply_adds = static_cast<double>(a.rows) * a.cols * b_cols;
+    return kSparseCostFactor * static_cast<double>(sparse_multiply_adds) >= dense_multiply_adds;
+}
+
+MatrixOps::Matrix SparseOps::multiply(const CsrMatrix& a, const MatrixOps::Matrix& b,
+                                      utils::ThreadPool* pool) {
+    if (a.cols != b.rows) {
+        throw std::invalid_argument("Matrix dimensions incompatible for multiplication");
+    }
+
+    MatrixOps::Matrix result(a.rows, b.cols);
+    size_t chunks = (a.rows + kRowChunk - 1) / kRowChunk;
+    utils::parallelFor(pool, chunks, [&](size_t chunk) {
+        size_t last = std::min(a.rows, (chunk + 1) * kRowChunk);
+        for (size_t i = chunk * kRowChunk; i < last; ++i) {
+            double* out = &result.data[i * b.cols];
+            for (size_t p = a.row_offsets[i]; p < a.row_offsets[i + 1]; ++p) {
+                const double value = a.values[p];
+                const double* row = &b.data[a.col_indices[p] * b.cols];
+                for (size_t j = 0; j < b.cols; ++j) {
+                    out[j] += value * row[j];
+                }
+            }
+        }
+    });
+    return result;
+}
+
+SparseOps::CsrMatrix SparseOps::multiply(const CsrMatrix& a, const CsrMatrix& b,
+                                         utils::ThreadPool* pool) {
+    if (a.cols != b.rows) {
+        throw std::invalid_argument("Matrix dimensions incompatible for multiplication");
+    }
+
+    size_t chunks = (a.rows + kRowChunk - 1) / kRowChunk;
+    std::vector<RowChunk> parts(chunks);
+    utils::parallelFor(pool, chunks, [&](size_t chunk) {
+        // Dense accumulator for one result row; touched lists its nonzero columns
+        std::vector<double> accumulator(b.cols, 0.0);
+        std::vector<bool> occupied(b.cols, false);
+        std::vector<uint32_t> touched;
+
+        RowChunk& part = parts[chunk];
+        size_t first = chunk * kRowChunk;
+        size_t last = std::min(a.rows, first + kRowChunk);
+        part.row_nonzeros.reserve(last - first);
+        for (size_t i = first; i < last; ++i) {
+            for (size_t p = a.row_offsets[i]; p < a.row_offsets[i + 1]; ++p) {
+                const double value = a.values[p];
+                const uint32_t k = a.col_indices[p];
+                for (size_t q = b.row_offsets[k]; q < b.row_offsets[k + 1]; ++q) {
+                    uint32_t j = b.col_indices[q];
+                    if (!occupied[j]) {
+                        occupied[j] = true;
+                        touched.push_back(j);
+                    }
+                    accumulator[j] += value * b.values[q];
+                }
+            }
+
+            std::sort(touched.begin(), touched.end());
+            size_t before = part.values.size();
+            for (uint32_t j : touched) {
+                if (accumulator[j] != 0.0) {
+                    part.col_indices.push_back(j);
+                    part.values.push_back(accumulator[j]);
+                }
+                accumulator[j] = 0.0;
+                occupied[j] = false;
+            }
+            touched.clear();
+            part.row_nonzeros.push_back(part.values.size() - before);
+        }
+    });
+
+    CsrMatrix result(a.rows, b.cols);
+    size_t total = 0;
+    for (const auto& part : parts) {
+        total += part.values.size();
+    }
+    result.col_indices.reserve(total);
+    result.values.reserve(total);
+    size_t row = 0;
+    for (const auto& part : parts) {
+        for (size_t nonzeros : part.row_nonzeros) {
+            result.row_offsets[row + 1] = result.row_offsets[row] + nonzeros;
+            ++row;
+        }
+        result.col_indices.insert(result.col_indices.end(),
+                                  part.col_indices.begin(), part.col_indices.end());
+        result.values.insert(result.values.end(), part.values.begin(), part.values.end());
+    }
+    return result;
+}
+
+} // namespace compute
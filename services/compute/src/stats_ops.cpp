@@ -1,65 +1,225 @@
 #include "stats_ops.hpp"
 #include "utils/logger.hpp"
+#include "utils/thread_pool.hpp"
 #include <algorithm>
 #include <cmath>
 #include <numeric>
 #include <stdexcept>
+#include <utility>
 
 namespace compute {
 
+namespace {
+
+const int kPercentiles[] = {25, 50, 75, 95, 99};
+
+} // namespace
+
+void StatsOps::Summary::merge(const Summary& other) {
+    if (other.count == 0) return;
+    if (count == 0) {
+        *this = other;
+        return;
+    }
+
+    double total = static_cast<double>(count + other.count);
+    double delta = other.mean - mean;
+    mean += delta * other.count / total;
+    m2 += other.m2 + delta * delta * count * other.count / total;
+    count += other.count;
+    min = std::min(min, other.min);
+    max = std::max(max, other.max);
+}
+
+double StatsOps::Summary::variance() const {
+    return count > 0 ? m2 / count : 0.0;
+}
+
 StatsOps::Statistics StatsOps::analyze(const std::vector<double>& data,
-                                       const std::vector<std::string>& operations) {
+                                       const std::vector<std::string>& operations,
+                                       utils::ThreadPool* pool) {
     if (data.empty()) {
         throw std::invalid_argument("Cannot analyze empty dataset");
     }
     
     Statistics stats;
-    stats.count = data.size();
-    stats.min = *std::min_element(data.begin(), data.end());
-    stats.max = *std::max_element(data.begin(), data.end());
-    
-    // Calculate mean
-    stats.mean = mean(data);
+    Summary summary = summarize(data, pool);
+    stats.count = summary.count;
+    stats.min = summary.min;
+    stats.max = summary.max;
+    stats.mean = summary.mean;
     
-    // Process requested operations
+    // Process requested operations; order statistics are collected first so that
+    // median and percentiles share one copy of the data and one selection pass
+    std::vector<double> probabilities;
+    bool want_median = false;
+    bool want_percentiles = false;
     for (const auto& op : operations) {
         if (op == "mean") {
             // Already calculated
         } else if (op == "median") {
-            stats.median = median(data);
+            want_median = true;
         } else if (op == "stddev") {
-            stats.variance = variance(data, stats.mean);
+            stats.variance = summary.variance();
             stats.stddev = std::sqrt(stats.variance);
         } else if (op == "variance") {
-            stats.variance = variance(data, stats.mean);
+            stats.variance = summary.variance();
         } else if (op == "percentiles") {
-            stats.percentiles[25] = percentile(data, 25);
-            stats.percentiles[50] = percentile(data, 50);
-            stats.percentiles[75] = percentile(data, 75);
-            stats.percentiles[95] = percentile(data, 95);
-            stats.percentiles[99] = percentile(data, 99);
+            want_percentiles = true;
+        }
+    }
+    
+    if (want_median) {
+        probabilities.push_back(0.5);
+    }
+    if (want_percentiles) {
+        for (int p : kPercentiles) {
+            probabilities.push_back(p / 100.0);
+        }
+    }
+    
+    if (!probabilities.empty()) {
+        auto values = quantiles(data, probabilities);
+        size_t next = 0;
+        if (want_median) {
+            stats.median = values[next++];
+        }
+        if (want_percentiles) {
+            for (int p : kPercentiles) {
+                stats.percentiles[p] = values[next++];
+            }
         }
     }
     
     return stats;
 }
 
-double StatsOps::mean(const std::vector<double>& data) {
-    return std::accumulate(data.begin(), data.end(), 0.0) / data.size();
+StatsOps::Summary StatsOps::summarize(const double* data, size_t n) {
+    Summary summary;
+    if (n == 0) {
+        return summary;
+    }
+
+    // Sums of deviations from the first value (shifted data keeps the
+    // one-pass variance accurate), in four independent lanes the compiler
+    // can keep in one vector register each
+    constexpr size_t kLanes = 4;
+    double shift = data[0];
+    double sum[kLanes] = {};
+    double sum_sq[kLanes] = {};
+    double lo[kLanes] = {data[0], data[0], data[0], data[0]};
+    double hi[kLanes] = {data[0], data[0], data[0], data[0]};
+
+    size_t i = 0;
+    for (; i + kLanes <= n; i += kLanes) {
+        for (size_t l = 0; l < kLanes; ++l) {
+            double x = data[i + l];
+            double d = x - shift;
+            sum[l] += d;
+            sum_sq[l] += d * d;
+            lo[l] = x < lo[l] ? x : lo[l];
+            hi[l] = x > hi[l] ? x : hi[l];
+        }
+    }
+    for (; i < n; ++i) {
+        double d = data[i] - shift;
+        sum[0] += d;
+        sum_sq[0] += d * d;
+        lo[0] = std::min(lo[0], data[i]);
+        hi[0] = std::max(hi[0], data[i]);
+    }
+
+    double total = 0.0;
+    double total_sq = 0.0;
+    summary.min = lo[0];
+    summary.max = hi[0];
+    for (size_t l = 0; l < kLanes; ++l) {
+        total += sum[l];
+        total_sq += sum_sq[l];
+        summary.min = std::min(summary.min, lo[l]);
+        summary.max = std::max(summary.max, hi[l]);
+    }
+
+    summary.count = n;
+    summary.mean = shift + total / n;
+    summary.m2 = std::max(total_sq - total * total / n, 0.0);
+    return summary;
 }
 
-double StatsOps::median(std::vector<double> data) {
+StatsOps::Summary StatsOps::summarize(const std::vector<double>& data, utils::ThreadPool* pool) {
+    if (pool == nullptr || data.size() < kParallelThreshold) {
+        return summarize(data.data(), data.size());
+    }
+
+    size_t num_chunks = (data.size() + kChunkSize - 1) / kChunkSize;
+    std::vector<Summary> partials(num_chunks);
+    utils::parallelFor(pool, num_chunks, [&](size_t c) {
+        size_t begin = c * kChunkSize;
+        partials[c] = summarize(data.data() + begin, std::min(kChunkSize, data.size() - begin));
+    });
+
+    // Merge in chunk order so the result does not depend on the thread count
+    Summary total;
+    for (const auto& partial : partials) {
+        total.merge(partial);
+    }
+    return total;
+}
+
+std::vector<double> StatsOps::quantiles(std::vector<double> data,
+                                        const std::vector<double>& probabilities) {
+    if (data.empty()) {
+        throw std::invalid_argument("Cannot compute quantiles of empty dataset");
+    }
+    
+    // Each quantile interpolates between the order statistics around its index
     size_t n = data.size();
-    std::nth_element(data.begin(), data.begin() + n / 2, data.end());
+    std::vector<size_t> ranks;
+    for (double q : probabilities) {
+        if (q < 0.0 || q > 1.0) {
+            throw std::invalid_argument("Percentile must be between 0 and 100");
+        }
+        double index = q * (n - 1);
+        ranks.push_back(static_cast<size_t>(std::floor(index)));
+        ranks.push_back(static_cast<size_t>(std::ceil(index)));
+    }
+    std::sort(ranks.begin(), ranks.end());
+    ranks.erase(std::unique(ranks.begin(), ranks.end()), ranks.end());
+    
+    // Select in increasing rank order: after each selection only larger values lie
+    // to its right, so the next search covers a shrinking range
+    auto first = data.begin();
+    for (size_t rank : ranks) {
+        auto nth = data.begin() + rank;
+        if (nth == first) {
+            std::iter_swap(first, std::min_element(first, data.end()));
+        } else {
+            std::nth_element(first, nth, data.end());
+        }
+        first = nth + 1;
+    }
     
-    if (n % 2 == 0) {
-        double median1 = data[n / 2];
-        std::nth_element(data.begin(), data.begin() + n / 2 - 1, data.end());
-        double median2 = data[n / 2 - 1];
-        return (median1 + median2) / 2.0;
+    std::vector<double> result;
+    result.reserve(probabilities.size());
+    for (double q : probabilities) {
+        double index = q * (n - 1);
+        size_t lower = static_cast<size_t>(std::floor(index));
+        size_t upper = static_cast<size_t>(std::ceil(index));
+        double weight = index - lower;
+        result.push_back(lower == upper
+            ? data[lower]
+            : data[lower] * (1 - weight) + data[upper] * weight);
     }
     
-    return data[n / 2];
+    return result;
+}
+
+double StatsOps::mean(const std::vector<double>& data) {
+    return std::accumulate(data.begin(), data.end(), 0.0) / data.size();
+}
+
+double StatsOps::median(std::vector<double> data) {
+    return quantiles(std::move(data), {0.5})[0];
 }
 
 double StatsOps::variance(const std::vector<double>& data, double m) {
@@ -82,18 +242,7 @@ double StatsOps::percentile(std::vector<double> data, int p) {
         throw std::invalid_argument("Percentile must be between 0 and 100");
     }
     
-    std::sort(data.begin(), data.end());
-    
-    double index = (p / 100.0) * (data.size() - 1);
-    size_t lower = static_cast<size_t>(std::floor(index));
-    size_t upper = static_cast<size_t>(std::ceil(index));
-    
-    if (lower == upper) {
-        return data[lower];
-    }
-    
-    double weight = index - lower;
-    return data[lower] * (1 - weight) + data[upper] * weight;
+    return quantiles(std::move(data), {p / 100.0})[0];
 }
 
 double StatsOps::skewness(const std::vector<double>& data) {
@@ -1,8 +1,46 @@
 #include <gtest/gtest.h>
 #include "../include/matrix_ops.hpp"
+#include "../include/utils/thread_pool.hpp"
+#include <cmath>
+#include <random>
+#include <stdexcept>
 
 using namespace compute;
 
+namespace {
+
+MatrixOps::Matrix randomMatrix(size_t rows, size_t cols, unsigned seed) {
+    MatrixOps::Matrix m(rows, cols);
+    std::mt19937 gen(seed);
+    std::uniform_real_distribution<double> dist(-1.0, 1.0);
+    for (auto& x : m.data) {
+        x = dist(gen);
+    }
+    return m;
+}
+
+MatrixOps::Matrix naiveMultiply(const MatrixOps::Matrix& a, const MatrixOps::Matrix& b) {
+    MatrixOps::Matrix result(a.rows, b.cols);
+    for (size_t i = 0; i < a.rows; ++i) {
+        for (size_t j = 0; j < b.cols; ++j) {
+            for (size_t k = 0; k < a.cols; ++k) {
+                result.at(i, j) += a.at(i, k) * b.at(k, j);
+            }
+        }
+    }
+    return result;
+}
+
+void expectNear(const MatrixOps::Matrix& actual, const MatrixOps::Matrix& expected) {
+    ASSERT_EQ(actual.rows, expected.rows);
+    ASSERT_EQ(actual.cols, expected.cols);
+    for (size_t i = 0; i < actual.data.size(); ++i) {
+        ASSERT_NEAR(actual.data[i], expected.data[i], 1e-10) << "at " << i;
+    }
+}
+
+} // namespace
+
 TEST(MatrixOpsTest, MultiplicationBasic) {
     MatrixOps::Matrix a(2, 2);
     a.at(0, 0) = 1; a.at(0, 1) = 2;
@@ -52,6 +90,60 @@ TEST(MatrixOpsTest, Transpose) {
     EXPECT_DOUBLE_EQ(result.at(1, 1), 5);
 }
 
+TEST(MatrixOpsTest, BlockedMatchesNaiveOnRaggedSizes) {
+    // Small tiles so every edge case of the packing (partial kMR/kNR slivers,
+    // partial mc/kc/nc blocks) occurs
+    MatrixOps::GemmConfig config;
+    config.mc = 12;
+    config.kc = 7;
+    config.nc = 24;
+    config.use_blas = false;
+    
+    auto a = randomMatrix(103, 71, 1);
+    auto b = randomMatrix(71, 58, 2);
+    auto expected = naiveMultiply(a, b);
+    
+    expectNear(MatrixOps::multiply(a, b, config), expected);
+    expectNear(MatrixOps::multiply(a, b), expected);
+}
+
+TEST(MatrixOpsTest, ParallelMatchesSequential) {
+    utils::ThreadPool pool(4);
+    MatrixOps::GemmConfig config;
+    config.mc = 16;
+    config.use_blas = false;
+    
+    auto a = randomMatrix(150, 90, 3);
+    auto b = randomMatrix(90, 130, 4);
+    auto sequential = MatrixOps::multiply(a, b, config);
+    auto parallel = MatrixOps::multiplyParallel(a, b, &pool, config);
+    
+    // Row blocks are independent, so the sums are bit-identical
+    EXPECT_EQ(parallel.data, sequential.data);
+    expectNear(MatrixOps::multiplyParallel(a, b, &pool), naiveMultiply(a, b));
+    EXPECT_THROW(MatrixOps::multiplyParallel(a, a, &pool), std::invalid_argument);
+}
+
+TEST(MatrixOpsTest, GemmConfig) {
+    auto config = MatrixOps::parseGemmConfig("96,256,2048");
+    EXPECT_EQ(config.mc, 96u);
+    EXPECT_EQ(config.kc, 256u);
+    EXPECT_EQ(config.nc, 2048u);
+    EXPECT_THROW(MatrixOps::parseGemmConfig("96,256"), std::invalid_argument);
+    EXPECT_THROW(MatrixOps::parseGemmConfig("a,b,c"), std::invalid_argument);
+    
+    MatrixOps::GemmConfig original = MatrixOps::gemmConfig();
+    config.mc = 50;
+    config.nc = 1001;
+    MatrixOps::setGemmConfig(config);
+    EXPECT_EQ(MatrixOps::gemmConfig().mc % MatrixOps::kMR, 0u);
+    EXPECT_EQ(MatrixOps::gemmConfig().nc % MatrixOps::kNR, 0u);
+    MatrixOps::setGemmConfig(original);
+    
+    config.kc = 0;
+    EXPECT_THROW(MatrixOps::setGemmConfig(config), std::invalid_argument);
+}
+
 int main(int argc, char** argv) {
     testing::InitGoogleTest(&argc, argv);
     return RUN_ALL_TESTS();
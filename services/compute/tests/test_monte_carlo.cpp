@@ -1,6 +1,9 @@
 #include <gtest/gtest.h>
 #include "../include/monte_carlo.hpp"
+#include "../include/utils/thread_pool.hpp"
+#include <algorithm>
 #include <cmath>
+#include <stdexcept>
 
 using namespace compute;
 
@@ -21,6 +24,150 @@ TEST(MonteCarloTest, Integration) {
     EXPECT_LT(result.result, 1.0);
 }
 
+TEST(MonteCarloTest, ParallelMatchesSequential) {
+    // Same seed gives the same result for any number of threads
+    utils::ThreadPool pool(4);
+    size_t iterations = 5 * MonteCarlo::kChunkSize + 123;
+    
+    for (const std::string type : {"pi_estimation", "option_pricing", "integration"}) {
+        auto sequential = MonteCarlo::run(iterations, 3, 7, type);
+        auto parallel = MonteCarlo::run(iterations, 3, 7, type, &pool);
+        
+        EXPECT_EQ(parallel.iterations_completed, iterations);
+        EXPECT_DOUBLE_EQ(parallel.result, sequential.result) << type;
+        EXPECT_DOUBLE_EQ(parallel.confidence_lower, sequential.confidence_lower) << type;
+    }
+    
+    auto other_seed = MonteCarlo::run(iterations, 3, 8, "integration", &pool);
+    EXPECT_NE(other_seed.result, MonteCarlo::run(iterations, 3, 7, "integration").result);
+}
+
+TEST(MonteCarloTest, MomentsMerge) {
+    MonteCarlo::Moments all, left, right;
+    for (int i = 0; i < 100; ++i) {
+        double x = std::sin(i) * 10.0 + 1e6;
+        all.add(x);
+        (i < 37 ? left : right).add(x);
+    }
+    left.merge(right);
+    
+    EXPECT_EQ(left.count, all.count);
+    EXPECT_NEAR(left.mean, all.mean, 1e-9);
+    EXPECT_NEAR(left.variance(), all.variance(), 1e-6);
+}
+
+TEST(MonteCarloTest, CoMomentsMerge) {
+    MonteCarlo::CoMoments all, left, right;
+    for (int i = 0; i < 100; ++i) {
+        double x = std::sin(i) * 10.0 + 1e6;
+        double y = std::cos(i) + 0.5 * x;
+        all.add(x, y);
+        (i < 61 ? left : right).add(x, y);
+    }
+    left.merge(right);
+    
+    EXPECT_EQ(left.x.count, all.x.count);
+    EXPECT_NEAR(left.y.mean, all.y.mean, 1e-9);
+    EXPECT_NEAR(left.covariance(), all.covariance(), 1e-6);
+    EXPECT_GT(all.covariance(), 0.0);
+    
+    // Merging into an empty accumulator copies the other side
+    MonteCarlo::CoMoments empty;
+    empty.merge(all);
+    EXPECT_DOUBLE_EQ(empty.covariance(), all.covariance());
+}
+
+TEST(MonteCarloTest, OptionPriceNearBlackScholes) {
+    // Black-Scholes price of the built-in call (S=K=100, r=5%, sigma=20%, T=1)
+    utils::ThreadPool pool(4);
+    auto result = MonteCarlo::run(400000, 1, 42, "option_pricing", &pool);
+    
+    EXPECT_NEAR(result.result, 10.4506, 0.1);
+    EXPECT_LT(result.confidence_lower, 10.4506);
+    EXPECT_GT(result.confidence_upper, 10.4506);
+}
+
+TEST(MonteCarloTest, SamplingStrategiesAgreeWithExactValues) {
+    utils::ThreadPool pool(4);
+    double exact_integral = std::pow(0.746824132812427, 3);  // Integral of exp(-x^2) over [0,1]
+    
+    for (const std::string sampling : {"pseudo_random", "antithetic", "stratified", "sobol", "halton"}) {
+        auto pi = MonteCarlo::run(200000, 2, 42, "pi_estimation", &pool, sampling);
+        auto integral = MonteCarlo::run(200000, 3, 42, "integration", &pool, sampling);
+        
+        EXPECT_NEAR(pi.result, M_PI, 0.02) << sampling;
+        EXPECT_NEAR(integral.result, exact_integral, 0.005) << sampling;
+        EXPECT_LT(integral.confidence_lower, integral.result) << sampling;
+        EXPECT_GT(integral.confidence_upper, integral.result) << sampling;
+        EXPECT_EQ(pi.iterations_completed, 200000u) << sampling;
+    }
+}
+
+TEST(MonteCarloTest, VarianceReductionForOptionPricing) {
+    utils::ThreadPool pool(4);
+    auto plain = MonteCarlo::run(100000, 1, 42, "option_pricing", &pool);
+    EXPECT_DOUBLE_EQ(plain.variance_reduction_factor, 1.0);
+    
+    for (const std::string sampling : {"antithetic", "control_variate", "stratified", "sobol", "halton"}) {
+        auto result = MonteCarlo::run(100000, 1, 42, "option_pricing", &pool, sampling);
+        
+        EXPECT_NEAR(result.result, 10.4506, 0.1) << sampling;
+        EXPECT_GT(result.variance_reduction_factor, 1.5) << sampling;
+        EXPECT_LT(result.confidence_upper - result.confidence_lower,
+                  plain.confidence_upper - plain.confidence_lower) << sampling;
+    }
+}
+
+TEST(MonteCarloTest, QuasiRandomParallelMatchesSequential) {
+    utils::ThreadPool pool(4);
+    size_t iterations = 3 * MonteCarlo::kChunkSize + 77;
+    
+    for (const std::string sampling : {"stratified", "sobol", "halton"}) {
+        auto sequential = MonteCarlo::run(iterations, 4, 7, "integration", nullptr, sampling);
+        auto parallel = MonteCarlo::run(iterations, 4, 7, "integration", &pool, sampling);
+        
+        EXPECT_DOUBLE_EQ(parallel.result, sequential.result) << sampling;
+        EXPECT_DOUBLE_EQ(parallel.confidence_lower, sequential.confidence_lower) << sampling;
+    }
+}
+
+TEST(MonteCarloTest, SobolAndHaltonPoints) {
+    // First dimension of both is the van der Corput sequence in base 2
+    EXPECT_EQ(MonteCarlo::sobol(0, 0), 0u);
+    EXPECT_EQ(MonteCarlo::sobol(1, 0), 0x80000000u);
+    EXPECT_EQ(MonteCarlo::sobol(3, 1), 0x40000000u);
+    EXPECT_DOUBLE_EQ(MonteCarlo::halton(3, 0), 0.75);
+    EXPECT_DOUBLE_EQ(MonteCarlo::halton(5, 1), 7.0 / 9.0);
+    
+    // The first 2^k points of each Sobol dimension hit every interval of width 2^-k once
+    for (int d = 0; d < MonteCarlo::kMaxSobolDimensions; ++d) {
+        std::vector<int> hits(64, 0);
+        for (uint64_t i = 0; i < 64; ++i) {
+            hits[MonteCarlo::sobol(i, d) >> 26]++;
+        }
+        EXPECT_EQ(*std::min_element(hits.begin(), hits.end()), 1) << d;
+    }
+}
+
+TEST(MonteCarloTest, InverseNormal) {
+    EXPECT_NEAR(MonteCarlo::inverseNormal(0.5), 0.0, 1e-12);
+    EXPECT_NEAR(MonteCarlo::inverseNormal(0.975), 1.959963985, 1e-8);
+    EXPECT_NEAR(MonteCarlo::inverseNormal(0.001), -3.090232306, 1e-8);
+    EXPECT_TRUE(std::isfinite(MonteCarlo::inverseNormal(0.0)));
+    EXPECT_TRUE(std::isfinite(MonteCarlo::inverseNormal(1.0)));
+}
+
+TEST(MonteCarloTest, RejectsInvalidSampling) {
+    EXPECT_THROW(MonteCarlo::run(1000, 2, 42, "pi_estimation", nullptr, "latin_hypercube"),
+                 std::invalid_argument);
+    EXPECT_THROW(MonteCarlo::run(1000, 2, 42, "pi_estimation", nullptr, "control_variate"),
+                 std::invalid_argument);
+    EXPECT_THROW(MonteCarlo::run(100, 2, 42, "integration", nullptr, "stratified"),
+                 std::invalid_argument);
+    EXPECT_THROW(MonteCarlo::run(1000, 20, 42, "integration", nullptr, "sobol"),
+                 std::invalid_argument);
+}
+
 int main(int argc, char** argv) {
     testing::InitGoogleTest(&argc, argv);
     return RUN_ALL_TESTS();
@@ -0,0 +1,118 @@
+#include <gtest/gtest.h>
+#include "../include/sparse_ops.hpp"
+#include "../include/utils/thread_pool.hpp"
+#include <random>
+#include <stdexcept>
+
+using namespace compute;
+
+namespace {
+
+// Dense matrix with roughly density * rows * cols nonzeros
+MatrixOps::Matrix randomSparse(size_t rows, size_t cols, double density, unsigned seed) {
+    MatrixOps::Matrix m(rows, cols);
+    std::mt19937 gen(seed);
+    std::uniform_real_distribution<double> value(-1.0, 1.0);
+    std::bernoulli_distribution nonzero(density);
+    for (auto& x : m.data) {
+        if (nonzero(gen)) {
+            x = value(gen);
+        }
+    }
+    return m;
+}
+
+void expectNear(const MatrixOps::Matrix& actual, const MatrixOps::Matrix& expected) {
+    ASSERT_EQ(actual.rows, expected.rows);
+    ASSERT_EQ(actual.cols, expected.cols);
+    for (size_t i = 0; i < actual.data.size(); ++i) {
+        ASSERT_NEAR(actual.data[i], expected.data[i], 1e-10) << "at " << i;
+    }
+}
+
+} // namespace
+
+TEST(SparseOpsTest, DenseRoundTrip) {
+    auto dense = randomSparse(37, 23, 0.1, 1);
+    auto csr = SparseOps::fromDense(dense);
+    
+    EXPECT_NO_THROW(SparseOps::validate(csr));
+    EXPECT_EQ(csr.row_offsets.size(), 38u);
+    EXPECT_NEAR(csr.density(), 0.1, 0.05);
+    EXPECT_EQ(SparseOps::toDense(csr).data, dense.data);
+}
+
+TEST(SparseOpsTest, ValidateRejectsInconsistentMatrices) {
+    auto csr = SparseOps::fromDense(randomSparse(10, 10, 0.3, 2));
+    
+    auto bad_column = csr;
+    bad_column.col_indices.back() = 10;
+    EXPECT_THROW(SparseOps::validate(bad_column), std::invalid_argument);
+    
+    auto short_offsets = csr;
+    short_offsets.row_offsets.pop_back();
+    EXPECT_THROW(SparseOps::validate(short_offsets), std::invalid_argument);
+    
+    auto decreasing = csr;
+    decreasing.row_offsets[5] = decreasing.row_offsets.back() + 1;
+    EXPECT_THROW(SparseOps::validate(decreasing), std::invalid_argument);
+    
+    SparseOps::CsrMatrix unsorted(1, 3);
+    unsorted.col_indices = {2, 0};
+    unsorted.values = {1.0, 2.0};
+    unsorted.row_offsets = {0, 2};
+    EXPECT_THROW(SparseOps::validate(unsorted), std::invalid_argument);
+}
+
+TEST(SparseOpsTest, SparseTimesDense) {
+    utils::ThreadPool pool(4);
+    auto a = randomSparse(300, 200, 0.02, 3);
+    auto b = randomSparse(200, 50, 1.0, 4);
+    auto csr = SparseOps::fromDense(a);
+    
+    auto expected = MatrixOps::multiply(a, b);
+    expectNear(SparseOps::multiply(csr, b), expected);
+    // Rows are independent, so the pool does not change the result
+    EXPECT_EQ(SparseOps::multiply(csr, b, &pool).data, SparseOps::multiply(csr, b).data);
+    EXPECT_THROW(SparseOps::multiply(csr, a), std::invalid_argument);
+}
+
+TEST(SparseOpsTest, SparseTimesSparse) {
+    utils::ThreadPool pool(4);
+    auto a = randomSparse(250, 180, 0.03, 5);
+    auto b = randomSparse(180, 220, 0.03, 6);
+    
+    auto result = SparseOps::multiply(SparseOps::fromDense(a), SparseOps::fromDense(b), &pool);
+    
+    EXPECT_NO_THROW(SparseOps::validate(result));
+    expectNear(SparseOps::toDense(result), MatrixOps::multiply(a, b));
+    EXPECT_GT(SparseOps::multiplyAdds(SparseOps::fromDense(a), SparseOps::fromDense(b)), 0u);
+}
+
+TEST(SparseOpsTest, SparseTimesSparseDropsCancelledEntries) {
+    // [1 1] x [1 -1; -1 1] = [0 0]
+    MatrixOps::Matrix a(1, 2);
+    a.data = {1.0, 1.0};
+    MatrixOps::Matrix b(2, 2);
+    b.data = {1.0, -1.0, -1.0, 1.0};
+    
+    auto result = SparseOps::multiply(SparseOps::fromDense(a), SparseOps::fromDense(b));
+    
+    EXPECT_EQ(result.nonZeros(), 0u);
+    EXPECT_EQ(result.row_offsets, (std::vector<size_t>{0, 0}));
+}
+
+TEST(SparseOpsTest, PreferDenseFollowsDensity) {
+    auto sparse = SparseOps::fromDense(randomSparse(200, 200, 0.01, 7));
+    auto dense = SparseOps::fromDense(randomSparse(200, 200, 0.5, 8));
+    
+    EXPECT_FALSE(SparseOps::preferDense(sparse, 100, SparseOps::multiplyAdds(sparse, 100)));
+    EXPECT_TRUE(SparseOps::preferDense(dense, 100, SparseOps::multiplyAdds(dense, 100)));
+    EXPECT_FALSE(SparseOps::preferDense(sparse, 200, SparseOps::multiplyAdds(sparse, sparse)));
+    EXPECT_TRUE(SparseOps::preferDense(dense, 200, SparseOps::multiplyAdds(dense, dense)));
+}
+
+int main(int argc, char** argv) {
+    testing::InitGoogleTest(&argc, argv);
+    return RUN_ALL_TESTS();
+}
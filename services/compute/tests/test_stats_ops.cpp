@@ -1,5 +1,8 @@
 #include <gtest/gtest.h>
 #include "../include/stats_ops.hpp"
+#include "../include/utils/thread_pool.hpp"
+#include <random>
+#include <stdexcept>
 
 using namespace compute;
 
@@ -22,6 +25,60 @@ TEST(StatsOpsTest, Variance) {
     EXPECT_NEAR(result, 4.0, 0.01);
 }
 
+TEST(StatsOpsTest, QuantilesMatchSortedData) {
+    std::mt19937 gen(7);
+    std::normal_distribution<double> dist(10.0, 3.0);
+    for (size_t n : {1, 2, 5, 100, 1001}) {
+        std::vector<double> data(n);
+        for (auto& x : data) {
+            x = std::round(dist(gen));  // Plenty of ties
+        }
+        std::vector<double> sorted = data;
+        std::sort(sorted.begin(), sorted.end());
+        
+        std::vector<double> probabilities = {0.99, 0.0, 0.25, 0.5, 0.75, 0.95, 1.0, 0.5};
+        auto values = StatsOps::quantiles(data, probabilities);
+        
+        for (size_t q = 0; q < probabilities.size(); ++q) {
+            double index = probabilities[q] * (n - 1);
+            size_t lower = static_cast<size_t>(std::floor(index));
+            size_t upper = static_cast<size_t>(std::ceil(index));
+            double expected = sorted[lower] + (sorted[upper] - sorted[lower]) * (index - lower);
+            EXPECT_NEAR(values[q], expected, 1e-12) << "n=" << n << " q=" << probabilities[q];
+        }
+    }
+    
+    EXPECT_DOUBLE_EQ(StatsOps::median({4.0, 1.0, 3.0, 2.0}), 2.5);
+    EXPECT_DOUBLE_EQ(StatsOps::percentile({1.0, 2.0, 3.0, 4.0, 5.0}, 25), 2.0);
+    EXPECT_THROW(StatsOps::percentile({1.0}, 101), std::invalid_argument);
+}
+
+TEST(StatsOpsTest, AnalyzeParallelMatchesSequential) {
+    utils::ThreadPool pool(4);
+    std::mt19937 gen(11);
+    std::uniform_real_distribution<double> dist(-1.0, 1.0);
+    std::vector<double> data(StatsOps::kParallelThreshold + 12345);
+    for (auto& x : data) {
+        x = 1e6 + dist(gen);  // Large offset: a naive sum of squares would lose the variance
+    }
+    std::vector<std::string> ops = {"mean", "median", "variance", "stddev", "percentiles"};
+    
+    auto sequential = StatsOps::analyze(data, ops);
+    auto parallel = StatsOps::analyze(data, ops, &pool);
+    double m = StatsOps::mean(data);
+    
+    EXPECT_EQ(parallel.count, data.size());
+    EXPECT_NEAR(parallel.mean, m, 1e-7);
+    EXPECT_NEAR(sequential.mean, m, 1e-7);
+    EXPECT_NEAR(parallel.variance, StatsOps::variance(data, m), 1e-9);
+    EXPECT_NEAR(sequential.variance, StatsOps::variance(data, m), 1e-9);
+    EXPECT_DOUBLE_EQ(parallel.min, *std::min_element(data.begin(), data.end()));
+    EXPECT_DOUBLE_EQ(parallel.max, *std::max_element(data.begin(), data.end()));
+    EXPECT_DOUBLE_EQ(parallel.median, StatsOps::median(data));
+    EXPECT_DOUBLE_EQ(parallel.percentiles[95], StatsOps::percentile(data, 95));
+    EXPECT_EQ(parallel.percentiles.size(), 5u);
+}
+
 int main(int argc, char** argv) {
     testing::InitGoogleTest(&argc, argv);
     return RUN_ALL_TESTS();
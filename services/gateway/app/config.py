@@ -1,10 +1,6 @@
 import os
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from dotenv import load_dotenv
-
-# Načtení .env souboru
-load_dotenv()
 
 
 class Settings(BaseSettings):
@@ -16,6 +12,10 @@ class Settings(BaseSettings):
     api_prefix: str = "/api/v1"
     debug: bool = False
     
+    # Optional routers, disabled ones are not imported at startup
+    ai_enabled: bool = True
+    ml_enabled: bool = True
+    
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8000
@@ -23,16 +23,96 @@ class Settings(BaseSettings):
     
     # Compute Service Configuration
     compute_service_url: str = "localhost:50051"
-    grpc_timeout: int = 30
-    grpc_max_retries: int = 3
+    grpc_timeout: int = 30  # overall deadline of a request, shared by its retries
+    grpc_max_retries: int = 3  # attempts including the first
+    grpc_connect_timeout: float = 5.0  # startup wait for the channel to connect
+    
+    # Retries of transient failures (UNAVAILABLE, RESOURCE_EXHAUSTED, ABORTED)
+    retry_backoff_base_ms: int = 50
+    retry_backoff_max_ms: int = 1000
+    retry_budget_ratio: float = 0.2  # retries allowed per request on average
+    retry_budget_min_per_second: float = 5.0
+    
+    # Hedged requests: a second copy is sent once the operation's recent
+    # latency percentile has elapsed without an answer
+    hedging_enabled: bool = False
+    hedge_percentile: float = 95.0
+    hedge_min_delay_ms: int = 5
+    # Backend for hedged copies, defaults to compute_service_url
+    compute_service_hedge_url: str = ""
+    grpc_max_message_bytes: int = 100 * 1024 * 1024
+    
+    # Distributed matrix multiplication: products that do not fit one
+    # message, or are costly with several backends, run as block products
+    # Backends for block products, defaults to compute_service_url
+    compute_shard_urls: list[str] = []
+    distributed_matmul_enabled: bool = True
+    distributed_matmul_min_cost: float = 1e9  # rows * inner * cols before spreading over backends
+    distributed_matmul_max_block_bytes: int = 16 * 1024 * 1024
+    distributed_matmul_inflight_per_backend: int = 2
+    
+    # Matrices with fewer nonzeros than this fraction go to the sparse
+    # kernels as CSR; 0 disables sparse products
+    sparse_density_threshold: float = 0.1
+    # Sparse inputs or results are expanded to dense rows only up to this size
+    dense_matrix_max_elements: int = 4 * 1024 * 1024
+    
+    # Circuit breaker per backend (trips on error rate or slow-call rate)
+    circuit_breaker_enabled: bool = True
+    circuit_window_size: int = 20
+    circuit_min_calls: int = 10
+    circuit_failure_rate: float = 0.5
+    circuit_slow_call_ms: int = 10000
+    circuit_slow_call_rate: float = 0.8
+    circuit_open_seconds: float = 5.0
+    circuit_probe_timeout: float = 2.0
     
-    # Rate Limiting
+    # Background jobs (POST /jobs): long computations run outside the request
+    jobs_enabled: bool = True
+    jobs_store: str = "sqlite"  # sqlite, memory
+    jobs_sqlite_path: str = "jobs.db"  # shared by the workers of one host
+    jobs_max_workers: int = 4  # jobs running at once per gateway process
+    jobs_max_queued: int = 1000
+    jobs_timeout: float = 3600.0  # deadline of a job's compute calls
+    jobs_poll_interval: float = 1.0  # cancellation checks and idle polling
+    jobs_lease_seconds: float = 30.0  # a job not renewed for this long runs again elsewhere
+    jobs_result_ttl: float = 86400.0  # seconds finished jobs are kept
+    
+    # Health monitoring (/health serves a cached snapshot)
+    health_refresh_interval: float = 5.0
+    health_stale_after: float = 15.0
+    
+    # Multi-process mode (workers > 1, started with python -m app.serve)
+    metrics_multiproc_dir: str = ""  # defaults to /dev/shm/gateway-metrics-<uid>
+    shared_health_cache: bool = True  # one worker polls compute health for all
+    
+    # Rate Limiting (per API key or client address)
+    rate_limit_enabled: bool = True
     rate_limit_per_minute: int = 100
     rate_limit_burst: int = 20
     
+    # Adaptive concurrency limiting (per operation type)
+    concurrency_algorithm: str = "gradient"  # gradient, aimd
+    concurrency_initial_limit: int = 16
+    concurrency_min_limit: int = 2
+    concurrency_max_limit: int = 256
+    concurrency_max_queue: int = 64
+    concurrency_queue_timeout: float = 1.0  # seconds a request may wait for a slot
+    
+    # Cost-aware scheduling (cost = estimated scalar operations of a request)
+    scheduler_interactive_max_cost: float = 1e5
+    scheduler_batch_min_cost: float = 1e7
+    scheduler_weight_interactive: int = 8
+    scheduler_weight_standard: int = 4
+    scheduler_weight_batch: int = 1
+    scheduler_key_max_share: float = 0.5  # fraction of an operation's limit one API key may hold
+    
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
+    log_async: bool = True
+    log_queue_size: int = 10000
+    log_success_sample_rate: float = 1.0  # fraction of INFO/DEBUG events kept
     
     # CORS
     cors_origins: list[str] = ["*"]
@@ -44,18 +124,37 @@ class Settings(BaseSettings):
     enable_metrics: bool = True
     metrics_port: int = 9090
     
+    # Profiling
+    profiling_max_seconds: float = 30.0
+    profiling_continuous_enabled: bool = False
+    profiling_continuous_interval_ms: int = 100
+    
+    # Tracing (OpenTelemetry)
+    tracing_enabled: bool = False
+    tracing_service_name: str = "compute-gateway"
+    tracing_exporter: str = "otlp"  # otlp, file
+    tracing_otlp_endpoint: str = "localhost:4317"
+    tracing_file_path: str = "traces.jsonl"
+    tracing_sample_ratio: float = 0.05
+    
     # Security
     api_key_header: str = "X-API-Key"
     enable_api_key_auth: bool = False
     valid_api_keys: list[str] = []
+    admin_api_key: str = ""  # required in X-Admin-Key for /debug endpoints
     
     # OpenAI Configuration
     openai_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
     openai_max_tokens: int = 1000
     openai_temperature: float = 0.7
+    openai_prompt_token_budget: int = 1500
+    openai_summary_sample_rows: int = 5
+    openai_summary_sample_items: int = 10
+    openai_summary_histogram_bins: int = 10
     
     class Config:
+        # .env is read here; it is not exported into os.environ
         env_file = ".env"
         case_sensitive = False
         extra = "ignore"  # Ignorovat extra fieldy z .env
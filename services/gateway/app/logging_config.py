@@ -0,0 +1,204 @@
+import atexit
+import logging
+import queue
+import random
+import sys
+import threading
+import zlib
+from typing import Any, Dict, Optional, TextIO
+
+import structlog
+
+from app.config import Settings
+from app.metrics import LOG_RECORDS_DROPPED
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+_sink: Optional["AsyncLogSink"] = None
+_handler: Optional[logging.Handler] = None
+
+
+def _orjson_dumps(obj: Any, default=None, **kwargs) -> str:
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def json_renderer() -> structlog.processors.JSONRenderer:
+    """JSON renderer backed by orjson when available"""
+    if orjson is not None:
+        return structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    return structlog.processors.JSONRenderer()
+
+
+class SuccessLogSampler:
+    """Keep only a fraction of INFO/DEBUG events; warnings and errors always pass
+
+    Events carrying a request_id are sampled by a hash of that ID, so either
+    all success lines of a request are kept or none are.
+    """
+
+    def __init__(self, sample_rate: float):
+        self.sample_rate = sample_rate
+        self._threshold = int(sample_rate * 0xFFFFFFFF)
+
+    def __call__(self, logger, method_name: str, event_dict: Dict[str, Any]):
+        if self.sample_rate >= 1.0 or method_name not in ("info", "debug"):
+            return event_dict
+
+        request_id = event_dict.get("request_id")
+        if request_id is not None:
+            keep = zlib.crc32(str(request_id).encode()) <= self._threshold
+        else:
+            keep = random.random() < self.sample_rate
+
+        if not keep:
+            raise structlog.DropEvent
+        return event_dict
+
+
+class AsyncLogSink:
+    """Writes rendered log lines to a stream from a background thread
+
+    Callers only enqueue the line; a full queue drops it instead of
+    blocking the event loop.
+    """
+
+    _STOP = object()
+
+    def __init__(self, stream: TextIO, maxsize: int):
+        self.stream = stream
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str):
+        try:
+            self.queue.put_nowait(line)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+    def _run(self):
+        while True:
+            line = self.queue.get()
+            lines = []
+            # Drain whatever else is queued and write it in one call
+            while line is not self._STOP:
+                lines.append(line)
+                try:
+                    line = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if lines:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            if line is self._STOP:
+                return
+
+    def stop(self):
+        """Write out queued lines and stop the writer thread"""
+        self.queue.put(self._STOP)
+        self._thread.join()
+
+
+def _write_line(line: str):
+    sink = _sink
+    if sink is not None:
+        sink.write(line)
+    else:
+        # Not configured yet or already stopped (e.g. during interpreter exit)
+        sys.stdout.write(line + "\n")
+
+
+class SinkLogger:
+    """structlog logger that hands rendered lines to the active AsyncLogSink"""
+
+    def __init__(self, *args):
+        pass
+
+    def msg(self, message: str):
+        _write_line(message)
+
+    log = debug = info = warning = warn = error = critical = exception = fatal = msg
+
+
+class SinkHandler(logging.Handler):
+    """stdlib handler feeding formatted records into the active AsyncLogSink"""
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            _write_line(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(settings: Settings):
+    """Configure structlog and the stdlib root logger
+
+    structlog events bypass the stdlib logging machinery: level filtering
+    and sampling run first, the event is rendered with orjson, and with
+    log_async the line is written by a background thread.
+    """
+    global _sink, _handler
+    level = logging.getLevelName(settings.log_level.upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
+    stop_logging()
+
+    renderer = json_renderer()
+    if settings.log_async:
+        _sink = AsyncLogSink(sys.stdout, settings.log_queue_size)
+        logger_factory = SinkLogger
+        handler: logging.Handler = SinkHandler()
+    else:
+        logger_factory = structlog.WriteLoggerFactory(sys.stdout)
+        handler = logging.StreamHandler(sys.stdout)
+
+    # Records from stdlib loggers (e.g. the AI assistant) get the same shape
+    handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            renderer,
+        ],
+        foreign_pre_chain=[
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+    ))
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+    _handler = handler
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            SuccessLogSampler(settings.log_success_sample_rate),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            renderer,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        context_class=dict,
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
+    )
+
+
+def stop_logging():
+    """Flush queued lines and stop the writer thread"""
+    global _sink
+    if _sink is not None:
+        _sink.stop()
+        _sink = None
+
+
+atexit.register(stop_logging)
@@ -1,53 +1,40 @@
-from fastapi import FastAPI, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from starlette.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.responses import PlainTextResponse, Response
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind, Status, StatusCode
+import asyncio
+import os
 import structlog
+import threading
 import time
+import uuid
 
 from app.config import get_settings
-from app.routers import compute, health, ai, ml
+from app.logging_config import configure_logging, stop_logging
+from app.metrics import REQUEST_COUNT, REQUEST_DURATION, render_latest, route_template
+from app.profiling import (
+    render_collapsed, render_flamegraph, require_admin, run_profile,
+    start_continuous_profiler, stop_continuous_profiler
+)
+from app.tracing import setup_tracing, shutdown_tracing, tracer, current_trace_id
+from app.routers import compute, health, jobs
 from app.services.compute_client import get_compute_client, close_compute_client
+from app.services.health_monitor import get_health_monitor
+from app.services.jobs import close_job_manager, get_job_manager
+from app.workers import mark_worker_dead
+from app.services.concurrency_limiter import OverloadedError, enforce_rate_limit
 
 # Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.stdlib.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.JSONRenderer()
-    ],
-    wrapper_class=structlog.stdlib.BoundLogger,
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    cache_logger_on_first_use=True,
-)
+configure_logging(get_settings())
 
 logger = structlog.get_logger()
 
-# Prometheus metrics
-REQUEST_COUNT = Counter(
-    'http_requests_total',
-    'Total HTTP requests',
-    ['method', 'endpoint', 'status']
-)
-
-REQUEST_DURATION = Histogram(
-    'http_request_duration_seconds',
-    'HTTP request duration',
-    ['method', 'endpoint']
-)
-
-COMPUTE_OPERATIONS = Counter(
-    'compute_operations_total',
-    'Total compute operations',
-    ['operation_type']
-)
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -58,19 +45,35 @@ async def lifespan(app: FastAPI):
         name=settings.app_name,
         version=settings.app_version
     )
+    setup_tracing(settings)
+    if settings.profiling_continuous_enabled:
+        start_continuous_profiler(settings.profiling_continuous_interval_ms)
     
-    # Initialize compute client
+    # Initialize compute client; in multi-process mode every worker runs
+    # this after it was spawned and gets its own channel
     try:
-        get_compute_client()
-        logger.info("compute_client_initialized")
+        client = get_compute_client()
+        if await client.wait_ready(settings.grpc_connect_timeout):
+            logger.info("compute_client_initialized", pid=os.getpid())
+        else:
+            logger.warning("compute_channel_not_ready", timeout=settings.grpc_connect_timeout)
     except Exception as e:
         logger.error("compute_client_init_failed", error=str(e))
+    get_health_monitor().start()
+    if settings.jobs_enabled:
+        get_job_manager().start()
     
     yield
     
     # Cleanup
     logger.info("application_shutting_down")
+    await get_health_monitor().stop()
+    await close_job_manager()
     close_compute_client()
+    stop_continuous_profiler()
+    shutdown_tracing()
+    mark_worker_dead()
+    stop_logging()
 
 
 # Create FastAPI app
@@ -92,80 +95,133 @@ app.add_middleware(
 )
 
 
-# Middleware for logging and metrics
+# Middleware for logging, metrics and tracing
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all requests and track metrics"""
-    start_time = time.time()
+    """Log all requests, track metrics and open the server span"""
+    start_time = time.perf_counter()
     
-    # Generate request ID
-    request_id = request.headers.get("X-Request-ID", f"{time.time()}")
-    
-    logger.info(
-        "request_started",
-        method=request.method,
-        path=request.url.path,
-        request_id=request_id
-    )
+    # Use the caller's request ID or generate one
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
     
-    try:
-        response = await call_next(request)
-        duration = time.time() - start_time
-        
-        # Track metrics
-        REQUEST_COUNT.labels(
-            method=request.method,
-            endpoint=request.url.path,
-            status=response.status_code
-        ).inc()
-        
-        REQUEST_DURATION.labels(
-            method=request.method,
-            endpoint=request.url.path
-        ).observe(duration)
+    with tracer.start_as_current_span(
+        f"HTTP {request.method}",
+        context=propagate.extract(request.headers),
+        kind=SpanKind.SERVER,
+        attributes={
+            "http.method": request.method,
+            "http.target": request.url.path,
+            "request_id": request_id
+        }
+    ) as span:
+        # Bind IDs so that every log line of this request can be correlated
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        trace_id = current_trace_id()
+        if trace_id:
+            structlog.contextvars.bind_contextvars(trace_id=trace_id)
         
         logger.info(
-            "request_completed",
+            "request_started",
             method=request.method,
             path=request.url.path,
-            status_code=response.status_code,
-            duration_ms=duration * 1000,
             request_id=request_id
         )
         
-        return response
-        
-    except Exception as e:
-        duration = time.time() - start_time
-        logger.error(
-            "request_failed",
-            method=request.method,
-            path=request.url.path,
-            error=str(e),
-            duration_ms=duration * 1000,
-            request_id=request_id
-        )
-        raise
+        try:
+            response = await call_next(request)
+            duration = time.perf_counter() - start_time
+            
+            # Track metrics by route template to keep label cardinality bounded
+            endpoint = route_template(request)
+            REQUEST_COUNT.labels(
+                method=request.method,
+                endpoint=endpoint,
+                status=response.status_code
+            ).inc()
+            
+            REQUEST_DURATION.labels(
+                method=request.method,
+                endpoint=endpoint
+            ).observe(duration)
+            
+            span.update_name(f"{request.method} {endpoint}")
+            span.set_attribute("http.route", endpoint)
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status(Status(StatusCode.ERROR))
+            
+            # Only successes go through the success log sampler
+            log = logger.info if 200 <= response.status_code < 300 else logger.warning
+            log(
+                "request_completed",
+                method=request.method,
+                path=request.url.path,
+                status_code=response.status_code,
+                duration_ms=duration * 1000,
+                request_id=request_id
+            )
+            
+            response.headers["X-Request-ID"] = request_id
+            return response
+            
+        except Exception as e:
+            duration = time.perf_counter() - start_time
+            REQUEST_COUNT.labels(
+                method=request.method,
+                endpoint=route_template(request),
+                status=500
+            ).inc()
+            logger.error(
+                "request_failed",
+                method=request.method,
+                path=request.url.path,
+                error=str(e),
+                duration_ms=duration * 1000,
+                request_id=request_id
+            )
+            raise
 
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors"""
+    # Errors raised in validators carry the exception object in their ctx
+    errors = jsonable_encoder(exc.errors())
     logger.warning(
         "validation_error",
         path=request.url.path,
-        errors=exc.errors()
+        errors=errors
     )
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": "Validation error",
-            "detail": exc.errors()
+            "detail": errors
         }
     )
 
 
+@app.exception_handler(OverloadedError)
+async def overloaded_exception_handler(request: Request, exc: OverloadedError):
+    """Shed load quickly with a retry hint"""
+    logger.warning(
+        "request_shed",
+        path=request.url.path,
+        operation_type=exc.operation_type,
+        reason=exc.reason
+    )
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "error": "Service overloaded",
+            "detail": exc.detail
+        },
+        headers={"Retry-After": str(int(exc.retry_after))}
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
@@ -189,25 +245,52 @@ async def general_exception_handler(request: Request, exc: Exception):
 async def metrics():
     """Prometheus metrics endpoint"""
     return Response(
-        generate_latest(),
+        render_latest(),
         media_type=CONTENT_TYPE_LATEST
     )
 
 
+# Profiling endpoint (admin only)
+@app.get("/debug/profile", dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(5.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    format: str = Query("collapsed", pattern="^(collapsed|svg)$")
+):
+    """Sample the event loop thread for a bounded time and return a profile"""
+    seconds = min(seconds, settings.profiling_max_seconds)
+    stacks = await asyncio.get_running_loop().run_in_executor(
+        None, run_profile, threading.get_ident(), seconds, interval_ms / 1000.0
+    )
+    if stacks is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already running"
+        )
+    
+    logger.info("profile_collected", seconds=seconds, samples=sum(stacks.values()))
+    if format == "svg":
+        return Response(
+            render_flamegraph(stacks, title=f"Gateway event loop, {seconds:g}s"),
+            media_type="image/svg+xml"
+        )
+    return PlainTextResponse(render_collapsed(stacks))
+
+
 # Include routers
 app.include_router(health.router)
-app.include_router(compute.router, prefix=settings.api_prefix)
-app.include_router(ai.router)  # AI Assistant endpoints
-app.include_router(ml.router)  # ML Inference endpoints
+rate_limited = [Depends(enforce_rate_limit)]
+app.include_router(compute.router, prefix=settings.api_prefix, dependencies=rate_limited)
+if settings.jobs_enabled:
+    app.include_router(jobs.router, prefix=settings.api_prefix, dependencies=rate_limited)
+if settings.ai_enabled:
+    from app.routers import ai
+    app.include_router(ai.router, dependencies=rate_limited)  # AI Assistant endpoints
+if settings.ml_enabled:
+    from app.routers import ml
+    app.include_router(ml.router, dependencies=rate_limited)  # ML Inference endpoints
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "main:app",
-        host=settings.host,
-        port=settings.port,
-        workers=settings.workers,
-        log_level=settings.log_level.lower(),
-        reload=settings.debug
-    )
+    from app.serve import main
+    main()
@@ -0,0 +1,242 @@
+import time
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from starlette.requests import Request
+
+from app.workers import multiprocess_dir
+
+# Buckets for whole HTTP requests (bounded by grpc_timeout)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Buckets for in-process work such as request conversion and serialization
+LOCAL_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0
+)
+
+# Buckets for gRPC round trips and backend computation
+BACKEND_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+# HTTP metrics, labelled by route template (e.g. /api/v1/ml/inference)
+REQUEST_COUNT = Counter(
+    'http_requests_total',
+    'Total HTTP requests',
+    ['method', 'endpoint', 'status']
+)
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request duration',
+    ['method', 'endpoint'],
+    buckets=HTTP_BUCKETS
+)
+
+# Compute operation metrics, labelled by operation type
+COMPUTE_OPERATIONS = Counter(
+    'compute_operations_total',
+    'Total compute operations',
+    ['operation_type']
+)
+
+COMPUTE_PARSE_DURATION = Histogram(
+    'compute_parse_duration_seconds',
+    'Gateway time spent converting a request into its gRPC message',
+    ['operation_type'],
+    buckets=LOCAL_BUCKETS
+)
+
+COMPUTE_GRPC_DURATION = Histogram(
+    'compute_grpc_wait_duration_seconds',
+    'Time spent waiting for the compute service gRPC call',
+    ['operation_type'],
+    buckets=BACKEND_BUCKETS
+)
+
+COMPUTE_BACKEND_DURATION = Histogram(
+    'compute_backend_duration_seconds',
+    'Computation time reported by the compute service',
+    ['operation_type'],
+    buckets=BACKEND_BUCKETS
+)
+
+COMPUTE_SERIALIZE_DURATION = Histogram(
+    'compute_serialize_duration_seconds',
+    'Gateway time spent converting a gRPC response into the API response',
+    ['operation_type'],
+    buckets=LOCAL_BUCKETS
+)
+
+# Concurrency limiting in front of the compute backend
+CONCURRENCY_LIMIT = Gauge(
+    'compute_concurrency_limit',
+    'Current adaptive limit of in-flight compute calls',
+    ['operation_type'],
+    multiprocess_mode='livesum'
+)
+
+CONCURRENCY_INFLIGHT = Gauge(
+    'compute_inflight_requests',
+    'Compute calls currently in flight',
+    ['operation_type'],
+    multiprocess_mode='livesum'
+)
+
+CONCURRENCY_QUEUED = Gauge(
+    'compute_queued_requests',
+    'Requests waiting for a concurrency slot',
+    ['operation_type'],
+    multiprocess_mode='livesum'
+)
+
+CONCURRENCY_REJECTED = Counter(
+    'compute_requests_rejected_total',
+    'Requests shed by the concurrency limiter',
+    ['operation_type', 'reason']
+)
+
+QUEUE_WAIT = Histogram(
+    'compute_queue_wait_seconds',
+    'Time a request waited for a concurrency slot, by priority lane',
+    ['operation_type', 'lane'],
+    buckets=BACKEND_BUCKETS
+)
+
+# Retries and hedged requests towards the compute backend
+RETRIES = Counter(
+    'compute_retries_total',
+    'Retry decisions for failed compute calls (retried or budget_exhausted)',
+    ['operation_type', 'outcome']
+)
+
+HEDGED_REQUESTS = Counter(
+    'compute_hedged_requests_total',
+    'Hedged compute calls by which copy answered first (primary, hedge or failed)',
+    ['operation_type', 'winner']
+)
+
+# Circuit breakers, labelled by backend address
+CIRCUIT_STATE = Gauge(
+    'compute_circuit_state',
+    'Circuit breaker state per backend (0 closed, 1 half-open, 2 open)',
+    ['backend'],
+    multiprocess_mode='livemax'
+)
+
+CIRCUIT_TRANSITIONS = Counter(
+    'compute_circuit_transitions_total',
+    'Circuit breaker state changes by new state',
+    ['backend', 'state']
+)
+
+CIRCUIT_REJECTED = Counter(
+    'compute_circuit_rejected_total',
+    'Calls failed fast because the backend circuit was open',
+    ['backend']
+)
+
+# Structured logging
+LOG_RECORDS_DROPPED = Counter(
+    'log_records_dropped_total',
+    'Log records dropped because the log queue was full'
+)
+
+# Continuous profiler, labelled by at most MAX_HOT_FUNCTIONS function names
+PROFILER_SAMPLES = Counter(
+    'profiler_samples_total',
+    'Continuous profiler samples by innermost function of the event loop thread',
+    ['function']
+)
+
+# Prompt tokens sent to the LLM per call
+AI_PROMPT_TOKENS = Histogram(
+    'ai_prompt_tokens',
+    'Prompt tokens sent to the LLM per call',
+    ['method'],
+    buckets=(50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+)
+
+# Background health monitoring of the compute service
+COMPUTE_UP = Gauge(
+    'compute_service_up',
+    'Whether the last compute HealthCheck reported healthy (1) or not (0)',
+    multiprocess_mode='livemin'
+)
+
+COMPUTE_HEALTH_AGE = Gauge(
+    'compute_health_snapshot_age_seconds',
+    'Age of the cached compute health snapshot when /health was last served',
+    multiprocess_mode='livemax'
+)
+
+# Background jobs
+JOBS_RUNNING = Gauge(
+    'jobs_running',
+    'Background jobs currently running',
+    multiprocess_mode='livesum'
+)
+
+JOBS_FINISHED = Counter(
+    'jobs_finished_total',
+    'Background jobs run to completion by status (succeeded or failed)',
+    ['operation_type', 'status']
+)
+
+RATE_LIMITED = Counter(
+    'http_requests_rate_limited_total',
+    'Requests rejected by the per-client rate limit'
+)
+
+
+def render_latest() -> bytes:
+    """Prometheus exposition, aggregated over all workers in multi-process mode"""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def route_template(request: Request) -> str:
+    """Return the matched route template for metric labels"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class OperationTimer:
+    """Records where the time of one compute operation goes
+
+    Stages are measured back to back: request conversion (parse), the gRPC
+    round trip (grpc wait, with the backend's own computation time recorded
+    separately) and response conversion (serialize).
+    """
+
+    def __init__(self, operation_type: str):
+        self.operation_type = operation_type
+        self._last = time.perf_counter()
+        COMPUTE_OPERATIONS.labels(operation_type=operation_type).inc()
+
+    def _lap(self) -> float:
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        return elapsed
+
+    def parsed(self):
+        """Mark the gRPC request as built"""
+        COMPUTE_PARSE_DURATION.labels(operation_type=self.operation_type).observe(self._lap())
+
+    def received(self, computation_time_ms: float):
+        """Mark the gRPC response as received"""
+        COMPUTE_GRPC_DURATION.labels(operation_type=self.operation_type).observe(self._lap())
+        COMPUTE_BACKEND_DURATION.labels(
+            operation_type=self.operation_type
+        ).observe(computation_time_ms / 1000.0)
+
+    def serialized(self):
+        """Mark the API response as built"""
+        COMPUTE_SERIALIZE_DURATION.labels(operation_type=self.operation_type).observe(self._lap())
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 class MLInferenceRequest(BaseModel):
@@ -18,6 +18,19 @@ class MLInferenceResponse(BaseModel):
     inference_time_ms: float
     model_info: str
 
+class MLBatchInferenceRequest(BaseModel):
+    """Request for batch ML inference; all inputs share one shape"""
+    model_name: str
+    inputs: List[List[float]] = Field(..., min_length=1)  # Flattened input arrays
+    input_shape: List[int]  # Shape of a single input, e.g. [1, 1, 28, 28]
+    apply_softmax: bool = True
+    top_k: int = 5
+
+class MLBatchInferenceResponse(BaseModel):
+    """Response from batch ML inference, one result per input"""
+    results: List[MLInferenceResponse]
+    total_inference_time_ms: float
+
 class ImageClassificationRequest(BaseModel):
     """Request for image classification"""
     image_data: List[float]  # Flattened image array
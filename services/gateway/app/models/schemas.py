@@ -1,14 +1,96 @@
 from pydantic import BaseModel, Field, validator
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple, Union
+
+# Bounds on the shape of sparse matrices (rows * cols, and either dimension);
+# only their nonzeros are stored, so the payload does not bound the shape
+MAX_SPARSE_ELEMENTS = 10 ** 9
+MAX_SPARSE_DIMENSION = 1_000_000
+
+
+class SparseMatrix(BaseModel):
+    """Sparse matrix given by its nonzero entries, in CSR or COO form"""
+    format: str = Field(
+        default="csr", description="Entry layout: csr (indptr, indices) or coo (row, col)"
+    )
+    shape: List[int] = Field(..., min_items=2, max_items=2, description="[rows, cols]")
+    indptr: Optional[List[int]] = Field(
+        default=None, description="CSR: row i holds entries indptr[i] to indptr[i + 1] - 1"
+    )
+    indices: Optional[List[int]] = Field(default=None, description="CSR: column of each entry")
+    row: Optional[List[int]] = Field(default=None, description="COO: row of each entry")
+    col: Optional[List[int]] = Field(default=None, description="COO: column of each entry")
+    data: List[float] = Field(..., description="Value of each entry")
+    
+    @validator('format')
+    def validate_format(cls, v):
+        if v not in ("csr", "coo"):
+            raise ValueError("Invalid sparse format. Valid: csr, coo")
+        return v
+    
+    @validator('shape')
+    def validate_shape(cls, v):
+        if any(n < 1 for n in v):
+            raise ValueError("Sparse matrix dimensions must be positive")
+        if max(v) > MAX_SPARSE_DIMENSION or v[0] * v[1] > MAX_SPARSE_ELEMENTS:
+            raise ValueError(
+                f"Sparse matrix shape exceeds {MAX_SPARSE_DIMENSION} rows or columns "
+                f"or {MAX_SPARSE_ELEMENTS} elements"
+            )
+        return v
+    
+    @validator('data')
+    def validate_entries(cls, v, values):
+        if 'format' not in values or 'shape' not in values:
+            return v
+        rows, cols = values['shape']
+        if values['format'] == "csr":
+            indptr, indices = values.get('indptr'), values.get('indices')
+            if indptr is None or indices is None:
+                raise ValueError("CSR matrix requires indptr and indices")
+            if len(indptr) != rows + 1 or indptr[0] != 0 or indptr[-1] != len(v):
+                raise ValueError("CSR indptr must have rows + 1 offsets from 0 to the entry count")
+            if any(indptr[i] > indptr[i + 1] for i in range(rows)):
+                raise ValueError("CSR indptr must not decrease")
+            row_indices = None
+        else:
+            row_indices, indices = values.get('row'), values.get('col')
+            if row_indices is None or indices is None:
+                raise ValueError("COO matrix requires row and col")
+            if len(row_indices) != len(v):
+                raise ValueError("COO row and data must have the same length")
+            if any(i < 0 or i >= rows for i in row_indices):
+                raise ValueError("COO row index out of range")
+        if len(indices) != len(v):
+            raise ValueError("Column indices and data must have the same length")
+        if any(j < 0 or j >= cols for j in indices):
+            raise ValueError("Column index out of range")
+        return v
+
+
+# A matrix is either dense rows or a SparseMatrix
+Matrix = Union[SparseMatrix, List[List[float]]]
+
+
+def matrix_shape(matrix: Matrix) -> Tuple[int, int]:
+    """(rows, cols) of a dense or sparse matrix"""
+    if isinstance(matrix, SparseMatrix):
+        return matrix.shape[0], matrix.shape[1]
+    return len(matrix), len(matrix[0])
 
 
 class MatrixMultiplyRequest(BaseModel):
     """Request for matrix multiplication"""
-    matrix_a: List[List[float]] = Field(..., description="First matrix (rows x cols)")
-    matrix_b: List[List[float]] = Field(..., description="Second matrix (rows x cols)")
+    matrix_a: Matrix = Field(..., description="First matrix (rows x cols), dense or sparse")
+    matrix_b: Matrix = Field(..., description="Second matrix (rows x cols), dense or sparse")
+    result_format: str = Field(
+        default="auto",
+        description="Result layout: dense, sparse (CSR) or auto (sparse if an input is sparse)"
+    )
     
     @validator('matrix_a', 'matrix_b')
     def validate_matrix(cls, v):
+        if isinstance(v, SparseMatrix):
+            return v
         if not v or not all(len(row) == len(v[0]) for row in v):
             raise ValueError("Matrix must be rectangular (all rows same length)")
         return v
@@ -16,18 +98,25 @@ class MatrixMultiplyRequest(BaseModel):
     @validator('matrix_b')
     def validate_dimensions(cls, v, values):
         if 'matrix_a' in values:
-            matrix_a = values['matrix_a']
-            if len(matrix_a[0]) != len(v):
+            if matrix_shape(values['matrix_a'])[1] != matrix_shape(v)[0]:
                 raise ValueError("Matrix dimensions incompatible for multiplication")
         return v
+    
+    @validator('result_format')
+    def validate_result_format(cls, v):
+        if v not in ("auto", "dense", "sparse"):
+            raise ValueError("Invalid result format. Valid: auto, dense, sparse")
+        return v
 
 
 class MatrixMultiplyResponse(BaseModel):
-    """Response for matrix multiplication"""
-    result: List[List[float]]
+    """Response for matrix multiplication; result or sparse_result is set"""
+    result: Optional[List[List[float]]] = None
+    sparse_result: Optional[SparseMatrix] = None
     rows: int
     cols: int
     computation_time_ms: float
+    kernel: str = Field(default="dense", description="Kernel that ran: dense, spmm or spgemm")
 
 
 class StatsAnalysisRequest(BaseModel):
@@ -69,6 +158,11 @@ class MonteCarloRequest(BaseModel):
         default="pi_estimation",
         description="Type of simulation: pi_estimation, option_pricing, integration"
     )
+    sampling: str = Field(
+        default="pseudo_random",
+        description="Sampling strategy: pseudo_random, antithetic, control_variate "
+                    "(option_pricing only), stratified, sobol, halton"
+    )
     
     @validator('simulation_type')
     def validate_simulation_type(cls, v):
@@ -76,6 +170,21 @@ class MonteCarloRequest(BaseModel):
         if v not in valid_types:
             raise ValueError(f"Invalid simulation type. Valid: {valid_types}")
         return v
+    
+    @validator('sampling')
+    def validate_sampling(cls, v, values):
+        # Minimum iterations: two per stratum, one point per randomized QMC replicate
+        min_iterations = {
+            "pseudo_random": 1, "antithetic": 1, "control_variate": 1,
+            "stratified": 512, "sobol": 16, "halton": 16
+        }
+        if v not in min_iterations:
+            raise ValueError(f"Invalid sampling strategy. Valid: {set(min_iterations)}")
+        if v == "control_variate" and values.get('simulation_type') != "option_pricing":
+            raise ValueError("control_variate sampling is only supported for option_pricing")
+        if values.get('iterations', min_iterations[v]) < min_iterations[v]:
+            raise ValueError(f"{v} sampling needs at least {min_iterations[v]} iterations")
+        return v
 
 
 class MonteCarloResponse(BaseModel):
@@ -85,6 +194,7 @@ class MonteCarloResponse(BaseModel):
     confidence_interval_upper: float
     iterations_completed: int
     computation_time_ms: float
+    variance_reduction_factor: float = 1.0
     additional_metrics: Dict[str, float] = {}
 
 
@@ -122,6 +232,38 @@ class VectorOperationResponse(BaseModel):
     computation_time_ms: float
 
 
+class JobSubmitRequest(BaseModel):
+    """Request to run a compute operation as a background job"""
+    operation: str = Field(..., description="matrix_multiply, statistics, monte_carlo")
+    payload: Dict[str, Any] = Field(..., description="Request body of the operation's endpoint")
+    
+    @validator('operation')
+    def validate_operation(cls, v):
+        if v not in JOB_REQUEST_MODELS:
+            raise ValueError(f"Invalid job operation. Valid: {set(JOB_REQUEST_MODELS)}")
+        return v
+    
+    @validator('payload')
+    def validate_payload(cls, v, values):
+        if 'operation' in values:
+            # Rejected at submission rather than when the job runs
+            return JOB_REQUEST_MODELS[values['operation']](**v).model_dump()
+        return v
+
+
+class JobResponse(BaseModel):
+    """State of a background job, with its result once it succeeded"""
+    job_id: str
+    operation: str
+    status: str = Field(..., description="queued, running, succeeded, failed, cancelled")
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
@@ -129,6 +271,11 @@ class HealthResponse(BaseModel):
     version: str
     compute_service_status: str
     uptime_seconds: Optional[float] = None
+    circuit_breakers: Dict[str, str] = {}
+    channel_state: Optional[str] = None
+    checked_at: Optional[float] = None
+    age_seconds: Optional[float] = None
+    stale: bool = False
 
 
 class ErrorResponse(BaseModel):
@@ -136,3 +283,11 @@ class ErrorResponse(BaseModel):
     error: str
     detail: Optional[str] = None
     request_id: Optional[str] = None
+
+
+# Request models of the operations that can run as background jobs
+JOB_REQUEST_MODELS = {
+    "matrix_multiply": MatrixMultiplyRequest,
+    "statistics": StatsAnalysisRequest,
+    "monte_carlo": MonteCarloRequest,
+}
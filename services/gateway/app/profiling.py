@@ -0,0 +1,198 @@
+import collections
+import html
+import os
+import secrets
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import structlog
+from fastapi import Header, HTTPException, status
+
+from app.config import get_settings
+from app.metrics import PROFILER_SAMPLES
+
+logger = structlog.get_logger()
+
+# Cap on distinct function labels exported by the continuous sampler
+MAX_HOT_FUNCTIONS = 200
+OTHER_FUNCTION = "other"
+
+_profile_lock = threading.Lock()
+_continuous: Optional["ContinuousSampler"] = None
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def sample_stack(thread_id: int) -> Optional[List[str]]:
+    """Current stack of a thread, outermost frame first"""
+    frame = sys._current_frames().get(thread_id)
+    if frame is None:
+        return None
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def profile_thread(thread_id: int, seconds: float, interval: float) -> Dict[str, int]:
+    """Sample a thread for a fixed duration and return collapsed stacks
+
+    The result maps "outer;...;inner" stacks to sample counts, the input
+    format of flamegraph.pl and speedscope.
+    """
+    stacks: Dict[str, int] = collections.Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        stack = sample_stack(thread_id)
+        if stack:
+            stacks[";".join(stack)] += 1
+        time.sleep(interval)
+    return dict(stacks)
+
+
+def run_profile(thread_id: int, seconds: float, interval: float) -> Optional[Dict[str, int]]:
+    """profile_thread() that refuses to run concurrently; returns None when busy"""
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        return profile_thread(thread_id, seconds, interval)
+    finally:
+        _profile_lock.release()
+
+
+def render_collapsed(stacks: Dict[str, int]) -> str:
+    """Collapsed stack text, heaviest stacks first"""
+    lines = sorted(stacks.items(), key=lambda item: item[1], reverse=True)
+    return "".join(f"{stack} {count}\n" for stack, count in lines)
+
+
+def render_flamegraph(stacks: Dict[str, int], title: str = "Flame graph",
+                      width: int = 1200, row_height: int = 16) -> str:
+    """Render collapsed stacks as a self-contained SVG flame graph"""
+    root: dict = {"count": 0, "children": {}}
+    for stack, count in stacks.items():
+        root["count"] += count
+        node = root
+        for name in stack.split(";"):
+            node = node["children"].setdefault(name, {"count": 0, "children": {}})
+            node["count"] += count
+
+    total = root["count"] or 1
+    rects = []
+    max_depth = 0
+
+    def layout(node: dict, x: float, depth: int):
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+        for name, child in sorted(node["children"].items()):
+            child_width = child["count"] / total * width
+            if child_width >= 0.5:
+                rects.append((name, child["count"], x, depth, child_width))
+                layout(child, x, depth + 1)
+            x += child_width
+
+    layout(root, 0.0, 0)
+
+    height = (max_depth + 1) * row_height + 24
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">',
+        f'<text x="4" y="14">{html.escape(title)} ({total} samples)</text>',
+    ]
+    for name, count, x, depth, rect_width in rects:
+        y = height - (depth + 1) * row_height
+        hue = 10 + (hash(name) % 40)
+        label = html.escape(name)
+        parts.append(
+            f'<g><title>{label} ({count} samples, {count / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{rect_width:.1f}" height="{row_height - 1}" '
+            f'fill="hsl({hue},90%,60%)"/>'
+        )
+        max_chars = int(rect_width / 7)
+        if max_chars >= 3:
+            text = label if len(name) <= max_chars else html.escape(name[:max_chars - 2]) + ".."
+            parts.append(f'<text x="{x + 2:.1f}" y="{y + row_height - 4}">{text}</text>')
+        parts.append("</g>")
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+class ContinuousSampler:
+    """Low-rate background sampler exporting hot functions as metrics
+
+    Every interval the innermost frame of the watched thread is counted in
+    profiler_samples_total. At 10 Hz the overhead is negligible, and the
+    counters show where the event loop spends its time between incidents.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self._labels: set = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def sample(self):
+        """Take one sample of the watched thread"""
+        stack = sample_stack(self.thread_id)
+        if not stack:
+            return
+        function = stack[-1]
+        if function not in self._labels:
+            if len(self._labels) >= MAX_HOT_FUNCTIONS:
+                function = OTHER_FUNCTION
+            else:
+                self._labels.add(function)
+        PROFILER_SAMPLES.labels(function=function).inc()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+def start_continuous_profiler(interval_ms: int):
+    """Start sampling the calling thread (the event loop) in the background"""
+    global _continuous
+    if _continuous is not None:
+        return
+    _continuous = ContinuousSampler(threading.get_ident(), interval_ms / 1000.0)
+    _continuous.start()
+    logger.info("continuous_profiler_started", interval_ms=interval_ms)
+
+
+def stop_continuous_profiler():
+    """Stop the background sampler"""
+    global _continuous
+    if _continuous is not None:
+        _continuous.stop()
+        _continuous = None
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(default=None)):
+    """Allow the request only with the configured admin key"""
+    admin_key = get_settings().admin_api_key
+    if not admin_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled"
+        )
+    if x_admin_key is None or not secrets.compare_digest(x_admin_key, admin_key):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key"
+        )
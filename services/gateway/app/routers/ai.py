@@ -8,12 +8,14 @@ import structlog
 
 from app.services.ai_assistant import get_ai_assistant
 from app.services.compute_client import get_compute_client
+from app.tracing import TracedRoute
 
 logger = structlog.get_logger()
 
 router = APIRouter(
     prefix="/api/v1/ai",
-    tags=["AI Assistant"]
+    tags=["AI Assistant"],
+    route_class=TracedRoute
 )
 
 
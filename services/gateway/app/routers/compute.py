@@ -1,15 +1,19 @@
+import grpc
 from fastapi import APIRouter, HTTPException, status
 from app.models.schemas import (
-    MatrixMultiplyRequest, MatrixMultiplyResponse,
+    MatrixMultiplyRequest, MatrixMultiplyResponse, matrix_shape,
     StatsAnalysisRequest, StatsAnalysisResponse,
     MonteCarloRequest, MonteCarloResponse,
     VectorOperationRequest, VectorOperationResponse
 )
 from app.services.compute_client import get_compute_client
+from app.services.concurrency_limiter import OverloadedError
+from app.services.sparse import MatrixTooLargeError
+from app.tracing import TracedRoute
 import structlog
 
 logger = structlog.get_logger()
-router = APIRouter(prefix="/compute", tags=["compute"])
+router = APIRouter(prefix="/compute", tags=["compute"], route_class=TracedRoute)
 
 
 @router.post(
@@ -21,12 +25,14 @@ router = APIRouter(prefix="/compute", tags=["compute"])
 async def multiply_matrices(request: MatrixMultiplyRequest):
     """Multiply two matrices"""
     try:
+        rows_a, cols_a = matrix_shape(request.matrix_a)
+        rows_b, cols_b = matrix_shape(request.matrix_b)
         logger.info(
             "matrix_multiply_request",
-            rows_a=len(request.matrix_a),
-            cols_a=len(request.matrix_a[0]),
-            rows_b=len(request.matrix_b),
-            cols_b=len(request.matrix_b[0])
+            rows_a=rows_a,
+            cols_a=cols_a,
+            rows_b=rows_b,
+            cols_b=cols_b
         )
         
         client = get_compute_client()
@@ -34,11 +40,20 @@ async def multiply_matrices(request: MatrixMultiplyRequest):
         
         logger.info(
             "matrix_multiply_success",
-            computation_time_ms=result.computation_time_ms
+            computation_time_ms=result.computation_time_ms,
+            kernel=result.kernel
         )
         
         return result
         
+    except OverloadedError:
+        raise
+    except MatrixTooLargeError as e:
+        logger.warning("matrix_multiply_too_large", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error("matrix_multiply_error", error=str(e))
         raise HTTPException(
@@ -72,6 +87,8 @@ async def analyze_statistics(request: StatsAnalysisRequest):
         
         return result
         
+    except OverloadedError:
+        raise
     except Exception as e:
         logger.error("stats_analysis_error", error=str(e))
         raise HTTPException(
@@ -93,7 +110,8 @@ async def run_monte_carlo(request: MonteCarloRequest):
             "monte_carlo_request",
             iterations=request.iterations,
             dimensions=request.dimensions,
-            simulation_type=request.simulation_type
+            simulation_type=request.simulation_type,
+            sampling=request.sampling
         )
         
         client = get_compute_client()
@@ -102,12 +120,22 @@ async def run_monte_carlo(request: MonteCarloRequest):
         logger.info(
             "monte_carlo_success",
             computation_time_ms=result.computation_time_ms,
-            result=result.result
+            result=result.result,
+            variance_reduction_factor=result.variance_reduction_factor
         )
         
         return result
         
+    except OverloadedError:
+        raise
     except Exception as e:
+        if isinstance(e, grpc.RpcError) and e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+            # The service rejected the parameters; its message says which one
+            logger.warning("monte_carlo_rejected", error=e.details())
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=e.details()
+            )
         logger.error("monte_carlo_error", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
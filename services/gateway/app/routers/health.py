@@ -1,6 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from app.models.schemas import HealthResponse
-from app.services.compute_client import get_compute_client
+from app.services.health_monitor import get_health_monitor
 from app.config import get_settings
 import time
 
@@ -13,23 +13,31 @@ start_time = time.time()
     "/health",
     response_model=HealthResponse,
     summary="Health check",
-    description="Check the health status of the gateway and compute services"
+    description="Health of the gateway and compute services, served from the "
+                "background-refreshed snapshot unless deep=true"
 )
-async def health_check():
+async def health_check(
+    deep: bool = Query(
+        False, description="Run a live compute HealthCheck instead of using the cache"
+    )
+):
     """Health check endpoint"""
     settings = get_settings()
     
-    # Check compute service
-    client = get_compute_client()
-    compute_health = await client.health_check()
-    compute_status = compute_health.get("status", "unknown")
+    # Compute service health is refreshed in the background
+    snapshot = await get_health_monitor().snapshot(deep=deep)
     
     return HealthResponse(
-        status="healthy" if compute_status == "healthy" else "degraded",
+        status="healthy" if snapshot["healthy"] else "degraded",
         service=settings.app_name,
         version=settings.app_version,
-        compute_service_status=compute_status,
-        uptime_seconds=time.time() - start_time
+        compute_service_status=snapshot["compute_status"],
+        uptime_seconds=time.time() - start_time,
+        circuit_breakers=snapshot["circuit_breakers"],
+        channel_state=snapshot["channel_state"],
+        checked_at=snapshot["checked_at"],
+        age_seconds=snapshot["age_seconds"],
+        stale=snapshot["stale"]
     )
 
 
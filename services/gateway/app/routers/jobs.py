@@ -0,0 +1,73 @@
+from fastapi import APIRouter, HTTPException, Response, status
+from app.config import get_settings
+from app.models.schemas import JobResponse, JobSubmitRequest
+from app.services.job_store import CANCELLED, FINISHED, Job
+from app.services.jobs import get_job_manager
+from app.tracing import TracedRoute
+import structlog
+
+logger = structlog.get_logger()
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=TracedRoute)
+
+
+def job_response(job: Job) -> JobResponse:
+    """Public view of a stored job"""
+    return JobResponse(
+        job_id=job.id,
+        operation=job.operation,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        attempts=job.attempts,
+        result=job.result,
+        error=job.error
+    )
+
+
+@router.post(
+    "",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a background job",
+    description="Queues a compute operation and returns its job id without waiting for the result"
+)
+async def submit_job(request: JobSubmitRequest, response: Response):
+    """Submit a compute operation as a background job"""
+    job = await get_job_manager().submit(request.operation, request.payload)
+    response.headers["Location"] = f"{get_settings().api_prefix}{router.prefix}/{job.id}"
+    return job_response(job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="Get job status",
+    description="Returns the job's status, and its result once it has succeeded"
+)
+async def get_job(job_id: str):
+    """Status and result of a background job"""
+    job = await get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job_response(job)
+
+
+@router.delete(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="Cancel a job",
+    description="Cancels a queued or running job; finished jobs cannot be cancelled"
+)
+async def cancel_job(job_id: str):
+    """Cancel a background job"""
+    job = await get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if job.status in FINISHED and job.status != CANCELLED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already {job.status}"
+        )
+    logger.info("job_cancelled", job_id=job_id)
+    return job_response(job)
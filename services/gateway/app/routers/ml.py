@@ -2,14 +2,20 @@ from fastapi import APIRouter, HTTPException
 from app.models.ml_schemas import (
     MLInferenceRequest,
     MLInferenceResponse,
+    MLBatchInferenceRequest,
+    MLBatchInferenceResponse,
     ImageClassificationRequest,
     ImageClassificationResponse
 )
 from app.services.compute_client import get_compute_client
+from app.services.concurrency_limiter import OverloadedError
+from app.services.health_monitor import get_health_monitor
+from app.metrics import OperationTimer
+from app.tracing import TracedRoute
 from app import compute_pb2
 import time
 
-router = APIRouter(prefix="/api/v1/ml", tags=["Machine Learning"])
+router = APIRouter(prefix="/api/v1/ml", tags=["Machine Learning"], route_class=TracedRoute)
 
 @router.post("/inference", response_model=MLInferenceResponse)
 async def ml_inference(request: MLInferenceRequest):
@@ -24,6 +30,7 @@ async def ml_inference(request: MLInferenceRequest):
     """
     try:
         client = get_compute_client()
+        timer = OperationTimer("ml_inference")
         
         # Create gRPC request
         grpc_request = compute_pb2.MLInferenceRequest(
@@ -33,12 +40,14 @@ async def ml_inference(request: MLInferenceRequest):
             apply_softmax=request.apply_softmax,
             top_k=request.top_k
         )
+        timer.parsed()
         
         # Call C++ service
-        response = client.MLInference(grpc_request)
+        response = await client.MLInference(grpc_request)
+        timer.received(response.inference_time_ms)
         
         # Convert to response model
-        return MLInferenceResponse(
+        result = MLInferenceResponse(
             output=list(response.output),
             probabilities=list(response.probabilities) if response.probabilities else None,
             top_classes=list(response.top_classes) if response.top_classes else None,
@@ -46,10 +55,71 @@ async def ml_inference(request: MLInferenceRequest):
             inference_time_ms=response.inference_time_ms,
             model_info=response.model_info
         )
+        timer.serialized()
+        return result
         
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"ML inference failed: {str(e)}")
 
+@router.post("/inference/batch", response_model=MLBatchInferenceResponse)
+async def ml_batch_inference(request: MLBatchInferenceRequest):
+    """
+    Run neural network inference on a batch of inputs in one model run
+    
+    - **model_name**: Name of the model to use (e.g., "mnist")
+    - **inputs**: Flattened input arrays, all of the same size
+    - **input_shape**: Shape of a single input [1, channels, height, width]
+    - **apply_softmax**: Whether to apply softmax to outputs
+    - **top_k**: Number of top predictions to return per input
+    """
+    try:
+        client = get_compute_client()
+        timer = OperationTimer("ml_batch_inference")
+        
+        grpc_request = compute_pb2.MLBatchInferenceRequest(
+            model_name=request.model_name,
+            batch_requests=[
+                compute_pb2.MLInferenceRequest(
+                    model_name=request.model_name,
+                    input_data=input_data,
+                    input_shape=request.input_shape,
+                    apply_softmax=request.apply_softmax,
+                    top_k=request.top_k
+                )
+                for input_data in request.inputs
+            ]
+        )
+        timer.parsed()
+        
+        response = await client.MLBatchInference(grpc_request)
+        timer.received(response.total_inference_time_ms)
+        
+        result = MLBatchInferenceResponse(
+            results=[
+                MLInferenceResponse(
+                    output=list(item.output),
+                    probabilities=list(item.probabilities) if item.probabilities else None,
+                    top_classes=list(item.top_classes) if item.top_classes else None,
+                    top_probabilities=(
+                        list(item.top_probabilities) if item.top_probabilities else None
+                    ),
+                    inference_time_ms=item.inference_time_ms,
+                    model_info=item.model_info
+                )
+                for item in response.batch_responses
+            ],
+            total_inference_time_ms=response.total_inference_time_ms
+        )
+        timer.serialized()
+        return result
+        
+    except OverloadedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"ML batch inference failed: {str(e)}")
+
 @router.post("/classify", response_model=ImageClassificationResponse)
 async def classify_image(request: ImageClassificationRequest):
     """
@@ -93,6 +163,8 @@ async def classify_image(request: ImageClassificationRequest):
             inference_time_ms=result.inference_time_ms
         )
         
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Image classification failed: {str(e)}")
 
@@ -114,16 +186,18 @@ async def list_models():
     }
 
 @router.get("/health")
-async def ml_health():
+async def ml_health(deep: bool = False):
     """
-    Check ML inference service health
+    Check ML inference service health (cached compute health unless deep=true)
     """
-    try:
-        client = get_compute_client()
-        # Simple health check - try to connect
-        return {
-            "status": "healthy",
-            "message": "ML inference service is operational"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=f"ML service unavailable: {str(e)}")
+    snapshot = await get_health_monitor().snapshot(deep=deep)
+    if not snapshot["healthy"]:
+        error = snapshot["compute"].get("error", snapshot["compute_status"])
+        raise HTTPException(status_code=503, detail=f"ML service unavailable: {error}")
+    return {
+        "status": "healthy",
+        "message": "ML inference service is operational",
+        "circuit_breakers": snapshot["circuit_breakers"],
+        "models": snapshot["compute"].get("models", []),
+        "age_seconds": snapshot["age_seconds"]
+    }
@@ -0,0 +1,32 @@
+"""
+Run the gateway: python -m app.serve
+
+With WORKERS > 1 the gateway starts in multi-process mode: the shared
+metrics directory is prepared before uvicorn spawns the workers, so every
+worker creates its metrics in it and /metrics reports totals over all of
+them. Each worker sets up its own compute channel in the lifespan hook.
+"""
+import os
+
+import uvicorn
+
+from app.config import get_settings
+from app.workers import MULTIPROC_ENV, prepare_multiprocess_dir
+
+
+def main():
+    settings = get_settings()
+    if settings.workers > 1 and MULTIPROC_ENV not in os.environ:
+        os.environ[MULTIPROC_ENV] = prepare_multiprocess_dir(settings.metrics_multiproc_dir)
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        log_level=settings.log_level.lower(),
+        reload=settings.debug
+    )
+
+
+if __name__ == "__main__":
+    main()
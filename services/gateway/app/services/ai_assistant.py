@@ -4,9 +4,12 @@ OpenAI Assistant Service - Inteligentní vrstva pro komunikaci s uživatelem
 import os
 from typing import Dict, Any, Optional
 import logging
-from openai import OpenAI
 import json
 
+from app.metrics import AI_PROMPT_TOKENS
+from app.services.result_summarizer import ResultSummarizer, estimate_tokens
+from app.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,15 +17,22 @@ class AIAssistant:
     """OpenAI asistent pro inteligentní interakci s compute službou"""
     
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None,
-                 max_tokens: Optional[int] = None, temperature: Optional[float] = None):
+                 max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                 summarizer: Optional[ResultSummarizer] = None):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY není nastavený! Zkontrolujte .env soubor")
         
+        # openai se importuje až při prvním použití, zpomaloval by start gatewaye
+        from openai import OpenAI
         self.client = OpenAI(api_key=self.api_key)
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         self.max_tokens = max_tokens or int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
         self.temperature = temperature or float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
+        self.summarizer = summarizer or ResultSummarizer(
+            token_budget=int(os.getenv("OPENAI_PROMPT_TOKEN_BUDGET", "1500"))
+        )
+        self.last_prompt_tokens: Optional[int] = None
         
         logger.info(f"AI Assistant inicializován s modelem {self.model}")
     
@@ -40,22 +50,12 @@ class AIAssistant:
         prompt = self._create_analysis_prompt(operation, result)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Jsi pomocný asistent, který vysvětluje matematické a statistické výsledky jednoduchým způsobem. Odpovídáš v češtině."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=self.max_tokens,
+            response = self._chat(
+                "analyze_result",
+                "Jsi pomocný asistent, který vysvětluje matematické a statistické výsledky jednoduchým způsobem. Odpovídáš v češtině.",
+                prompt,
                 temperature=self.temperature
             )
-            
             explanation = response.choices[0].message.content.strip()
             logger.info(f"AI analýza dokončena pro {operation}")
             return explanation
@@ -100,22 +100,12 @@ Příklad pro násobení matic:
 """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Jsi asistent, který převádí přirozený jazyk na API požadavky. Vracíš POUZE validní JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=self.max_tokens,
+            response = self._chat(
+                "generate_query",
+                "Jsi asistent, který převádí přirozený jazyk na API požadavky. Vracíš POUZE validní JSON.",
+                prompt,
                 temperature=0.3  # Nižší teplota pro přesnější JSON
             )
-            
             json_str = response.choices[0].message.content.strip()
             # Odstranění markdown code blocku pokud existuje
             if json_str.startswith("```"):
@@ -142,7 +132,7 @@ Příklad pro násobení matic:
         Returns:
             Doporučené parametry
         """
-        context_str = json.dumps(context) if context else "žádný specifický kontext"
+        context_str = self.summarizer.render(context) if context else "žádný specifický kontext"
         
         prompt = f"""
 Doporuč optimální parametry pro operaci: {operation}
@@ -158,12 +148,32 @@ Vrať JSON s doporučenými parametry a zdůvodněním.
 """
         
         try:
+            response = self._chat(
+                "recommend_parameters",
+                "Jsi expert na optimalizaci výpočetních parametrů.",
+                prompt,
+                temperature=0.5
+            )
+            recommendation = response.choices[0].message.content.strip()
+            logger.info(f"AI doporučení vytvořeno pro {operation}")
+            return {"recommendation": recommendation}
+            
+        except Exception as e:
+            logger.error(f"Chyba při vytváření doporučení: {e}")
+            return {"error": str(e)}
+    
+    def _chat(self, method: str, system_prompt: str, prompt: str, temperature: float) -> Any:
+        """Zavolá chat completion API ve vlastním spanu a zaznamená velikost promptu"""
+        with tracer.start_as_current_span(
+            f"llm.{method}",
+            attributes={"llm.model": self.model, "llm.max_tokens": self.max_tokens}
+        ) as span:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
                         "role": "system",
-                        "content": "Jsi expert na optimalizaci výpočetních parametrů."
+                        "content": system_prompt
                     },
                     {
                         "role": "user",
@@ -171,26 +181,40 @@ Vrať JSON s doporučenými parametry a zdůvodněním.
                     }
                 ],
                 max_tokens=self.max_tokens,
-                temperature=0.5
+                temperature=temperature
             )
-            
-            recommendation = response.choices[0].message.content.strip()
-            logger.info(f"AI doporučení vytvořeno pro {operation}")
-            return {"recommendation": recommendation}
-            
-        except Exception as e:
-            logger.error(f"Chyba při vytváření doporučení: {e}")
-            return {"error": str(e)}
+            prompt_tokens = self._record_prompt_tokens(method, prompt, response)
+            span.set_attribute("llm.prompt_tokens", prompt_tokens)
+            return response
+    
+    def _record_prompt_tokens(self, method: str, prompt: str, response: Any) -> int:
+        """
+        Zaznamená počet tokenů promptu pro jedno volání LLM
+        
+        Použije hodnotu z odpovědi API (usage.prompt_tokens), pokud je k dispozici,
+        jinak odhad z délky promptu.
+        """
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(tokens, int):
+            tokens = estimate_tokens(prompt)
+        
+        self.last_prompt_tokens = tokens
+        AI_PROMPT_TOKENS.labels(method=method).observe(tokens)
+        logger.info(f"Prompt pro {method}: {tokens} tokenů")
+        return tokens
     
     def _create_analysis_prompt(self, operation: str, result: Dict[str, Any]) -> str:
-        """Vytvoří prompt pro analýzu výsledku"""
+        """Vytvoří prompt pro analýzu výsledku (velké výsledky se nejdříve zmenší)"""
         
         if operation == "matrix_multiply":
+            matrix = result.get('result')
+            dimensions = result.get('result_dimensions') or [result.get('rows'), result.get('cols')]
             return f"""
 Vysvětli výsledek násobení matic:
-- Rozměry výsledné matice: {result.get('result_dimensions')}
+- Rozměry výsledné matice: {dimensions}
 - Čas výpočtu: {result.get('computation_time_ms')} ms
-- První řádek výsledku: {result.get('result', [[]])[0] if result.get('result') else 'N/A'}
+- Přehled výsledku: {self.summarizer.render(matrix) if matrix else 'N/A'}
 
 Vysvětli co to znamená a zda je výkon dobrý.
 """
@@ -222,13 +246,13 @@ Co tento výsledek znamená a je počet simulací dostatečný?
             return f"""
 Vysvětli výsledek vektorové operace:
 - Operace: {result.get('operation')}
-- Výsledek: {result.get('result')}
+- Výsledek: {self.summarizer.render(result.get('result'))}
 - Čas výpočtu: {result.get('computation_time_ms')} ms
 
 Co tento výsledek znamená?
 """
         
-        return f"Vysvětli výsledek operace {operation}: {json.dumps(result, indent=2)}"
+        return f"Vysvětli výsledek operace {operation}: {self.summarizer.render(result)}"
 
 
 # Singleton instance
@@ -240,11 +264,13 @@ def get_ai_assistant() -> AIAssistant:
     global _assistant_instance
     if _assistant_instance is None:
         from app.config import get_settings
+        from app.services.result_summarizer import get_result_summarizer
         settings = get_settings()
         _assistant_instance = AIAssistant(
             api_key=settings.openai_api_key,
             model=settings.openai_model,
             max_tokens=settings.openai_max_tokens,
-            temperature=settings.openai_temperature
+            temperature=settings.openai_temperature,
+            summarizer=get_result_summarizer()
         )
     return _assistant_instance
@@ -0,0 +1,142 @@
+"""
+Circuit breaker per compute backend.
+
+While a backend keeps failing (or answering too slowly) requests fail fast
+with 503 instead of each paying for connection attempts, timeouts and
+retries. After open_seconds the breaker goes half-open and a HealthCheck
+probe decides whether the backend takes traffic again.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Tuple
+
+import grpc
+import structlog
+
+from app.config import get_settings
+from app.metrics import CIRCUIT_REJECTED, CIRCUIT_STATE, CIRCUIT_TRANSITIONS
+from app.services.concurrency_limiter import OverloadedError
+
+logger = structlog.get_logger()
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Status codes that say something about the backend rather than the request
+BACKEND_FAILURE_CODES = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNKNOWN,
+})
+
+
+class CircuitOpenError(OverloadedError):
+    """Raised instead of calling a backend whose circuit is open"""
+
+    def __init__(self, operation_type: str, backend: str, retry_after: float):
+        super().__init__(operation_type, "circuit_open", retry_after)
+        self.backend = backend
+        self.detail = "Compute backend unavailable, retry later"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a sliding window of calls
+
+    The breaker opens when, over the last window_size calls (and at least
+    min_calls), the share of failed calls reaches failure_rate or the share
+    of calls slower than slow_call_seconds reaches slow_call_rate.
+    """
+
+    def __init__(self, backend: str, probe: Callable[[], Awaitable[bool]],
+                 window_size: int = 20, min_calls: int = 10, failure_rate: float = 0.5,
+                 slow_call_seconds: float = 10.0, slow_call_rate: float = 0.8,
+                 open_seconds: float = 5.0, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.probe = probe
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+
+        self.state = CLOSED
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probe_task: Optional[asyncio.Task] = None
+        CIRCUIT_STATE.labels(backend=backend).set(_STATE_VALUES[CLOSED])
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        logger.warning("circuit_state_changed", backend=self.backend,
+                       old_state=self.state, new_state=state)
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self._calls.clear()
+        CIRCUIT_STATE.labels(backend=self.backend).set(_STATE_VALUES[state])
+        CIRCUIT_TRANSITIONS.labels(backend=self.backend, state=state).inc()
+
+    def retry_after(self) -> float:
+        remaining = self._opened_at + self.open_seconds - time.monotonic()
+        return max(1.0, math.ceil(remaining))
+
+    def allows(self) -> bool:
+        """True if calls may go to the backend; starts the probe once the open period ends"""
+        if self.state == CLOSED or not self.enabled:
+            return True
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+            self._probe_task = asyncio.ensure_future(self._run_probe())
+        return False
+
+    def check(self, operation_type: str):
+        """Raise CircuitOpenError unless the backend may be called"""
+        if not self.allows():
+            CIRCUIT_REJECTED.labels(backend=self.backend).inc()
+            raise CircuitOpenError(operation_type, self.backend, self.retry_after())
+
+    async def _run_probe(self):
+        try:
+            healthy = await self.probe()
+        except Exception as e:
+            logger.warning("circuit_probe_failed", backend=self.backend, error=str(e))
+            healthy = False
+        self._transition(CLOSED if healthy else OPEN)
+
+    def record(self, latency: float, error: Optional[BaseException] = None):
+        """Feed the outcome of one call into the window"""
+        if self.state != CLOSED or not self.enabled:
+            return
+        failed = isinstance(error, grpc.RpcError) and error.code() in BACKEND_FAILURE_CODES
+        self._calls.append((failed, latency >= self.slow_call_seconds))
+        if len(self._calls) < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._calls if failed) / len(self._calls)
+        slow = sum(1 for _, slow in self._calls if slow) / len(self._calls)
+        if failures >= self.failure_rate or slow >= self.slow_call_rate:
+            self._transition(OPEN)
+
+
+def create_breaker(backend: str, probe: Callable[[], Awaitable[bool]]) -> CircuitBreaker:
+    """Breaker for one backend configured from settings"""
+    settings = get_settings()
+    return CircuitBreaker(
+        backend,
+        probe,
+        window_size=settings.circuit_window_size,
+        min_calls=settings.circuit_min_calls,
+        failure_rate=settings.circuit_failure_rate,
+        slow_call_seconds=settings.circuit_slow_call_ms / 1000.0,
+        slow_call_rate=settings.circuit_slow_call_rate,
+        open_seconds=settings.circuit_open_seconds,
+        enabled=settings.circuit_breaker_enabled
+    )
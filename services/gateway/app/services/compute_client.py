@@ -1,8 +1,12 @@
+import asyncio
 import grpc
 import sys
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Optional
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import Dict, List, Optional, Tuple, Union
+from tenacity import AsyncRetrying, stop_after_attempt
 import structlog
 
 # Import generated protobuf files
@@ -10,8 +14,24 @@ from app import compute_pb2
 from app import compute_pb2_grpc
 
 from app.config import get_settings
+from app.metrics import HEDGED_REQUESTS, OperationTimer
+from app.tracing import grpc_call_span, trace_retry
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, create_breaker
+from app.services.concurrency_limiter import get_limiter
+from app.services.matrix_tiling import (
+    BYTES_PER_VALUE, MESSAGE_OVERHEAD, Block, BlockAssembler, message_bytes, plan_tiles, slice_block
+)
+from app.services.retry_policy import (
+    MIN_ATTEMPT_SECONDS, backoff_within_deadline, get_latency_tracker, get_retry_budget,
+    hedge_delay, is_retryable, retry_within_budget, stop_at_deadline
+)
+from app.services.scheduler import classify, estimate_cost
+from app.services.sparse import (
+    BYTES_PER_ENTRY, CsrMatrix, MatrixTooLargeError, density, from_dense, to_csr, to_dense,
+    to_schema
+)
 from app.models.schemas import (
-    MatrixMultiplyRequest, MatrixMultiplyResponse,
+    MatrixMultiplyRequest, MatrixMultiplyResponse, SparseMatrix, matrix_shape,
     StatsAnalysisRequest, StatsAnalysisResponse,
     MonteCarloRequest, MonteCarloResponse,
     VectorOperationRequest, VectorOperationResponse
@@ -19,6 +39,174 @@ from app.models.schemas import (
 
 logger = structlog.get_logger()
 
+# Overall deadline in seconds of the compute calls made in the current
+# context; background jobs set a longer one than the grpc_timeout of requests
+call_timeout: ContextVar[Optional[float]] = ContextVar("call_timeout", default=None)
+
+# Status codes that indicate an overloaded backend rather than a bad request
+CONGESTION_CODES = frozenset({
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.UNAVAILABLE,
+})
+
+
+def _await_grpc_future(call: grpc.Future) -> asyncio.Future:
+    """Bridge a gRPC future into the running event loop"""
+    loop = asyncio.get_running_loop()
+    result = loop.create_future()
+    
+    def transfer():
+        if result.done():
+            return
+        exception = call.exception()
+        if exception is not None:
+            result.set_exception(exception)
+        else:
+            result.set_result(call.result())
+    
+    call.add_done_callback(lambda _: loop.call_soon_threadsafe(transfer))
+    result.add_done_callback(lambda f: call.cancel() if f.cancelled() else None)
+    return result
+
+
+def matrix_request_to_proto(request: MatrixMultiplyRequest) -> compute_pb2.MatrixMultiplyRequest:
+    """Flatten both matrices into the gRPC request"""
+    flat_a = [val for row in request.matrix_a for val in row]
+    flat_b = [val for row in request.matrix_b for val in row]
+    
+    return compute_pb2.MatrixMultiplyRequest(
+        matrix_a=flat_a,
+        matrix_b=flat_b,
+        rows_a=len(request.matrix_a),
+        cols_a=len(request.matrix_a[0]),
+        cols_b=len(request.matrix_b[0])
+    )
+
+
+def matrix_response_from_proto(
+    response: compute_pb2.MatrixMultiplyResponse
+) -> MatrixMultiplyResponse:
+    """Reshape the flat gRPC result into rows"""
+    result_matrix = []
+    for i in range(response.rows):
+        row = list(response.result[i * response.cols:(i + 1) * response.cols])
+        result_matrix.append(row)
+    
+    return MatrixMultiplyResponse(
+        result=result_matrix,
+        rows=response.rows,
+        cols=response.cols,
+        computation_time_ms=response.computation_time_ms
+    )
+
+
+def sparse_matrix_to_proto(matrix: CsrMatrix) -> compute_pb2.SparseMatrix:
+    """Copy a CSR matrix into its gRPC message"""
+    return compute_pb2.SparseMatrix(
+        rows=matrix.rows,
+        cols=matrix.cols,
+        row_offsets=matrix.indptr,
+        col_indices=matrix.indices,
+        values=matrix.data
+    )
+
+
+def sparse_request_to_proto(
+    a: CsrMatrix,
+    b: Union[CsrMatrix, List[List[float]]]
+) -> compute_pb2.SparseMatrixMultiplyRequest:
+    """Build the gRPC sparse product request; B goes as CSR or as flat dense rows"""
+    if isinstance(b, CsrMatrix):
+        return compute_pb2.SparseMatrixMultiplyRequest(
+            matrix_a=sparse_matrix_to_proto(a),
+            sparse_b=sparse_matrix_to_proto(b)
+        )
+    return compute_pb2.SparseMatrixMultiplyRequest(
+        matrix_a=sparse_matrix_to_proto(a),
+        dense_b=compute_pb2.DenseMatrix(
+            rows=len(b), cols=len(b[0]), values=[val for row in b for val in row]
+        )
+    )
+
+
+def sparse_response_from_proto(
+    response: compute_pb2.SparseMatrixMultiplyResponse,
+    sparse_result: bool
+) -> MatrixMultiplyResponse:
+    """Convert the gRPC sparse product response into the requested layout"""
+    if response.WhichOneof("result") == "sparse_result":
+        matrix = response.sparse_result
+        csr = CsrMatrix(
+            matrix.rows, matrix.cols,
+            list(matrix.row_offsets), list(matrix.col_indices), list(matrix.values)
+        )
+        dense = None if sparse_result else to_dense(csr)
+    else:
+        matrix = response.dense_result
+        dense = [
+            list(matrix.values[i * matrix.cols:(i + 1) * matrix.cols])
+            for i in range(matrix.rows)
+        ]
+        csr = from_dense(dense) if sparse_result else None
+    
+    return MatrixMultiplyResponse(
+        result=None if sparse_result else dense,
+        sparse_result=to_schema(csr) if sparse_result else None,
+        rows=matrix.rows,
+        cols=matrix.cols,
+        computation_time_ms=response.computation_time_ms,
+        kernel=response.kernel
+    )
+
+
+def stats_request_to_proto(request: StatsAnalysisRequest) -> compute_pb2.StatsAnalysisRequest:
+    """Build the gRPC statistics request"""
+    return compute_pb2.StatsAnalysisRequest(
+        data=request.data,
+        operations=request.operations
+    )
+
+
+def stats_response_from_proto(response: compute_pb2.StatsAnalysisResponse) -> StatsAnalysisResponse:
+    """Convert the gRPC statistics response, mapping unset values to None"""
+    return StatsAnalysisResponse(
+        mean=response.mean,
+        median=response.median if response.median != 0 else None,
+        stddev=response.stddev if response.stddev != 0 else None,
+        variance=response.variance if response.variance != 0 else None,
+        percentiles=dict(response.percentiles) if response.percentiles else None,
+        min=response.min,
+        max=response.max,
+        count=response.count,
+        computation_time_ms=response.computation_time_ms
+    )
+
+
+def monte_carlo_request_to_proto(request: MonteCarloRequest) -> compute_pb2.MonteCarloRequest:
+    """Build the gRPC Monte Carlo request"""
+    return compute_pb2.MonteCarloRequest(
+        iterations=request.iterations,
+        dimensions=request.dimensions,
+        seed=request.seed,
+        simulation_type=request.simulation_type,
+        sampling=request.sampling
+    )
+
+
+def monte_carlo_response_from_proto(response: compute_pb2.MonteCarloResponse) -> MonteCarloResponse:
+    """Convert the gRPC Monte Carlo response"""
+    return MonteCarloResponse(
+        result=response.result,
+        confidence_interval_lower=response.confidence_interval_lower,
+        confidence_interval_upper=response.confidence_interval_upper,
+        iterations_completed=response.iterations_completed,
+        computation_time_ms=response.computation_time_ms,
+        # Servers without sampling strategies leave the factor unset
+        variance_reduction_factor=response.variance_reduction_factor or 1.0,
+        additional_metrics=dict(response.additional_metrics)
+    )
+
 
 class ComputeServiceClient:
     """gRPC client for compute service"""
@@ -27,146 +215,518 @@ class ComputeServiceClient:
         self.settings = get_settings()
         self.channel: Optional[grpc.Channel] = None
         self.stub: Optional[compute_pb2_grpc.ComputeServiceStub] = None
+        self.hedge_channel: Optional[grpc.Channel] = None
+        self.hedge_stub: Optional[compute_pb2_grpc.ComputeServiceStub] = None
+        self.breaker: Optional[CircuitBreaker] = None
+        self.hedge_breaker: Optional[CircuitBreaker] = None
+        self.shard_channels: List[grpc.Channel] = []
+        self.shards: List[Tuple[compute_pb2_grpc.ComputeServiceStub, CircuitBreaker]] = []
         self._connect()
     
     def _connect(self):
         """Establish gRPC connection"""
         try:
-            self.channel = grpc.insecure_channel(
-                self.settings.compute_service_url,
-                options=[
-                    ('grpc.max_send_message_length', 100 * 1024 * 1024),
-                    ('grpc.max_receive_message_length', 100 * 1024 * 1024),
-                ]
-            )
+            options = [
+                ('grpc.max_send_message_length', self.settings.grpc_max_message_bytes),
+                ('grpc.max_receive_message_length', self.settings.grpc_max_message_bytes),
+            ]
+            self.channel = grpc.insecure_channel(self.settings.compute_service_url, options=options)
             self.stub = compute_pb2_grpc.ComputeServiceStub(self.channel)
+            self.breaker = create_breaker(
+                self.settings.compute_service_url, lambda: self._probe(self.stub)
+            )
             logger.info("connected_to_compute_service", 
                        url=self.settings.compute_service_url)
+            
+            # Hedged copies go to a second backend when one is configured
+            self.hedge_stub = self.stub
+            self.hedge_breaker = self.breaker
+            hedge_url = self.settings.compute_service_hedge_url
+            if hedge_url and hedge_url != self.settings.compute_service_url:
+                self.hedge_channel = grpc.insecure_channel(hedge_url, options=options)
+                self.hedge_stub = compute_pb2_grpc.ComputeServiceStub(self.hedge_channel)
+                self.hedge_breaker = create_breaker(hedge_url, lambda: self._probe(self.hedge_stub))
+            
+            # Backends taking the block products of distributed matrix multiplication
+            for url in self.settings.compute_shard_urls or [self.settings.compute_service_url]:
+                if url == self.settings.compute_service_url:
+                    self.shards.append((self.stub, self.breaker))
+                    continue
+                channel = grpc.insecure_channel(url, options=options)
+                stub = compute_pb2_grpc.ComputeServiceStub(channel)
+                self.shard_channels.append(channel)
+                self.shards.append((stub, create_breaker(url, lambda stub=stub: self._probe(stub))))
         except Exception as e:
             logger.error("failed_to_connect", error=str(e))
             raise
     
+    async def wait_ready(self, timeout: float) -> bool:
+        """Connect the channel up front instead of on the first request"""
+        try:
+            await asyncio.wait_for(
+                _await_grpc_future(grpc.channel_ready_future(self.channel)), timeout
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     def close(self):
         """Close gRPC channel"""
         if self.channel:
             self.channel.close()
+        if self.hedge_channel:
+            self.hedge_channel.close()
+        for channel in self.shard_channels:
+            channel.close()
+    
+    async def _probe(self, stub: compute_pb2_grpc.ComputeServiceStub) -> bool:
+        """HealthCheck probe deciding whether a half-open circuit closes again"""
+        response = await _await_grpc_future(stub.HealthCheck.future(
+            compute_pb2.HealthCheckRequest(), timeout=self.settings.circuit_probe_timeout
+        ))
+        return response.status == "healthy"
+    
+    def circuit_states(self) -> Dict[str, str]:
+        """Circuit breaker state per backend URL"""
+        breakers = {self.breaker, self.hedge_breaker, *(breaker for _, breaker in self.shards)}
+        return {breaker.backend: breaker.state for breaker in breakers if breaker is not None}
+    
+    def _route(self, operation_type: str):
+        """Backends for the primary call and its hedge, skipping open circuits"""
+        backends = [(self.stub, self.breaker)]
+        if self.hedge_stub is not self.stub:
+            backends.append((self.hedge_stub, self.hedge_breaker))
+        available = [backend for backend in backends if backend[1].allows()]
+        if not available:
+            self.breaker.check(operation_type)
+        return available[0], available[-1]
+    
+    async def _call(self, operation_type: str, backend, method: str, request, metadata,
+                    timeout=None):
+        """Run a unary RPC on a backend without blocking the event loop
+        
+        The call holds a slot of the operation's adaptive concurrency limit,
+        queued in the priority lane of its estimated cost; overload status
+        codes count as congestion signals for the limit. The outcome feeds
+        the backend's circuit breaker. Time spent queued for the slot comes
+        out of the call's timeout.
+        """
+        stub, breaker = backend
+        if timeout is None:
+            timeout = self.settings.grpc_timeout
+        deadline = time.monotonic() + timeout
+        lane = classify(estimate_cost(operation_type, request))
+        async with get_limiter(operation_type).slot(lane) as outcome:
+            remaining = deadline - time.monotonic()
+            if remaining < MIN_ATTEMPT_SECONDS:
+                raise asyncio.TimeoutError(f"{method} deadline passed while queued for a slot")
+            started = time.perf_counter()
+            try:
+                response = await _await_grpc_future(getattr(stub, method).future(
+                    request,
+                    timeout=remaining,
+                    metadata=metadata
+                ))
+            except grpc.RpcError as e:
+                breaker.record(time.perf_counter() - started, e)
+                if e.code() in CONGESTION_CODES:
+                    outcome["dropped"] = True
+                raise
+            breaker.record(time.perf_counter() - started)
+            return response
+    
+    async def _attempt(self, operation_type: str, method: str, request, metadata, timeout: float):
+        """One attempt, hedged with a second copy if it outlives the recent p95"""
+        primary, hedge = self._route(operation_type)
+        started = time.perf_counter()
+        calls = [asyncio.ensure_future(self._call(
+            operation_type, primary, method, request, metadata, timeout
+        ))]
+        try:
+            delay = hedge_delay(operation_type)
+            if delay is not None and delay < timeout - MIN_ATTEMPT_SECONDS:
+                done, _ = await asyncio.wait(calls, timeout=delay)
+                if not done:
+                    calls.append(asyncio.ensure_future(self._call(
+                        operation_type, hedge, method, request, metadata, timeout - delay
+                    )))
+            
+            pending = set(calls)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((c for c in calls if c in done and c.exception() is None), None)
+                if winner is not None:
+                    get_latency_tracker(operation_type).record(time.perf_counter() - started)
+                    if len(calls) > 1:
+                        HEDGED_REQUESTS.labels(
+                            operation_type=operation_type,
+                            winner="primary" if winner is calls[0] else "hedge"
+                        ).inc()
+                    return winner.result()
+            
+            # Every copy failed; the primary's error decides about retrying
+            if len(calls) > 1:
+                HEDGED_REQUESTS.labels(operation_type=operation_type, winner="failed").inc()
+            return calls[0].result()
+        finally:
+            for call in calls:
+                call.cancel()
+    
+    async def _invoke(self, operation_type: str, method: str, request, metadata):
+        """Call an RPC, retrying transient failures within the request's deadline
+        
+        Each attempt gets the time left until the deadline, backoff sleeps
+        never run past it and retries are drawn from the shared retry budget.
+        """
+        timeout = call_timeout.get()
+        if timeout is None:
+            timeout = self.settings.grpc_timeout
+        deadline = time.monotonic() + timeout
+        budget = get_retry_budget()
+        budget.deposit()
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.settings.grpc_max_retries) | stop_at_deadline(deadline),
+            wait=backoff_within_deadline(
+                deadline,
+                self.settings.retry_backoff_base_ms / 1000.0,
+                self.settings.retry_backoff_max_ms / 1000.0
+            ),
+            retry=retry_within_budget(operation_type, budget),
+            before_sleep=trace_retry,
+            reraise=True
+        )
+        async for attempt in retrying:
+            with attempt:
+                return await self._attempt(
+                    operation_type, method, request, metadata, deadline - time.monotonic()
+                )
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10)
-    )
     async def multiply_matrices(
         self, 
         request: MatrixMultiplyRequest
     ) -> MatrixMultiplyResponse:
-        """Multiply matrices via gRPC"""
+        """Multiply matrices via gRPC
+        
+        Products whose first factor is sparse enough run on the sparse
+        kernels; the others run dense, with sparse inputs expanded, and are
+        spread over the shard backends when they are large. Sparse inputs
+        are never expanded, nor their product returned dense, past
+        dense_matrix_max_elements.
+        """
+        sparse_inputs = [
+            m for m in (request.matrix_a, request.matrix_b) if isinstance(m, SparseMatrix)
+        ]
+        sparse_result = request.result_format == "sparse" or (
+            request.result_format == "auto" and bool(sparse_inputs)
+        )
+        result_shape = (matrix_shape(request.matrix_a)[0], matrix_shape(request.matrix_b)[1])
+        if sparse_inputs and not sparse_result:
+            self._check_dense_size(result_shape)
+        operands = self._sparse_operands(request)
+        if operands is not None:
+            return await self._multiply_sparse(*operands, sparse_result)
+        
+        self._check_dense_size(*(matrix_shape(m) for m in sparse_inputs))
+        if sparse_inputs:
+            self._check_dense_size(result_shape)
+        request = request.model_copy(update={
+            "matrix_a": to_dense(request.matrix_a),
+            "matrix_b": to_dense(request.matrix_b)
+        })
+        if self._should_distribute(request):
+            result = await self._multiply_distributed(request)
+        else:
+            result = await self._multiply_dense(request)
+        if sparse_result:
+            result = result.model_copy(update={
+                "result": None, "sparse_result": to_schema(from_dense(result.result))
+            })
+        return result
+    
+    async def _multiply_dense(
+        self,
+        request: MatrixMultiplyRequest
+    ) -> MatrixMultiplyResponse:
+        """Multiply dense matrices in a single call"""
+        timer = OperationTimer("matrix_multiply")
         try:
-            # Flatten matrices
-            flat_a = [val for row in request.matrix_a for val in row]
-            flat_b = [val for row in request.matrix_b for val in row]
+            grpc_request = matrix_request_to_proto(request)
+            timer.parsed()
             
-            grpc_request = compute_pb2.MatrixMultiplyRequest(
-                matrix_a=flat_a,
-                matrix_b=flat_b,
-                rows_a=len(request.matrix_a),
-                cols_a=len(request.matrix_a[0]),
-                cols_b=len(request.matrix_b[0])
-            )
+            with grpc_call_span("MultiplyMatrices") as (span, metadata):
+                response = await self._invoke(
+                    "matrix_multiply", "MultiplyMatrices", grpc_request, metadata
+                )
+                span.set_attribute("compute.computation_time_ms", response.computation_time_ms)
+            timer.received(response.computation_time_ms)
             
-            response = self.stub.MultiplyMatrices(
-                grpc_request,
-                timeout=self.settings.grpc_timeout
-            )
+            result = matrix_response_from_proto(response)
+            timer.serialized()
+            return result
             
-            # Reshape result
-            result_matrix = []
-            for i in range(response.rows):
-                row = list(response.result[i * response.cols:(i + 1) * response.cols])
-                result_matrix.append(row)
-            
-            return MatrixMultiplyResponse(
-                result=result_matrix,
-                rows=response.rows,
-                cols=response.cols,
-                computation_time_ms=response.computation_time_ms
-            )
+        except grpc.RpcError as e:
+            logger.error("grpc_error", error=str(e), code=e.code())
+            raise
+    
+    def _check_dense_size(self, *shapes: Tuple[int, int]):
+        """Refuse dense matrices of more than dense_matrix_max_elements"""
+        limit = self.settings.dense_matrix_max_elements
+        for rows, cols in shapes:
+            if rows * cols > limit:
+                raise MatrixTooLargeError(
+                    f"Product needs a dense {rows}x{cols} matrix, over the limit of "
+                    f"{limit} elements; send sparser matrices or request a sparse result"
+                )
+    
+    def _sparse_operands(
+        self,
+        request: MatrixMultiplyRequest
+    ) -> Optional[Tuple[CsrMatrix, Union[CsrMatrix, List[List[float]]]]]:
+        """A as CSR and B as CSR or dense rows for the sparse kernels, or None
+        
+        A factor counts as sparse below sparse_density_threshold; both
+        kernels need a sparse A, and B goes as CSR when it is sparse too.
+        Products whose messages could exceed the message cap stay on the
+        dense path, which can split them into blocks. The service itself
+        still runs its dense kernel when the product's multiply-adds say so.
+        """
+        threshold = self.settings.sparse_density_threshold
+        if density(request.matrix_a) >= threshold:
+            return None
+        a = to_csr(request.matrix_a)
+        if density(request.matrix_b) < threshold:
+            b = to_csr(request.matrix_b)
+            cols, b_bytes = b.cols, b.message_bytes()
+            row_nonzeros = [b.indptr[k + 1] - b.indptr[k] for k in range(b.rows)]
+            result_entries = sum(row_nonzeros[k] for k in a.indices)
+        else:
+            b = to_dense(request.matrix_b)
+            cols, b_bytes = len(b[0]), len(b) * len(b[0]) * BYTES_PER_VALUE
+            result_entries = a.nnz * len(b[0])
+        # The service returns the smaller of the CSR and dense encodings
+        result_bytes = min(result_entries * BYTES_PER_ENTRY, a.rows * cols * BYTES_PER_VALUE)
+        request_bytes = a.message_bytes() + b_bytes
+        message_cap = self.settings.grpc_max_message_bytes
+        if max(request_bytes, result_bytes) + MESSAGE_OVERHEAD > message_cap:
+            return None
+        return a, b
+    
+    async def _multiply_sparse(
+        self,
+        a: CsrMatrix,
+        b: Union[CsrMatrix, List[List[float]]],
+        sparse_result: bool
+    ) -> MatrixMultiplyResponse:
+        """Multiply a CSR matrix by a CSR or dense matrix via gRPC"""
+        timer = OperationTimer("matrix_multiply")
+        try:
+            grpc_request = sparse_request_to_proto(a, b)
+            timer.parsed()
+            
+            with grpc_call_span("MultiplySparseMatrices") as (span, metadata):
+                span.set_attribute("compute.nonzeros", a.nnz)
+                response = await self._invoke(
+                    "sparse_matrix_multiply", "MultiplySparseMatrices", grpc_request, metadata
+                )
+                span.set_attribute("compute.kernel", response.kernel)
+                span.set_attribute("compute.computation_time_ms", response.computation_time_ms)
+            timer.received(response.computation_time_ms)
+            
+            result = sparse_response_from_proto(response, sparse_result)
+            timer.serialized()
+            return result
             
         except grpc.RpcError as e:
             logger.error("grpc_error", error=str(e), code=e.code())
             raise
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10)
-    )
+    def _should_distribute(self, request: MatrixMultiplyRequest) -> bool:
+        """Whether a product runs as block products instead of a single call
+        
+        Products whose request or response would exceed the message cap can
+        only run that way; others are spread once several backends are
+        configured and the product is costly enough to pay for the slicing.
+        """
+        if not self.settings.distributed_matmul_enabled:
+            return False
+        rows, inner, cols = len(request.matrix_a), len(request.matrix_b), len(request.matrix_b[0])
+        if message_bytes(rows, inner, cols) > self.settings.grpc_max_message_bytes:
+            return True
+        cost = float(rows) * inner * cols
+        return len(self.shards) > 1 and cost >= self.settings.distributed_matmul_min_cost
+    
+    async def _multiply_distributed(
+        self,
+        request: MatrixMultiplyRequest
+    ) -> MatrixMultiplyResponse:
+        """Multiply as block products spread over the shard backends
+        
+        Each backend runs a few workers taking blocks from a shared queue, so
+        faster backends take more of them. A block failing with a transient
+        error goes back to the queue for any backend, drawing on the retry
+        budget; a backend whose circuit opens stops taking blocks. All blocks
+        share the request's deadline.
+        """
+        timer = OperationTimer("matrix_multiply")
+        started = time.perf_counter()
+        timeout = call_timeout.get()
+        if timeout is None:
+            timeout = self.settings.grpc_timeout
+        deadline = time.monotonic() + timeout
+        plan = plan_tiles(
+            len(request.matrix_a), len(request.matrix_b), len(request.matrix_b[0]),
+            len(self.shards),
+            min(
+                self.settings.distributed_matmul_max_block_bytes,
+                self.settings.grpc_max_message_bytes
+            )
+        )
+        assembler = BlockAssembler(plan)
+        pending = deque(plan.blocks())
+        ready = asyncio.Condition()
+        failures: Counter = Counter()
+        timer.parsed()
+        
+        with grpc_call_span("MultiplyMatricesDistributed") as (span, metadata):
+            span.set_attribute("compute.blocks", plan.block_count)
+            span.set_attribute("compute.backends", len(self.shards))
+            workers = [
+                asyncio.ensure_future(self._multiply_blocks(
+                    backend, request, pending, ready, assembler, failures, deadline, metadata
+                ))
+                for backend in self.shards
+                for _ in range(self.settings.distributed_matmul_inflight_per_backend)
+            ]
+            try:
+                await asyncio.gather(*workers)
+            except grpc.RpcError as e:
+                logger.error("grpc_error", error=str(e), code=e.code())
+                raise
+            finally:
+                for worker in workers:
+                    worker.cancel()
+            if not assembler.complete:
+                # Every backend's circuit opened before the queue was drained
+                _, breaker = self.shards[0]
+                raise CircuitOpenError("matrix_multiply", breaker.backend, breaker.retry_after())
+            
+            computation_time_ms = (time.perf_counter() - started) * 1000
+            span.set_attribute("compute.computation_time_ms", computation_time_ms)
+        timer.received(computation_time_ms)
+        
+        logger.info(
+            "distributed_matrix_multiply",
+            blocks=plan.block_count,
+            block_shape=(plan.block_rows, plan.block_inner, plan.block_cols),
+            backends=len(self.shards),
+            retried_blocks=len(failures)
+        )
+        result = MatrixMultiplyResponse(
+            result=assembler.result,
+            rows=plan.rows,
+            cols=plan.cols,
+            computation_time_ms=computation_time_ms
+        )
+        timer.serialized()
+        return result
+    
+    async def _multiply_blocks(self, backend, request: MatrixMultiplyRequest, pending: deque,
+                               ready: asyncio.Condition, assembler: BlockAssembler,
+                               failures: Counter, deadline: float, metadata):
+        """Worker running queued block products on one backend
+        
+        While the queue is empty but blocks are still in flight the worker
+        waits, since a failed block may come back to the queue.
+        """
+        _, breaker = backend
+        budget = get_retry_budget()
+        while True:
+            async with ready:
+                await ready.wait_for(lambda: pending or assembler.complete)
+            if assembler.complete or not breaker.allows():
+                return
+            block: Block = pending.popleft()
+            if block not in failures:
+                budget.deposit()
+            
+            remaining = deadline - time.monotonic()
+            if remaining < MIN_ATTEMPT_SECONDS:
+                raise asyncio.TimeoutError(
+                    "Distributed matrix multiplication exceeded its deadline"
+                )
+            grpc_request = compute_pb2.MatrixMultiplyRequest(
+                matrix_a=slice_block(request.matrix_a, block.rows, block.inner),
+                matrix_b=slice_block(request.matrix_b, block.inner, block.cols),
+                rows_a=len(block.rows),
+                cols_a=len(block.inner),
+                cols_b=len(block.cols)
+            )
+            try:
+                response = await self._call(
+                    "matrix_block", backend, "MultiplyMatrices", grpc_request, metadata, remaining
+                )
+            except grpc.RpcError as e:
+                failures[block] += 1
+                if (not is_retryable(e) or failures[block] >= self.settings.grpc_max_retries
+                        or not budget.withdraw()):
+                    raise
+                pending.append(block)
+            else:
+                assembler.add(block, response.result)
+            async with ready:
+                ready.notify_all()
+    
     async def analyze_statistics(
         self,
         request: StatsAnalysisRequest
     ) -> StatsAnalysisResponse:
         """Analyze statistics via gRPC"""
+        timer = OperationTimer("statistics")
         try:
-            grpc_request = compute_pb2.StatsAnalysisRequest(
-                data=request.data,
-                operations=request.operations
-            )
+            grpc_request = stats_request_to_proto(request)
+            timer.parsed()
             
-            response = self.stub.AnalyzeStatistics(
-                grpc_request,
-                timeout=self.settings.grpc_timeout
-            )
+            with grpc_call_span("AnalyzeStatistics") as (span, metadata):
+                response = await self._invoke(
+                    "statistics", "AnalyzeStatistics", grpc_request, metadata
+                )
+                span.set_attribute("compute.computation_time_ms", response.computation_time_ms)
+            timer.received(response.computation_time_ms)
             
-            return StatsAnalysisResponse(
-                mean=response.mean,
-                median=response.median if response.median != 0 else None,
-                stddev=response.stddev if response.stddev != 0 else None,
-                variance=response.variance if response.variance != 0 else None,
-                percentiles=dict(response.percentiles) if response.percentiles else None,
-                min=response.min,
-                max=response.max,
-                count=response.count,
-                computation_time_ms=response.computation_time_ms
-            )
+            result = stats_response_from_proto(response)
+            timer.serialized()
+            return result
             
         except grpc.RpcError as e:
             logger.error("grpc_error", error=str(e), code=e.code())
             raise
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10)
-    )
     async def run_monte_carlo(
         self,
         request: MonteCarloRequest
     ) -> MonteCarloResponse:
         """Run Monte Carlo simulation via gRPC"""
+        timer = OperationTimer("monte_carlo")
         try:
-            grpc_request = compute_pb2.MonteCarloRequest(
-                iterations=request.iterations,
-                dimensions=request.dimensions,
-                seed=request.seed,
-                simulation_type=request.simulation_type
-            )
+            grpc_request = monte_carlo_request_to_proto(request)
+            timer.parsed()
             
-            response = self.stub.RunMonteCarlo(
-                grpc_request,
-                timeout=self.settings.grpc_timeout
-            )
+            with grpc_call_span("RunMonteCarlo") as (span, metadata):
+                response = await self._invoke(
+                    "monte_carlo", "RunMonteCarlo", grpc_request, metadata
+                )
+                span.set_attribute("compute.computation_time_ms", response.computation_time_ms)
+            timer.received(response.computation_time_ms)
             
-            return MonteCarloResponse(
-                result=response.result,
-                confidence_interval_lower=response.confidence_interval_lower,
-                confidence_interval_upper=response.confidence_interval_upper,
-                iterations_completed=response.iterations_completed,
-                computation_time_ms=response.computation_time_ms,
-                additional_metrics=dict(response.additional_metrics)
-            )
+            result = monte_carlo_response_from_proto(response)
+            timer.serialized()
+            return result
             
         except grpc.RpcError as e:
             logger.error("grpc_error", error=str(e), code=e.code())
             raise
     
-    def MLInference(self, request):
+    async def MLInference(self, request):
         """
         Execute ML inference via gRPC
         
@@ -177,29 +737,68 @@ class ComputeServiceClient:
             compute_pb2.MLInferenceResponse
         """
         try:
-            response = self.stub.MLInference(
-                request,
-                timeout=self.settings.grpc_timeout
-            )
+            with grpc_call_span("MLInference") as (span, metadata):
+                response = await self._invoke(
+                    "ml_inference", "MLInference", request, metadata
+                )
+                span.set_attribute("compute.inference_time_ms", response.inference_time_ms)
             return response
         except grpc.RpcError as e:
             logger.error("ml_inference_grpc_error", error=str(e), code=e.code())
             raise
     
+    async def MLBatchInference(self, request):
+        """
+        Execute batched ML inference via gRPC (one model run for the whole batch)
+        
+        Args:
+            request: compute_pb2.MLBatchInferenceRequest
+            
+        Returns:
+            compute_pb2.MLBatchInferenceResponse
+        """
+        try:
+            with grpc_call_span("MLBatchInference") as (span, metadata):
+                span.set_attribute("compute.batch_size", len(request.batch_requests))
+                response = await self._invoke(
+                    "ml_batch_inference", "MLBatchInference", request, metadata
+                )
+                span.set_attribute("compute.inference_time_ms", response.total_inference_time_ms)
+            return response
+        except grpc.RpcError as e:
+            logger.error("ml_batch_inference_grpc_error", error=str(e), code=e.code())
+            raise
+    
     async def health_check(self) -> dict:
         """Check compute service health"""
+        if not self.breaker.allows():
+            return {"status": "unhealthy", "error": f"circuit {self.breaker.state}"}
         try:
             grpc_request = compute_pb2.HealthCheckRequest()
-            response = self.stub.HealthCheck(
-                grpc_request,
-                timeout=5
-            )
+            with grpc_call_span("HealthCheck") as (span, metadata):
+                response = await _await_grpc_future(self.stub.HealthCheck.future(
+                    grpc_request,
+                    timeout=5,
+                    metadata=metadata
+                ))
             
             return {
                 "status": response.status,
                 "uptime_seconds": response.uptime_seconds,
                 "total_requests": response.total_requests,
-                "avg_response_time_ms": response.avg_response_time_ms
+                "avg_response_time_ms": response.avg_response_time_ms,
+                "models": [
+                    {
+                        "model_name": model.model_name,
+                        "loaded": model.loaded,
+                        "load_time_ms": model.load_time_ms,
+                        "inference_count": model.inference_count,
+                        "avg_inference_time_ms": model.avg_inference_time_ms,
+                        "max_inference_time_ms": model.max_inference_time_ms,
+                        "error": model.error
+                    }
+                    for model in response.models
+                ]
             }
         except Exception as e:
             logger.error("health_check_failed", error=str(e))
@@ -0,0 +1,300 @@
+"""
+Adaptive concurrency limiting and rate limiting in front of the compute backend.
+
+Each operation type gets its own limit on in-flight gRPC calls that adapts to
+observed latency: when the backend starts queueing, latency rises above its
+long-term baseline and the limit shrinks; while latency stays flat the limit
+grows. Requests over the limit wait in a short bounded queue and are rejected
+with a retry hint once it is full, instead of piling up until they time out.
+Queued requests are dispatched by the cost-aware scheduler (app.services.scheduler).
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+import structlog
+from fastapi import HTTPException, Request, status
+
+from app.config import get_settings
+from app.metrics import (
+    CONCURRENCY_LIMIT, CONCURRENCY_INFLIGHT, CONCURRENCY_QUEUED, CONCURRENCY_REJECTED,
+    QUEUE_WAIT, RATE_LIMITED
+)
+from app.services.scheduler import FairQueue, Waiter, current_client, lane_weights
+
+logger = structlog.get_logger()
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed because the backend is at its limit"""
+
+    def __init__(self, operation_type: str, reason: str, retry_after: float):
+        super().__init__(f"{operation_type} overloaded ({reason})")
+        self.operation_type = operation_type
+        self.reason = reason
+        self.retry_after = retry_after
+        self.detail = f"Too many concurrent {operation_type} requests, retry later"
+
+
+class AdaptiveLimiter:
+    """Concurrency limit for one operation type
+
+    algorithm="gradient" follows the gradient approach: the limit is scaled
+    by long-term RTT / current RTT (with a tolerance) and gets a headroom of
+    sqrt(limit) for queueing. algorithm="aimd" adds one slot per limit's
+    worth of successful calls and multiplies the limit by backoff_ratio on
+    drops (timeouts, unavailable, resource exhausted).
+
+    A single client may hold at most key_max_share of the current limit;
+    its further requests queue even while other slots are free.
+    """
+
+    def __init__(self, operation_type: str, algorithm: str = "gradient",
+                 initial_limit: int = 16, min_limit: int = 2, max_limit: int = 256,
+                 max_queue: int = 64, queue_timeout: float = 1.0,
+                 tolerance: float = 1.5, smoothing: float = 0.2,
+                 backoff_ratio: float = 0.9, key_max_share: float = 1.0,
+                 lane_weights: Optional[Dict[str, float]] = None):
+        if algorithm not in ("gradient", "aimd"):
+            raise ValueError(f"Unknown concurrency algorithm: {algorithm}")
+        self.operation_type = operation_type
+        self.algorithm = algorithm
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.backoff_ratio = backoff_ratio
+        self.key_max_share = key_max_share
+
+        self._limit = float(initial_limit)
+        self.inflight = 0
+        self._client_inflight: Dict[str, int] = defaultdict(int)
+        self._waiters = FairQueue(
+            lane_weights or {"interactive": 8.0, "standard": 4.0, "batch": 1.0}
+        )
+        self._long_rtt: Optional[float] = None
+        self._avg_latency = 0.0
+        CONCURRENCY_LIMIT.labels(operation_type=operation_type).set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def client_quota(self) -> int:
+        """Slots a single client may hold at the current limit"""
+        return max(1, int(self._limit * self.key_max_share))
+
+    def _eligible(self, waiter: Waiter) -> bool:
+        return self._client_inflight[waiter.client] < self.client_quota()
+
+    def retry_after(self) -> float:
+        """Seconds until a queued request would likely get a slot"""
+        drain = (self.queued + 1) * self._avg_latency / max(self.limit, 1)
+        return max(1.0, math.ceil(drain))
+
+    def _reject(self, reason: str):
+        CONCURRENCY_REJECTED.labels(operation_type=self.operation_type, reason=reason).inc()
+        raise OverloadedError(self.operation_type, reason, self.retry_after())
+
+    async def acquire(self, lane: str = "standard", client: str = "anonymous"):
+        """Wait for a slot; raises OverloadedError if none frees up in time"""
+        waiter = Waiter(None, lane, client)
+        # _wake() leaves no eligible waiter queued while a slot is free, so an
+        # eligible client can take a free slot without overtaking anyone
+        if self.inflight < self.limit and self._eligible(waiter):
+            self._enter(client)
+            QUEUE_WAIT.labels(operation_type=self.operation_type, lane=lane).observe(0.0)
+            return
+        if self.queued >= self.max_queue:
+            self._reject("queue_full")
+
+        waiter.future = asyncio.get_running_loop().create_future()
+        self._waiters.push(waiter)
+        CONCURRENCY_QUEUED.labels(operation_type=self.operation_type).set(self.queued)
+        try:
+            await asyncio.wait_for(waiter.future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # A slot was reserved for us but will not be used
+                self._leave(client)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            CONCURRENCY_QUEUED.labels(operation_type=self.operation_type).set(self.queued)
+        # The slot was reserved for us by _wake()
+        QUEUE_WAIT.labels(operation_type=self.operation_type, lane=lane).observe(
+            time.perf_counter() - waiter.enqueued
+        )
+
+    def _enter(self, client: str):
+        self.inflight += 1
+        self._client_inflight[client] += 1
+        CONCURRENCY_INFLIGHT.labels(operation_type=self.operation_type).set(self.inflight)
+
+    def _wake(self):
+        while self.inflight < self.limit:
+            waiter = self._waiters.pop(self._eligible)
+            if waiter is None:
+                break
+            if not waiter.future.done():
+                self._enter(waiter.client)
+                waiter.future.set_result(None)
+
+    def _leave(self, client: str):
+        self.inflight -= 1
+        self._client_inflight[client] -= 1
+        if not self._client_inflight[client]:
+            del self._client_inflight[client]
+        CONCURRENCY_INFLIGHT.labels(operation_type=self.operation_type).set(self.inflight)
+        self._wake()
+
+    def release(self, latency: float, dropped: bool = False, client: str = "anonymous"):
+        """Return a slot and feed the call's outcome into the limit"""
+        self._avg_latency = latency if not self._avg_latency else (
+            0.9 * self._avg_latency + 0.1 * latency
+        )
+        self._update(latency, dropped)
+        self._leave(client)
+
+    def _update(self, latency: float, dropped: bool):
+        if self.algorithm == "aimd":
+            if dropped:
+                new_limit = self._limit * self.backoff_ratio
+            elif self.inflight >= self._limit / 2:
+                # Only grow while the limit is actually being used
+                new_limit = self._limit + 1.0 / self._limit
+            else:
+                return
+        else:
+            if self._long_rtt is None:
+                self._long_rtt = latency
+            else:
+                self._long_rtt = 0.95 * self._long_rtt + 0.05 * latency
+            if dropped:
+                gradient = 0.5
+            else:
+                gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / max(latency, 1e-6)))
+            target = self._limit * gradient + math.sqrt(self._limit)
+            new_limit = (1 - self.smoothing) * self._limit + self.smoothing * target
+
+        self._limit = min(max(new_limit, self.min_limit), self.max_limit)
+        CONCURRENCY_LIMIT.labels(operation_type=self.operation_type).set(self.limit)
+
+    @asynccontextmanager
+    async def slot(self, lane: str = "standard", client: Optional[str] = None):
+        """Hold a slot for the duration of one backend call
+
+        Usage: async with limiter.slot(lane) as outcome: ...; outcome["dropped"] = True
+        marks the call as a congestion signal. The client defaults to the
+        one identified for the current request.
+        """
+        client = client or current_client.get()
+        await self.acquire(lane, client)
+        outcome = {"dropped": False}
+        started = time.perf_counter()
+        try:
+            yield outcome
+        finally:
+            self.release(time.perf_counter() - started, outcome["dropped"], client)
+
+
+class TokenBucketRateLimiter:
+    """Per-client token buckets: `rate` tokens per second up to `burst`"""
+
+    def __init__(self, per_minute: int, burst: int, max_clients: int = 10000):
+        self.rate = per_minute / 60.0
+        self.burst = float(max(burst, 1))
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def check(self, client_id: str) -> Optional[float]:
+        """Take one token; returns None if allowed, else seconds until a token is available"""
+        now = time.monotonic()
+        bucket = self._buckets.pop(client_id, None)
+        if bucket is None:
+            bucket = [self.burst, now]
+            if len(self._buckets) >= self.max_clients:
+                self._buckets.popitem(last=False)
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        self._buckets[client_id] = bucket
+
+        if tokens >= 1.0:
+            bucket[0] = tokens - 1.0
+            return None
+        bucket[0] = tokens
+        return (1.0 - tokens) / self.rate if self.rate > 0 else 60.0
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_rate_limiter: Optional[TokenBucketRateLimiter] = None
+
+
+def get_limiter(operation_type: str) -> AdaptiveLimiter:
+    """Get or create the limiter of an operation type"""
+    limiter = _limiters.get(operation_type)
+    if limiter is None:
+        settings = get_settings()
+        limiter = AdaptiveLimiter(
+            operation_type,
+            algorithm=settings.concurrency_algorithm,
+            initial_limit=settings.concurrency_initial_limit,
+            min_limit=settings.concurrency_min_limit,
+            max_limit=settings.concurrency_max_limit,
+            max_queue=settings.concurrency_max_queue,
+            queue_timeout=settings.concurrency_queue_timeout,
+            key_max_share=settings.scheduler_key_max_share,
+            lane_weights=lane_weights()
+        )
+        _limiters[operation_type] = limiter
+    return limiter
+
+
+def get_rate_limiter() -> TokenBucketRateLimiter:
+    """Get the per-client rate limiter configured from settings"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        settings = get_settings()
+        _rate_limiter = TokenBucketRateLimiter(
+            settings.rate_limit_per_minute, settings.rate_limit_burst
+        )
+    return _rate_limiter
+
+
+async def enforce_rate_limit(request: Request):
+    """Router dependency applying rate_limit_per_minute / rate_limit_burst per client
+
+    Clients are identified by their API key header when it holds one of
+    valid_api_keys, otherwise by the remote address, so made-up keys cannot
+    buy fresh buckets. The identity is also what the scheduler's per-key
+    quota is applied to.
+    """
+    settings = get_settings()
+    api_key = request.headers.get(settings.api_key_header)
+    if api_key and api_key in settings.valid_api_keys:
+        client_id = api_key
+    else:
+        client_id = request.client.host if request.client else "unknown"
+    current_client.set(client_id)
+    if not settings.rate_limit_enabled:
+        return
+    retry_after = get_rate_limiter().check(client_id)
+    if retry_after is not None:
+        RATE_LIMITED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
@@ -0,0 +1,145 @@
+"""
+Background health monitoring of the compute service.
+
+A task refreshes the compute HealthCheck result on an interval and the
+channel's connectivity state is tracked via gRPC callbacks, so /health can
+answer from a cached snapshot without a blocking RPC per poll. With several
+workers, only the one holding the leader lock polls the compute service and
+shares its result with the others.
+"""
+import asyncio
+import os
+import time
+from typing import Optional
+
+import grpc
+import structlog
+
+from app.config import get_settings
+from app.metrics import COMPUTE_HEALTH_AGE, COMPUTE_UP
+from app.services.circuit_breaker import CLOSED
+from app.services.compute_client import get_compute_client
+from app.workers import LeaderLock, SharedFile, multiprocess_dir
+
+logger = structlog.get_logger()
+
+
+class HealthMonitor:
+    """Periodically refreshed snapshot of compute service health"""
+
+    def __init__(self, interval: float = 5.0, stale_after: float = 15.0,
+                 shared_dir: Optional[str] = None):
+        self.interval = interval
+        self.stale_after = stale_after
+        self._shared: Optional[SharedFile] = None
+        self._leader: Optional[LeaderLock] = None
+        if shared_dir:
+            self._shared = SharedFile(os.path.join(shared_dir, "compute_health.json"))
+            self._leader = LeaderLock(os.path.join(shared_dir, "compute_health.lock"))
+        self.compute: Optional[dict] = None
+        self.checked_at: Optional[float] = None
+        self.channel_state = "unknown"
+        self._channel: Optional[grpc.Channel] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _on_connectivity(self, state: grpc.ChannelConnectivity):
+        # Called from a gRPC thread; a plain attribute store is enough
+        self.channel_state = state.name.lower()
+
+    def _watch_channel(self, channel: Optional[grpc.Channel]):
+        if channel is self._channel:
+            return
+        if self._channel is not None:
+            self._channel.unsubscribe(self._on_connectivity)
+        self._channel = channel
+        if channel is not None:
+            self.channel_state = "unknown"
+            channel.subscribe(self._on_connectivity, try_to_connect=False)
+
+    async def refresh(self) -> dict:
+        """Run the HealthCheck RPC now and store the result"""
+        client = get_compute_client()
+        self._watch_channel(client.channel)
+        self.compute = await client.health_check()
+        self.checked_at = time.time()
+        COMPUTE_UP.set(1 if self.compute.get("status") == "healthy" else 0)
+        if self._shared is not None:
+            self._shared.write({"compute": self.compute, "checked_at": self.checked_at})
+        return self.compute
+
+    def _load_shared(self) -> bool:
+        """Take the snapshot published by the leader worker"""
+        shared = self._shared.read() if self._shared is not None else None
+        if shared is None:
+            return False
+        self._watch_channel(get_compute_client().channel)
+        self.compute = shared["compute"]
+        self.checked_at = shared["checked_at"]
+        COMPUTE_UP.set(1 if self.compute.get("status") == "healthy" else 0)
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                # A follower becomes leader once the previous leader's process exits
+                if self._leader is None or self._leader.acquire() or not self._load_shared():
+                    await self.refresh()
+            except Exception as e:
+                logger.error("health_refresh_failed", error=str(e))
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._watch_channel(None)
+        if self._leader is not None:
+            self._leader.release()
+
+    async def snapshot(self, deep: bool = False) -> dict:
+        """Cached health with its age; deep=True (or no snapshot yet) checks live"""
+        if deep or (self.compute is None and not self._load_shared()):
+            await self.refresh()
+        age = time.time() - self.checked_at
+        COMPUTE_HEALTH_AGE.set(age)
+        stale = age > self.stale_after
+        client = get_compute_client()
+        circuits = client.circuit_states()
+
+        compute_status = self.compute.get("status", "unknown")
+        if client.breaker.state != CLOSED:
+            compute_status = "circuit_open"
+        return {
+            "compute": self.compute,
+            "compute_status": compute_status,
+            "healthy": compute_status == "healthy" and not stale,
+            "checked_at": self.checked_at,
+            "age_seconds": age,
+            "stale": stale,
+            "channel_state": self.channel_state,
+            "circuit_breakers": circuits,
+        }
+
+
+_monitor: Optional[HealthMonitor] = None
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get or create the health monitor"""
+    global _monitor
+    if _monitor is None:
+        settings = get_settings()
+        _monitor = HealthMonitor(
+            settings.health_refresh_interval,
+            settings.health_stale_after,
+            shared_dir=multiprocess_dir() if settings.shared_health_cache else None
+        )
+    return _monitor
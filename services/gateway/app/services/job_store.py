@@ -0,0 +1,327 @@
+"""
+Persistent store of background jobs.
+
+The store is also the job queue: workers claim the oldest queued job and
+hold a lease on it while it runs. A job whose lease expires (its gateway
+process died) is claimed again, up to MAX_ATTEMPTS times. The SQLite store
+is shared by all worker processes of a host; the memory store serves a
+single process and tests.
+"""
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = frozenset({SUCCEEDED, FAILED, CANCELLED})
+
+# Claims of a job before it is given up as failed
+MAX_ATTEMPTS = 3
+
+
+@dataclass
+class Job:
+    """One submitted computation and its outcome"""
+    id: str
+    operation: str
+    payload: Dict[str, Any]
+    client: str = "anonymous"
+    status: str = QUEUED
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    owner: Optional[str] = None
+    lease_until: Optional[float] = None
+
+
+class JobStore(ABC):
+    """Interface of job stores; every method is synchronous and thread-safe"""
+
+    @abstractmethod
+    def create(self, job: Job):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_queued(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim(self, owner: str, lease_seconds: float) -> Optional[Job]:
+        """Start the oldest runnable job under owner's lease, if any"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease; False once the job is no longer owner's to run"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def finish(self, job_id: str, owner: str, status: str,
+               result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> bool:
+        """Store the outcome unless the job was cancelled or taken over meanwhile"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self, job_id: str, owner: str):
+        """Put a running job back into the queue, e.g. on shutdown"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; returns the job as it is afterwards"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge(self, finished_before: float) -> int:
+        """Delete jobs that finished before the given time"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryJobStore(JobStore):
+    """Jobs in a dict, lost on restart and not shared between processes"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Job):
+        with self._lock:
+            self._jobs[job.id] = replace(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return replace(job) if job is not None else None
+
+    def count_queued(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == QUEUED)
+
+    def claim(self, owner: str, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            for job in sorted(self._jobs.values(), key=lambda j: j.created_at):
+                expired = job.status == RUNNING and job.lease_until < now
+                if expired and job.attempts >= MAX_ATTEMPTS:
+                    job.status, job.finished_at = FAILED, now
+                    job.error = f"Abandoned after {job.attempts} attempts"
+                elif job.status == QUEUED or expired:
+                    job.status, job.owner, job.lease_until = RUNNING, owner, now + lease_seconds
+                    job.started_at = job.started_at or now
+                    job.attempts += 1
+                    return replace(job)
+        return None
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != RUNNING or job.owner != owner:
+                return False
+            job.lease_until = time.time() + lease_seconds
+            return True
+
+    def finish(self, job_id: str, owner: str, status: str,
+               result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != RUNNING or job.owner != owner:
+                return False
+            job.status, job.result, job.error = status, result, error
+            job.finished_at, job.lease_until = time.time(), None
+            return True
+
+    def release(self, job_id: str, owner: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == RUNNING and job.owner == owner:
+                job.status, job.owner, job.lease_until = QUEUED, None, None
+                job.attempts -= 1
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status not in FINISHED:
+                job.status, job.finished_at, job.lease_until = CANCELLED, time.time(), None
+            return replace(job)
+
+    def purge(self, finished_before: float) -> int:
+        with self._lock:
+            expired = [
+                job.id for job in self._jobs.values()
+                if job.status in FINISHED and job.finished_at < finished_before
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+
+class SQLiteJobStore(JobStore):
+    """Jobs in an SQLite database, shared by the gateway processes of a host"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            operation TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            client TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            result TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            lease_until REAL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        # Autocommit; claims take the write lock explicitly with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _job(row: Optional[sqlite3.Row]) -> Optional[Job]:
+        if row is None:
+            return None
+        values = dict(row)
+        values["payload"] = json.loads(values["payload"])
+        values["result"] = json.loads(values["result"]) if values["result"] is not None else None
+        return Job(**values)
+
+    def create(self, job: Job):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, operation, payload, client, status, created_at, attempts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.operation, json.dumps(job.payload), job.client, job.status,
+                 job.created_at, job.attempts)
+            )
+
+    def _select(self, job_id: str) -> Optional[Job]:
+        return self._job(self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._select(job_id)
+
+    def count_queued(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()[0]
+
+    def claim(self, owner: str, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, lease_until = NULL, "
+                    "error = 'Abandoned after ' || attempts || ' attempts' "
+                    "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                    (FAILED, now, RUNNING, now, MAX_ATTEMPTS)
+                )
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE status = ? OR (status = ? AND lease_until < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, "
+                        "started_at = COALESCE(started_at, ?), attempts = attempts + 1 "
+                        "WHERE id = ?",
+                        (RUNNING, owner, now + lease_seconds, now, row["id"])
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            if row is None:
+                return None
+            return self._select(row["id"])
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND owner = ?",
+                (time.time() + lease_seconds, job_id, RUNNING, owner)
+            ).rowcount == 1
+
+    def finish(self, job_id: str, owner: str, status: str,
+               result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "lease_until = NULL WHERE id = ? AND status = ? AND owner = ?",
+                (status, json.dumps(result) if result is not None else None, error,
+                 time.time(), job_id, RUNNING, owner)
+            ).rowcount == 1
+
+    def release(self, job_id: str, owner: str):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL, "
+                "attempts = attempts - 1 WHERE id = ? AND status = ? AND owner = ?",
+                (QUEUED, job_id, RUNNING, owner)
+            )
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._db.execute(
+                f"UPDATE jobs SET status = ?, finished_at = ?, lease_until = NULL "
+                f"WHERE id = ? AND status NOT IN ({', '.join('?' * len(FINISHED))})",
+                (CANCELLED, time.time(), job_id, *FINISHED)
+            )
+            return self._select(job_id)
+
+    def purge(self, finished_before: float) -> int:
+        with self._lock:
+            return self._db.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED))}) "
+                "AND finished_at < ?",
+                (*FINISHED, finished_before)
+            ).rowcount
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def create_job_store(kind: str, sqlite_path: str = "jobs.db") -> JobStore:
+    """Job store by name: sqlite or memory"""
+    if kind == "sqlite":
+        return SQLiteJobStore(sqlite_path)
+    if kind == "memory":
+        return MemoryJobStore()
+    raise ValueError(f"Unknown job store: {kind}. Valid: sqlite, memory")
@@ -0,0 +1,211 @@
+"""
+Background jobs for long-running computations.
+
+POST /jobs stores a job and returns at once; a bounded pool of workers in
+every gateway process claims queued jobs from the job store and runs them
+against the compute service with a longer deadline than HTTP requests get.
+Results stay in the store until they expire, so clients fetch them later
+from any worker. Cancelling a job stops it in whichever process runs it:
+running jobs check the store for cancellation while they renew their lease.
+"""
+import asyncio
+import os
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from app.config import get_settings
+from app.metrics import JOBS_FINISHED, JOBS_RUNNING
+from app.models.schemas import JOB_REQUEST_MODELS
+from app.services.compute_client import call_timeout, get_compute_client
+from app.services.concurrency_limiter import OverloadedError
+from app.services.job_store import (
+    CANCELLED, FAILED, SUCCEEDED, Job, JobStore, create_job_store
+)
+from app.services.scheduler import current_client
+
+logger = structlog.get_logger()
+
+# Client method running each job operation
+JOB_METHODS = {
+    "matrix_multiply": "multiply_matrices",
+    "statistics": "analyze_statistics",
+    "monte_carlo": "run_monte_carlo",
+}
+
+
+async def run_compute_job(operation: str, payload: Dict[str, Any], timeout: float) -> dict:
+    """Run one job operation; overload waits for the backend instead of failing the job"""
+    request = JOB_REQUEST_MODELS[operation](**payload)
+    method = getattr(get_compute_client(), JOB_METHODS[operation])
+    deadline = time.monotonic() + timeout
+    call_timeout.set(timeout)
+    while True:
+        try:
+            response = await method(request)
+            return response.model_dump()
+        except OverloadedError as e:
+            if time.monotonic() + e.retry_after >= deadline:
+                raise
+            await asyncio.sleep(e.retry_after)
+        call_timeout.set(deadline - time.monotonic())
+
+
+class JobManager:
+    """Bounded pool of workers running the jobs of a job store"""
+
+    def __init__(self, store: JobStore, max_workers: int = 4, max_queued: int = 1000,
+                 timeout: float = 3600.0, poll_interval: float = 1.0,
+                 lease_seconds: float = 30.0, result_ttl: float = 86400.0):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.result_ttl = result_ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._purged_at = 0.0
+
+    async def submit(self, operation: str, payload: Dict[str, Any]) -> Job:
+        """Queue a job, shedding it when the queue is full"""
+        if await asyncio.to_thread(self.store.count_queued) >= self.max_queued:
+            raise OverloadedError("jobs", "queue_full", self.poll_interval)
+        job = Job(
+            id=uuid.uuid4().hex,
+            operation=operation,
+            payload=payload,
+            client=current_client.get(),
+            created_at=time.time()
+        )
+        await asyncio.to_thread(self.store.create, job)
+        self._wakeup.set()
+        logger.info("job_submitted", job_id=job.id, operation=operation)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a job; a job running in this process stops right away"""
+        job = await asyncio.to_thread(self.store.cancel, job_id)
+        task = self._running.get(job_id)
+        if task is not None and job is not None and job.status == CANCELLED:
+            task.cancel()
+        return job
+
+    def start(self):
+        if not self._workers:
+            self._workers = [
+                asyncio.ensure_future(self._work()) for _ in range(self.max_workers)
+            ]
+
+    async def stop(self):
+        """Stop the workers; jobs still running go back to the queue"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.store.close()
+
+    async def _work(self):
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.claim, self.owner, self.lease_seconds)
+                if job is not None:
+                    await self._run(job)
+                    continue
+                await self._purge()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("job_worker_failed", error=str(e))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _run(self, job: Job):
+        """Run a claimed job, renewing its lease until it finishes"""
+        current_client.set(job.client)
+        task = asyncio.ensure_future(run_compute_job(job.operation, job.payload, self.timeout))
+        self._running[job.id] = task
+        JOBS_RUNNING.inc()
+        started = time.perf_counter()
+        try:
+            while not task.done():
+                await asyncio.wait([task], timeout=self.poll_interval)
+                if not task.done() and not await asyncio.to_thread(
+                    self.store.renew, job.id, self.owner, self.lease_seconds
+                ):
+                    task.cancel()  # cancelled elsewhere or taken over after a stalled lease
+        except asyncio.CancelledError:
+            task.cancel()
+            await asyncio.to_thread(self.store.release, job.id, self.owner)
+            raise
+        finally:
+            del self._running[job.id]
+            JOBS_RUNNING.dec()
+
+        if task.cancelled():
+            status, result, error = CANCELLED, None, None
+        elif task.exception() is not None:
+            exception = task.exception()
+            status, result, error = FAILED, None, str(exception) or type(exception).__name__
+        else:
+            status, result, error = SUCCEEDED, task.result(), None
+        if await asyncio.to_thread(self.store.finish, job.id, self.owner, status, result, error):
+            JOBS_FINISHED.labels(operation_type=job.operation, status=status).inc()
+        logger.info(
+            "job_finished",
+            job_id=job.id,
+            operation=job.operation,
+            status=status,
+            duration_ms=(time.perf_counter() - started) * 1000,
+            error=error
+        )
+
+    async def _purge(self):
+        """Drop expired results, at most once a minute per process"""
+        now = time.time()
+        if now - self._purged_at < 60:
+            return
+        self._purged_at = now
+        purged = await asyncio.to_thread(self.store.purge, now - self.result_ttl)
+        if purged:
+            logger.info("jobs_purged", count=purged)
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the job manager"""
+    global _manager
+    if _manager is None:
+        settings = get_settings()
+        _manager = JobManager(
+            create_job_store(settings.jobs_store, settings.jobs_sqlite_path),
+            max_workers=settings.jobs_max_workers,
+            max_queued=settings.jobs_max_queued,
+            timeout=settings.jobs_timeout,
+            poll_interval=settings.jobs_poll_interval,
+            lease_seconds=settings.jobs_lease_seconds,
+            result_ttl=settings.jobs_result_ttl
+        )
+    return _manager
+
+
+async def close_job_manager():
+    """Stop the job manager's workers and close its store"""
+    global _manager
+    if _manager is not None:
+        await _manager.stop()
+        _manager = None
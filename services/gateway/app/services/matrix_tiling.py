@@ -0,0 +1,156 @@
+"""
+Tiling of large matrix products into block products
+
+C = A x B is cut into row blocks (of A and C), inner blocks (columns of A,
+rows of B) and column blocks (of B and C). Every block product
+A[i, k] x B[k, j] fits into one gRPC message and can run on any backend;
+the products of one output tile over its inner blocks are summed here.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Encoded size of one double in a packed repeated field
+BYTES_PER_VALUE = 8
+# Room for the dimension fields and message framing
+MESSAGE_OVERHEAD = 1024
+
+
+@dataclass(frozen=True)
+class Block:
+    """Index ranges of one block product A[rows, inner] x B[inner, cols]"""
+    row: int
+    col: int
+    depth: int
+    rows: range
+    inner: range
+    cols: range
+
+
+@dataclass(frozen=True)
+class TilePlan:
+    """Block sizes for one product of (rows x inner) by (inner x cols)"""
+    rows: int
+    inner: int
+    cols: int
+    block_rows: int
+    block_inner: int
+    block_cols: int
+
+    @property
+    def grid(self) -> Tuple[int, int, int]:
+        """Number of row, column and inner blocks"""
+        return (
+            math.ceil(self.rows / self.block_rows),
+            math.ceil(self.cols / self.block_cols),
+            math.ceil(self.inner / self.block_inner)
+        )
+
+    @property
+    def block_count(self) -> int:
+        row_blocks, col_blocks, inner_blocks = self.grid
+        return row_blocks * col_blocks * inner_blocks
+
+    def blocks(self) -> Iterator[Block]:
+        """Blocks tile by tile, so the partial products of a tile finish close together"""
+        row_blocks, col_blocks, inner_blocks = self.grid
+        for i in range(row_blocks):
+            rows = range(i * self.block_rows, min((i + 1) * self.block_rows, self.rows))
+            for j in range(col_blocks):
+                cols = range(j * self.block_cols, min((j + 1) * self.block_cols, self.cols))
+                for k in range(inner_blocks):
+                    inner = range(
+                        k * self.block_inner, min((k + 1) * self.block_inner, self.inner)
+                    )
+                    yield Block(i, j, k, rows, inner, cols)
+
+
+def message_bytes(rows: int, inner: int, cols: int) -> int:
+    """Larger of the request and response size of one block product"""
+    request = (rows * inner + inner * cols) * BYTES_PER_VALUE
+    response = rows * cols * BYTES_PER_VALUE
+    return max(request, response) + MESSAGE_OVERHEAD
+
+
+def plan_tiles(rows: int, inner: int, cols: int, backends: int, max_block_bytes: int,
+               tiles_per_backend: int = 2, min_block: int = 64) -> TilePlan:
+    """Choose block sizes from the matrix dimensions and the number of backends
+
+    The output is halved along the longer side of its tiles until every
+    backend gets tiles_per_backend tiles, without cutting tiles below
+    min_block. Blocks whose messages still exceed max_block_bytes are then
+    halved along their largest extent; only that splits the inner dimension,
+    which costs an extra pass summing partial products.
+    """
+    if min(rows, inner, cols) < 1:
+        raise ValueError("Matrices must not be empty")
+    if max_block_bytes < message_bytes(1, 1, 1):
+        raise ValueError(f"max_block_bytes must be at least {message_bytes(1, 1, 1)}")
+
+    block_rows, block_inner, block_cols = rows, inner, cols
+    target = max(1, backends * tiles_per_backend)
+    while math.ceil(rows / block_rows) * math.ceil(cols / block_cols) < target:
+        if block_rows >= block_cols and block_rows >= 2 * min_block:
+            block_rows = math.ceil(block_rows / 2)
+        elif block_cols >= 2 * min_block:
+            block_cols = math.ceil(block_cols / 2)
+        elif block_rows >= 2 * min_block:
+            block_rows = math.ceil(block_rows / 2)
+        else:
+            break
+
+    while message_bytes(block_rows, block_inner, block_cols) > max_block_bytes:
+        largest = max(block_rows, block_inner, block_cols)
+        if block_rows == largest:
+            block_rows = math.ceil(block_rows / 2)
+        elif block_cols == largest:
+            block_cols = math.ceil(block_cols / 2)
+        else:
+            block_inner = math.ceil(block_inner / 2)
+
+    return TilePlan(rows, inner, cols, block_rows, block_inner, block_cols)
+
+
+def slice_block(matrix: Sequence[Sequence[float]], rows: range, cols: range) -> List[float]:
+    """Row-major values of matrix[rows, cols]"""
+    return [value for row in matrix[rows.start:rows.stop] for value in row[cols.start:cols.stop]]
+
+
+class BlockAssembler:
+    """Collects block products into the result matrix
+
+    Partial products of a tile are kept until all of its inner blocks have
+    arrived and are then summed in inner-block order, so the result does
+    not depend on which backend answered first.
+    """
+
+    def __init__(self, plan: TilePlan):
+        self.plan = plan
+        self.result: List[List[float]] = [[0.0] * plan.cols for _ in range(plan.rows)]
+        self._partials: Dict[Tuple[int, int], Dict[int, Sequence[float]]] = {}
+        self._remaining = plan.block_count
+
+    @property
+    def complete(self) -> bool:
+        return self._remaining == 0
+
+    def add(self, block: Block, values: Sequence[float]):
+        """Store the row-major product of one block"""
+        inner_blocks = self.plan.grid[2]
+        tile = (block.row, block.col)
+        partials = self._partials.setdefault(tile, {})
+        partials[block.depth] = values
+        self._remaining -= 1
+        if len(partials) < inner_blocks:
+            return
+
+        del self._partials[tile]
+        width = len(block.cols)
+        for r, row_index in enumerate(block.rows):
+            offset = r * width
+            tile_row = list(partials[0][offset:offset + width])
+            for depth in range(1, inner_blocks):
+                part = partials[depth]
+                for c in range(width):
+                    tile_row[c] += part[offset + c]
+            self.result[row_index][block.cols.start:block.cols.stop] = tile_row
@@ -0,0 +1,320 @@
+"""
+Result Summarizer - zmenšení výsledků výpočtů před odesláním do LLM
+
+Velké matice nebo dlouhé datové řady se převedou na omezený přehled
+(rozměry, souhrnné statistiky, vzorek řádků, histogram), aby velikost
+promptu nezávisela na velikosti výsledku.
+"""
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+# Přibližný počet znaků na jeden token (pro JSON a čísla u GPT tokenizérů)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Odhadne počet tokenů textu bez závislosti na tokenizéru"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_numeric_vector(value: Any) -> bool:
+    return isinstance(value, list) and len(value) > 0 and all(_is_number(v) for v in value)
+
+
+def _is_numeric_matrix(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(row, list) for row in value)
+        and any(value)
+        and all(_is_number(v) for row in value for v in row)
+    )
+
+
+def _round(value: float, digits: int = 6) -> Any:
+    # JSON nezná NaN ani nekonečno, nečíselné hodnoty se předávají jako text
+    if not math.isfinite(value):
+        return str(value)
+    return round(value, digits)
+
+
+def _sample_indices(length: int, count: int) -> List[int]:
+    """Rovnoměrně rozložené indexy včetně prvního a posledního prvku"""
+    if length <= count:
+        return list(range(length))
+    if count <= 1:
+        return [0]
+    step = (length - 1) / (count - 1)
+    return sorted({int(round(i * step)) for i in range(count)})
+
+
+class _Numbers:
+    """Číselný vektor nebo matice se statistikami spočtenými jen jednou"""
+
+    def __init__(self, values: List[Any], is_matrix: bool, bin_counts: List[int]):
+        self.values = values
+        self.is_matrix = is_matrix
+        self.bin_counts = bin_counts
+        self.length = len(values)
+        self.n_cols = max(len(row) for row in values) if is_matrix else 0
+        self.total = sum(len(row) for row in values) if is_matrix else len(values)
+        self._computed = False
+        self.stats: Dict[str, float] = {}
+        self.finite_count = 0
+        self.histograms: Dict[int, Dict[str, Any]] = {}
+
+    def compute(self) -> None:
+        """Jeden průchod pro statistiky a jeden pro histogramy všech velikostí"""
+        if self._computed:
+            return
+        if self.is_matrix:
+            finite = [v for row in self.values for v in row if math.isfinite(v)]
+        else:
+            finite = [v for v in self.values if math.isfinite(v)]
+        self.finite_count = len(finite)
+        self.stats = ResultSummarizer._statistics(finite)
+        if finite:
+            self.histograms = ResultSummarizer._histograms(finite, self.bin_counts)
+        self._computed = True
+
+
+class ResultSummarizer:
+    """Převádí libovolné výsledky compute služby na přehled s omezenou velikostí"""
+
+    def __init__(self, token_budget: int = 1500, max_sample_rows: int = 5,
+                 max_sample_items: int = 10, histogram_bins: int = 10,
+                 max_string_length: int = 200, max_keys: int = 30):
+        self.token_budget = token_budget
+        self.max_sample_rows = max_sample_rows
+        self.max_sample_items = max_sample_items
+        self.histogram_bins = histogram_bins
+        self.max_string_length = max_string_length
+        self.max_keys = max_keys
+
+    def summarize(self, result: Any) -> Any:
+        """
+        Vytvoří přehled výsledku
+
+        Args:
+            result: Výsledek z compute service (dict, list, skalár)
+
+        Returns:
+            Struktura serializovatelná do JSON s omezenou velikostí
+        """
+        return self._render_value(
+            self._profile(result), self.max_sample_rows, self.max_sample_items,
+            self.histogram_bins, self.max_keys, self.max_string_length
+        )
+
+    def render(self, result: Any) -> str:
+        """
+        Vytvoří JSON přehled výsledku, který se vejde do token budgetu
+
+        Postupně zmenšuje vzorky a histogram, potom počet klíčů a délku
+        řetězců; text se nikdy neořezává, takže zůstává platným JSON.
+        Statistiky a histogramy se počítají jen jednou, každý další krok
+        jen znovu sestaví zmenšený přehled.
+        """
+        profile = self._profile(result)
+        rows, items, bins = self.max_sample_rows, self.max_sample_items, self.histogram_bins
+        keys, chars = self.max_keys, self.max_string_length
+
+        while True:
+            digest = self._render_value(profile, rows, items, bins, keys, chars)
+            text = json.dumps(digest, ensure_ascii=False, separators=(",", ":"))
+            if estimate_tokens(text) <= self.token_budget:
+                return text
+            if rows or items or bins:
+                rows, items, bins = rows // 2, items // 2, bins // 2
+            elif keys or chars:
+                keys, chars = keys // 2, chars // 2
+            else:
+                # Minimální přehled (rozměry a statistiky) se vrací i nad budget
+                return text
+
+    def _bin_counts(self) -> List[int]:
+        """Velikosti histogramu, které render postupným půlením použije"""
+        counts = []
+        bins = self.histogram_bins
+        while bins > 0:
+            counts.append(bins)
+            bins //= 2
+        return counts
+
+    def _profile(self, value: Any) -> Any:
+        """Rozpozná typy hodnot jednou a připraví je pro opakované sestavení"""
+        if _is_numeric_matrix(value):
+            return _Numbers(value, True, self._bin_counts())
+        if _is_numeric_vector(value):
+            return _Numbers(value, False, self._bin_counts())
+        if isinstance(value, dict):
+            names = list(value.keys())
+            entries = [(str(name), self._profile(value[name])) for name in names[:self.max_keys]]
+            return ("dict", entries, len(names))
+        if isinstance(value, list):
+            head = [self._profile(v) for v in value[:self.max_sample_items]]
+            return ("list", head, len(value))
+        return value
+
+    def _render_value(self, profile: Any, rows: int, items: int, bins: int,
+                      keys: int, chars: int) -> Any:
+        if isinstance(profile, _Numbers):
+            if profile.is_matrix:
+                return self._summarize_matrix(profile, rows, items, bins)
+            return self._summarize_vector(profile, items, bins)
+        if isinstance(profile, tuple):
+            kind, entries, length = profile
+            if kind == "dict":
+                digest = {
+                    name: self._render_value(entry, rows, items, bins, keys, chars)
+                    for name, entry in entries[:keys]
+                }
+                if length > keys:
+                    digest["_omitted_keys"] = length - keys
+                return digest
+            head = [
+                self._render_value(entry, rows, items, bins, keys, chars)
+                for entry in entries[:items]
+            ]
+            if length > items:
+                return {"type": "list", "length": length, "head": head}
+            return head
+        if isinstance(profile, str) and len(profile) > chars:
+            return profile[:chars] + "..."
+        if isinstance(profile, float):
+            return _round(profile)
+        return profile
+
+    def _summarize_vector(self, numbers: _Numbers, items: int, bins: int) -> Any:
+        values = numbers.values
+        if len(values) <= items:
+            return [_round(float(v)) for v in values]
+
+        numbers.compute()
+        digest: Dict[str, Any] = {
+            "type": "vector",
+            "length": len(values),
+            "stats": numbers.stats,
+        }
+        if numbers.finite_count < numbers.total:
+            digest["non_finite"] = numbers.total - numbers.finite_count
+        if items > 0:
+            digest["sample"] = [
+                _round(float(values[i])) for i in _sample_indices(len(values), items)
+            ]
+        if bins in numbers.histograms:
+            digest["histogram"] = numbers.histograms[bins]
+        return digest
+
+    def _summarize_matrix(self, numbers: _Numbers, rows: int, items: int, bins: int) -> Any:
+        matrix = numbers.values
+        n_rows, n_cols = numbers.length, numbers.n_cols
+        if n_rows <= rows and n_cols <= items:
+            return [[_round(float(v)) for v in row] for row in matrix]
+
+        numbers.compute()
+        digest: Dict[str, Any] = {
+            "type": "matrix",
+            "shape": [n_rows, n_cols],
+            "stats": numbers.stats,
+        }
+        if numbers.finite_count < numbers.total:
+            digest["non_finite"] = numbers.total - numbers.finite_count
+        if rows > 0 and items > 0:
+            col_indices = _sample_indices(n_cols, items)
+            digest["sample_rows"] = {
+                str(i): [_round(float(matrix[i][j])) for j in col_indices if j < len(matrix[i])]
+                for i in _sample_indices(n_rows, rows)
+            }
+            if len(col_indices) < n_cols:
+                digest["sample_columns"] = col_indices
+        if bins in numbers.histograms:
+            digest["histogram"] = numbers.histograms[bins]
+        return digest
+
+    @staticmethod
+    def _statistics(values: List[float]) -> Dict[str, float]:
+        """Souhrnné statistiky konečných hodnot v jednom průchodu (Welford)"""
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        minimum = math.inf
+        maximum = -math.inf
+        for v in values:
+            count += 1
+            delta = v - mean
+            mean += delta / count
+            m2 += delta * (v - mean)
+            if v < minimum:
+                minimum = v
+            if v > maximum:
+                maximum = v
+
+        if not count:
+            return {"count": 0}
+        return {
+            "count": count,
+            "mean": _round(mean),
+            "std": _round(math.sqrt(m2 / count)),
+            "min": _round(float(minimum)),
+            "max": _round(float(maximum)),
+        }
+
+    @staticmethod
+    def _histograms(values: List[float], bin_counts: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Histogramy konečných hodnot pro všechny velikosti v jednom průchodu
+
+        Hodnoty se rozdělí do jemných košů (nejmenší společný násobek
+        velikostí); hrubší histogramy vzniknou jejich sečtením, protože
+        jejich hranice leží na hranicích jemných košů.
+        """
+        minimum = min(values)
+        maximum = max(values)
+        if minimum == maximum:
+            flat = {"edges": [_round(float(minimum)), _round(float(maximum))],
+                    "counts": [len(values)]}
+            return {bins: flat for bins in bin_counts}
+
+        fine_bins = 1
+        for bins in bin_counts:
+            fine_bins = fine_bins * bins // math.gcd(fine_bins, bins)
+        scale = fine_bins / (maximum - minimum)
+        fine = [0] * (fine_bins + 1)
+        for v in values:
+            fine[int((v - minimum) * scale)] += 1
+        # Maximum padne za poslední koš
+        fine[fine_bins - 1] += fine.pop()
+
+        histograms = {}
+        for bins in bin_counts:
+            step = fine_bins // bins
+            width = (maximum - minimum) / bins
+            histograms[bins] = {
+                "edges": [_round(minimum + i * width) for i in range(bins + 1)],
+                "counts": [sum(fine[i:i + step]) for i in range(0, fine_bins, step)],
+            }
+        return histograms
+
+
+_summarizer_instance: Optional[ResultSummarizer] = None
+
+
+def get_result_summarizer() -> ResultSummarizer:
+    """Získá singleton instanci summarizeru podle nastavení"""
+    global _summarizer_instance
+    if _summarizer_instance is None:
+        from app.config import get_settings
+        settings = get_settings()
+        _summarizer_instance = ResultSummarizer(
+            token_budget=settings.openai_prompt_token_budget,
+            max_sample_rows=settings.openai_summary_sample_rows,
+            max_sample_items=settings.openai_summary_sample_items,
+            histogram_bins=settings.openai_summary_histogram_bins
+        )
+    return _summarizer_instance
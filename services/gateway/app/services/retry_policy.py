@@ -0,0 +1,169 @@
+"""
+Retry and hedging policy for compute service calls.
+
+Only transient status codes are retried, every attempt gets the time left
+of the request's overall deadline instead of a fresh timeout, and retries
+are drawn from a budget so a struggling backend does not receive a retry
+storm on top of its normal load. Optionally a hedged copy of a slow request
+is sent once the operation's recent p95 latency has elapsed.
+"""
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import grpc
+from tenacity import RetryCallState
+from tenacity.retry import retry_base
+from tenacity.stop import stop_base
+from tenacity.wait import wait_base
+
+from app.config import get_settings
+from app.metrics import RETRIES
+
+# Codes where another attempt can succeed; DEADLINE_EXCEEDED is excluded
+# because the attempt already used up the request's deadline
+RETRYABLE_CODES = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.ABORTED,
+})
+
+# Attempts are not started with less time than this left
+MIN_ATTEMPT_SECONDS = 0.05
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of recent requests
+
+    Every request deposits `ratio` tokens and every retry withdraws one, so
+    at most ratio * requests retries are made, plus `min_per_second` so
+    retries still work at low traffic.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 5.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._refilled = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        refill = (now - self._refilled) * self.min_per_second
+        self._tokens = min(self.max_tokens, self._tokens + refill)
+        self._refilled = now
+
+    def deposit(self):
+        """Record a request"""
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take a token for one retry; False when the budget is exhausted"""
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class LatencyTracker:
+    """Recent latencies of one operation type for the hedging delay"""
+
+    def __init__(self, window: int = 500, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._cached: Dict[float, float] = {}
+        self._since_cache = 0
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self._since_cache += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q-th percentile of the window, recomputed every 50 samples"""
+        if len(self._samples) < self.min_samples:
+            return None
+        if self._since_cache >= 50:
+            self._cached.clear()
+            self._since_cache = 0
+        if q not in self._cached:
+            ordered = sorted(self._samples)
+            self._cached[q] = ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+        return self._cached[q]
+
+
+def is_retryable(exc: BaseException) -> bool:
+    return isinstance(exc, grpc.RpcError) and exc.code() in RETRYABLE_CODES
+
+
+class stop_at_deadline(stop_base):
+    """tenacity stop condition: not enough time left for another attempt"""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        return self.deadline - time.monotonic() < MIN_ATTEMPT_SECONDS
+
+
+class backoff_within_deadline(wait_base):
+    """tenacity wait: full-jitter exponential backoff capped by the deadline"""
+
+    def __init__(self, deadline: float, base: float, maximum: float):
+        self.deadline = deadline
+        self.base = base
+        self.maximum = maximum
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        ceiling = min(self.maximum, self.base * 2 ** (retry_state.attempt_number - 1))
+        remaining = self.deadline - time.monotonic() - MIN_ATTEMPT_SECONDS
+        return max(0.0, min(random.uniform(0.0, ceiling), remaining))
+
+
+class retry_within_budget(retry_base):
+    """tenacity retry predicate: retryable code and a token in the budget"""
+
+    def __init__(self, operation_type: str, budget: RetryBudget):
+        self.operation_type = operation_type
+        self.budget = budget
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        if not retry_state.outcome.failed or not is_retryable(retry_state.outcome.exception()):
+            return False
+        if not self.budget.withdraw():
+            RETRIES.labels(operation_type=self.operation_type, outcome="budget_exhausted").inc()
+            return False
+        RETRIES.labels(operation_type=self.operation_type, outcome="retried").inc()
+        return True
+
+
+_budget: Optional[RetryBudget] = None
+_latencies: Dict[str, LatencyTracker] = {}
+
+
+def get_retry_budget() -> RetryBudget:
+    """Retry budget shared by all operations towards the compute service"""
+    global _budget
+    if _budget is None:
+        settings = get_settings()
+        _budget = RetryBudget(settings.retry_budget_ratio, settings.retry_budget_min_per_second)
+    return _budget
+
+
+def get_latency_tracker(operation_type: str) -> LatencyTracker:
+    tracker = _latencies.get(operation_type)
+    if tracker is None:
+        tracker = _latencies[operation_type] = LatencyTracker()
+    return tracker
+
+
+def hedge_delay(operation_type: str) -> Optional[float]:
+    """Seconds to wait before hedging, or None if hedging is off or not calibrated yet"""
+    settings = get_settings()
+    if not settings.hedging_enabled:
+        return None
+    latency = get_latency_tracker(operation_type).percentile(settings.hedge_percentile)
+    if latency is None:
+        return None
+    return max(latency, settings.hedge_min_delay_ms / 1000.0)
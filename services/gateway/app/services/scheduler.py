@@ -0,0 +1,121 @@
+"""
+Cost-aware scheduling of compute requests.
+
+Each request's cost is estimated from its parameters (matrix dimensions,
+iterations, data length) and the request is put into a priority lane. When
+the concurrency limit is reached, queued requests are dispatched by weighted
+fair queuing across lanes, so a burst of heavy batch work cannot starve cheap
+interactive calls, and no single API key may hold more than its share of the
+slots of an operation type.
+"""
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from app.config import get_settings
+
+LANES = ("interactive", "standard", "batch")
+
+# Identity of the client making the current request (API key or address),
+# set by the router dependency and read when the request is scheduled
+current_client: ContextVar[str] = ContextVar("current_client", default="anonymous")
+
+
+def estimate_cost(operation_type: str, request) -> float:
+    """Approximate number of scalar operations of a gRPC request"""
+    if operation_type in ("matrix_multiply", "matrix_block"):
+        return float(request.rows_a) * request.cols_a * request.cols_b
+    if operation_type == "sparse_matrix_multiply":
+        nonzeros = len(request.matrix_a.values)
+        if request.HasField("sparse_b"):
+            # Each entry of A meets one row of B, on average holding this many entries
+            return max(1.0, nonzeros * len(request.sparse_b.values) / max(request.sparse_b.rows, 1))
+        return max(1.0, float(nonzeros) * request.dense_b.cols)
+    if operation_type == "statistics":
+        n = len(request.data)
+        # Median and percentiles sort the data
+        return n * max(1.0, math.log2(n)) if n else 1.0
+    if operation_type == "monte_carlo":
+        return float(request.iterations) * max(request.dimensions, 1)
+    if operation_type == "ml_inference":
+        return float(len(request.input_data))
+    if operation_type == "ml_batch_inference":
+        return float(sum(len(item.input_data) for item in request.batch_requests))
+    return 1.0
+
+
+def classify(cost: float) -> str:
+    """Map an estimated cost to its priority lane"""
+    settings = get_settings()
+    if cost <= settings.scheduler_interactive_max_cost:
+        return "interactive"
+    if cost < settings.scheduler_batch_min_cost:
+        return "standard"
+    return "batch"
+
+
+def lane_weights() -> Dict[str, float]:
+    """Dispatch weights of the lanes from settings"""
+    settings = get_settings()
+    return {
+        "interactive": float(settings.scheduler_weight_interactive),
+        "standard": float(settings.scheduler_weight_standard),
+        "batch": float(settings.scheduler_weight_batch),
+    }
+
+
+@dataclass(eq=False)
+class Waiter:
+    """A request queued for a concurrency slot"""
+    future: object
+    lane: str
+    client: str
+    enqueued: float = field(default_factory=time.perf_counter)
+    finish: float = 0.0
+
+
+class FairQueue:
+    """Weighted fair queue over the priority lanes
+
+    Every queued request gets a virtual finish tag of
+    max(virtual time, lane's last tag) + 1 / lane weight, and the eligible
+    request with the smallest tag is dispatched first. While all lanes are
+    backlogged, each lane receives dispatches in proportion to its weight;
+    an idle lane does not bank credit for later.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = weights
+        self._lanes: Dict[str, List[Waiter]] = {lane: [] for lane in weights}
+        self._last_finish = {lane: 0.0 for lane in weights}
+        self._virtual_time = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(waiters) for waiters in self._lanes.values())
+
+    def __contains__(self, waiter: Waiter) -> bool:
+        return waiter in self._lanes[waiter.lane]
+
+    def push(self, waiter: Waiter):
+        start = max(self._virtual_time, self._last_finish[waiter.lane])
+        waiter.finish = start + 1.0 / self.weights[waiter.lane]
+        self._last_finish[waiter.lane] = waiter.finish
+        self._lanes[waiter.lane].append(waiter)
+
+    def remove(self, waiter: Waiter):
+        self._lanes[waiter.lane].remove(waiter)
+
+    def pop(self, eligible: Callable[[Waiter], bool]) -> Optional[Waiter]:
+        """Remove and return the eligible waiter with the smallest finish tag"""
+        best = None
+        for waiters in self._lanes.values():
+            # Lanes are in tag order; the first eligible waiter is the lane's candidate
+            candidate = next((w for w in waiters if eligible(w)), None)
+            if candidate is not None and (best is None or candidate.finish < best.finish):
+                best = candidate
+        if best is not None:
+            self._lanes[best.lane].remove(best)
+            self._virtual_time = best.finish
+        return best
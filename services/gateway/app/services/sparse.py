@@ -0,0 +1,129 @@
+"""
+Sparse matrix conversions for matrix products
+
+Either factor of a product may arrive as dense rows or as a SparseMatrix
+in CSR or COO form. Factors sparse enough to pay for the indirection are
+sent to the compute service in canonical CSR (columns ascending within a
+row, duplicate entries summed, zeros dropped), so the payload scales with
+the nonzeros; the service then picks the sparse or dense kernel from the
+product's actual multiply-adds.
+"""
+from dataclasses import dataclass
+from typing import List
+
+from app.models.schemas import Matrix, SparseMatrix, matrix_shape
+
+# Encoded bytes of one CSR entry (int32 column, double value) and one row offset
+BYTES_PER_ENTRY = 12
+BYTES_PER_OFFSET = 8
+
+
+class MatrixTooLargeError(ValueError):
+    """A product would have to expand a sparse matrix past the dense size limit"""
+
+
+@dataclass
+class CsrMatrix:
+    """Canonical compressed sparse row matrix"""
+    rows: int
+    cols: int
+    indptr: List[int]
+    indices: List[int]
+    data: List[float]
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    @property
+    def density(self) -> float:
+        return self.nnz / (self.rows * self.cols)
+
+    def message_bytes(self) -> int:
+        """Approximate size of the matrix in a gRPC message"""
+        return self.nnz * BYTES_PER_ENTRY + (self.rows + 1) * BYTES_PER_OFFSET
+
+
+def from_coo(rows: int, cols: int, row: List[int], col: List[int], data: List[float]) -> CsrMatrix:
+    """CSR from entries in any order; duplicates are summed, zeros dropped"""
+    merged: List[list] = []
+    for i, j, value in sorted(zip(row, col, data), key=lambda entry: (entry[0], entry[1])):
+        if merged and merged[-1][0] == i and merged[-1][1] == j:
+            merged[-1][2] += value
+        else:
+            merged.append([i, j, value])
+
+    indptr = [0] * (rows + 1)
+    indices: List[int] = []
+    values: List[float] = []
+    for i, j, value in merged:
+        if value != 0.0:
+            indices.append(j)
+            values.append(value)
+            indptr[i + 1] += 1
+    for i in range(rows):
+        indptr[i + 1] += indptr[i]
+    return CsrMatrix(rows, cols, indptr, indices, values)
+
+
+def _entries(matrix: CsrMatrix):
+    """COO row, col and data lists of a CSR matrix"""
+    row = [i for i in range(matrix.rows) for _ in range(matrix.indptr[i], matrix.indptr[i + 1])]
+    return row, matrix.indices, matrix.data
+
+
+def from_dense(matrix: List[List[float]]) -> CsrMatrix:
+    """CSR holding the nonzero entries of dense rows"""
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for row in matrix:
+        for j, value in enumerate(row):
+            if value != 0.0:
+                indices.append(j)
+                data.append(value)
+        indptr.append(len(data))
+    return CsrMatrix(len(matrix), len(matrix[0]), indptr, indices, data)
+
+
+def to_csr(matrix: Matrix) -> CsrMatrix:
+    """Canonical CSR of a dense or sparse matrix"""
+    if not isinstance(matrix, SparseMatrix):
+        return from_dense(matrix)
+    rows, cols = matrix_shape(matrix)
+    if matrix.format == "coo":
+        return from_coo(rows, cols, matrix.row, matrix.col, matrix.data)
+    csr = CsrMatrix(rows, cols, matrix.indptr, matrix.indices, matrix.data)
+    return from_coo(rows, cols, *_entries(csr))
+
+
+def to_dense(matrix: Matrix) -> List[List[float]]:
+    """Dense rows of a dense or sparse matrix"""
+    if not isinstance(matrix, (SparseMatrix, CsrMatrix)):
+        return matrix
+    csr = matrix if isinstance(matrix, CsrMatrix) else to_csr(matrix)
+    result = [[0.0] * csr.cols for _ in range(csr.rows)]
+    for i, row in enumerate(result):
+        for p in range(csr.indptr[i], csr.indptr[i + 1]):
+            row[csr.indices[p]] = csr.data[p]
+    return result
+
+
+def to_schema(matrix: CsrMatrix) -> SparseMatrix:
+    """API representation of a CSR matrix"""
+    return SparseMatrix(
+        format="csr",
+        shape=[matrix.rows, matrix.cols],
+        indptr=matrix.indptr,
+        indices=matrix.indices,
+        data=matrix.data
+    )
+
+
+def density(matrix: Matrix) -> float:
+    """Fraction of a matrix's entries that are stored or nonzero"""
+    rows, cols = matrix_shape(matrix)
+    if isinstance(matrix, SparseMatrix):
+        return min(1.0, len(matrix.data) / (rows * cols))
+    zeros = sum(row.count(0.0) for row in matrix)
+    return 1.0 - zeros / (rows * cols)
@@ -0,0 +1,198 @@
+import contextvars
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+import structlog
+from fastapi.routing import APIRoute
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind
+
+from app.config import Settings
+
+logger = structlog.get_logger()
+
+tracer = trace.get_tracer("app.gateway")
+
+_provider = None
+
+# Timestamps (ns) of the current route handler, used to emit validation and
+# serialization spans around the endpoint call
+_handler_started_ns: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "handler_started_ns", default=None
+)
+_endpoint_finished_ns: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "endpoint_finished_ns", default=None
+)
+
+
+def setup_tracing(settings: Settings):
+    """Configure the global tracer provider from settings
+
+    Spans are exported in batches to an OTLP collector or appended to a
+    JSON-lines file. When tracing is disabled or the SDK is not installed,
+    the no-op provider from opentelemetry-api stays in place.
+    """
+    global _provider
+    if not settings.tracing_enabled or _provider is not None:
+        return
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("tracing_disabled", reason="opentelemetry-sdk not installed")
+        return
+
+    if settings.tracing_exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("tracing_disabled", reason="OTLP exporter not installed")
+            return
+        exporter = OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint, insecure=True)
+    elif settings.tracing_exporter == "file":
+        exporter = _file_exporter(settings.tracing_file_path)
+    else:
+        logger.warning("tracing_disabled", reason=f"unknown exporter {settings.tracing_exporter}")
+        return
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio))
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+
+    logger.info(
+        "tracing_enabled",
+        exporter=settings.tracing_exporter,
+        sample_ratio=settings.tracing_sample_ratio
+    )
+
+
+def _file_exporter(path: str):
+    """JSON-lines span exporter that owns its file and closes it on shutdown"""
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    class FileSpanExporter(ConsoleSpanExporter):
+        def shutdown(self):
+            super().shutdown()
+            self.out.close()
+
+    return FileSpanExporter(
+        out=open(path, "a"),
+        formatter=lambda span: span.to_json(indent=None) + os.linesep
+    )
+
+
+def shutdown_tracing():
+    """Flush pending spans and close the exporter"""
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+
+
+def current_trace_id() -> Optional[str]:
+    """Return the active trace id as hex, if the current span is sampled"""
+    context = trace.get_current_span().get_span_context()
+    if not context.is_valid:
+        return None
+    return format(context.trace_id, "032x")
+
+
+def grpc_metadata(request_id: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Build gRPC metadata carrying the current trace context"""
+    carrier: dict = {}
+    propagate.inject(carrier)
+    metadata = list(carrier.items())
+    request_id = request_id or structlog.contextvars.get_contextvars().get("request_id")
+    if request_id:
+        metadata.append(("x-request-id", request_id))
+    return metadata
+
+
+@contextmanager
+def grpc_call_span(method: str):
+    """Span around one gRPC call, yielding (span, metadata) for the call"""
+    with tracer.start_as_current_span(
+        f"compute.ComputeService/{method}",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "rpc.system": "grpc",
+            "rpc.service": "compute.ComputeService",
+            "rpc.method": method,
+        }
+    ) as span:
+        yield span, grpc_metadata()
+
+
+def trace_retry(retry_state):
+    """tenacity before_sleep hook recording retries on the current span"""
+    span = trace.get_current_span()
+    outcome = retry_state.outcome
+    span.add_event(
+        "retry",
+        attributes={
+            "retry.attempt": retry_state.attempt_number,
+            "retry.sleep_seconds": retry_state.next_action.sleep if retry_state.next_action else 0,
+            "retry.error": str(outcome.exception()) if outcome and outcome.failed else "",
+        }
+    )
+    logger.warning(
+        "grpc_retry",
+        attempt=retry_state.attempt_number,
+        fn=getattr(retry_state.fn, "__name__", "unknown")
+    )
+
+
+def _wrap_endpoint(endpoint: Callable) -> Callable:
+    """Wrap an async endpoint so validation and handler time get their own spans"""
+
+    @functools.wraps(endpoint)
+    async def traced_endpoint(*args, **kwargs):
+        started = _handler_started_ns.get()
+        if started is not None:
+            # FastAPI has parsed and validated the request by the time the endpoint runs
+            tracer.start_span("validate", start_time=started).end()
+        try:
+            with tracer.start_as_current_span(f"handler {endpoint.__name__}"):
+                return await endpoint(*args, **kwargs)
+        finally:
+            _endpoint_finished_ns.set(time.time_ns())
+
+    traced_endpoint.__traced__ = True
+    return traced_endpoint
+
+
+class TracedRoute(APIRoute):
+    """APIRoute emitting validate / handler / serialize spans for each request"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # include_router() re-creates routes from already wrapped endpoints
+        if inspect.iscoroutinefunction(endpoint) and not getattr(endpoint, "__traced__", False):
+            endpoint = _wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+
+        async def traced_route_handler(request):
+            started_token = _handler_started_ns.set(time.time_ns())
+            finished_token = _endpoint_finished_ns.set(None)
+            try:
+                return await route_handler(request)
+            finally:
+                finished = _endpoint_finished_ns.get()
+                if finished is not None:
+                    tracer.start_span("serialize", start_time=finished).end()
+                _handler_started_ns.reset(started_token)
+                _endpoint_finished_ns.reset(finished_token)
+
+        return traced_route_handler
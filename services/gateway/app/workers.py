@@ -0,0 +1,97 @@
+"""
+Support for running the gateway with several worker processes.
+
+In multi-process mode (workers > 1, started via app.serve) the Prometheus
+client keeps its values in memory-mapped files in PROMETHEUS_MULTIPROC_DIR,
+so /metrics aggregates all workers instead of reporting whichever one
+answered. The same directory holds small shared caches: one worker holds a
+leader lock and refreshes shared state (e.g. compute health), the others
+read it instead of repeating the work.
+
+This module must not import prometheus_client: the directory has to be
+set up before the metrics are created in the workers.
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no leader election, every worker refreshes
+    fcntl = None
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def multiprocess_dir() -> Optional[str]:
+    """The shared directory when running in multi-process mode"""
+    return os.environ.get(MULTIPROC_ENV)
+
+
+def prepare_multiprocess_dir(path: str = "") -> str:
+    """Create (or clean up after a previous run) the shared metrics directory"""
+    if not path:
+        shm = Path("/dev/shm")
+        base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+        path = str(base / f"gateway-metrics-{os.getuid() if hasattr(os, 'getuid') else 0}")
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.iterdir():
+        if stale.suffix in (".db", ".json", ".tmp"):
+            stale.unlink()
+    return str(directory)
+
+
+def mark_worker_dead():
+    """Drop this worker's live gauges from the aggregated metrics"""
+    if multiprocess_dir():
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class SharedFile:
+    """JSON document shared by the workers, replaced atomically on write"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, value: dict):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, self.path)
+
+    def read(self) -> Optional[dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+class LeaderLock:
+    """Non-blocking file lock; the holder keeps it until its process exits"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """True if this process is (or just became) the leader"""
+        if self._fd is not None or fcntl is None:
+            return True
+        fd = os.open(self.path, os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,116 @@
+"""
+Per-request logging overhead: the original synchronous structlog setup
+against the queue-backed configuration from app.logging_config.
+
+Each simulated request binds a request_id and emits the same lines the
+gateway writes for a successful computation. Output goes to /dev/null so
+only the cost on the calling thread is measured.
+
+Usage:
+    python -m benchmarks.bench_logging [--requests 20000] [--sample-rate 0.1]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import structlog
+
+from app.config import Settings
+from app import logging_config
+
+LINES_PER_REQUEST = 4
+
+
+def configure_sync():
+    """The gateway's original configuration: JSON rendered inline through stdlib"""
+    root = logging.getLogger()
+    handler = logging.StreamHandler(sys.stdout)
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.stdlib.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer()
+        ],
+        wrapper_class=structlog.stdlib.BoundLogger,
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+    return handler
+
+
+def simulate(requests: int) -> float:
+    """Emit LINES_PER_REQUEST lines per request, return seconds spent"""
+    logger = structlog.get_logger("bench")
+    matrix_shape = [64, 64]
+    started = time.perf_counter()
+    for i in range(requests):
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(request_id=f"{i:032x}", trace_id=None)
+        logger.info("matrix_multiply_request", shape_a=matrix_shape, shape_b=matrix_shape)
+        logger.debug("grpc_request_built", elements=4096)
+        logger.info("matrix_multiply_completed", computation_time_ms=1.25)
+        logger.info("request_completed", method="POST", path="/api/v1/compute/matrix/multiply",
+                    status=200, duration_ms=3.5)
+    return time.perf_counter() - started
+
+
+def run(name: str, requests: int, setup) -> dict:
+    structlog.reset_defaults()
+    setup()
+    simulate(min(requests, 1000))  # warm up logger caches
+    elapsed = simulate(requests)
+    logging_config.stop_logging()  # flush, not counted
+    return {
+        "config": name,
+        "requests": requests,
+        "us_per_request": round(elapsed / requests * 1e6, 2),
+        "us_per_line": round(elapsed / (requests * LINES_PER_REQUEST) * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    real_stdout = sys.stdout
+    results = []
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            handler = None
+
+            def sync_setup():
+                nonlocal handler
+                handler = configure_sync()
+
+            results.append(run("sync_json", args.requests, sync_setup))
+            logging.getLogger().removeHandler(handler)
+
+            for name, settings in [
+                ("async_orjson", Settings(log_async=True)),
+                ("async_orjson_sampled", Settings(
+                    log_async=True, log_success_sample_rate=args.sample_rate
+                )),
+            ]:
+                results.append(run(
+                    name, args.requests, lambda s=settings: logging_config.configure_logging(s)
+                ))
+        finally:
+            sys.stdout = real_stdout
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Micro-benchmarks for the per-request hot paths of each schema: request
+validation, protobuf conversion in both directions and FastAPI's response
+serialization (response_model validation plus JSON rendering).
+
+Run with pytest-benchmark; saved runs are kept in benchmarks/results so they
+can be compared across commits:
+
+    python -m pytest benchmarks/bench_schemas.py --no-cov \\
+        --benchmark-storage=benchmarks/results --benchmark-autosave
+    python -m pytest benchmarks/bench_schemas.py --no-cov \\
+        --benchmark-storage=benchmarks/results --benchmark-compare \\
+        --benchmark-compare-fail=mean:15%
+"""
+import asyncio
+import random
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app import compute_pb2
+from app.main import app
+from app.models.ml_schemas import MLInferenceRequest
+from app.models.schemas import MatrixMultiplyRequest, StatsAnalysisRequest
+from app.services.compute_client import (
+    matrix_request_to_proto, matrix_response_from_proto,
+    stats_request_to_proto, stats_response_from_proto
+)
+
+MATRIX_SIZES = [8, 64, 256]
+STATS_SIZES = [1_000, 10_000, 100_000]
+
+_loop = asyncio.new_event_loop()
+
+
+def _matrix(n: int, rng: random.Random):
+    return [[rng.uniform(-1.0, 1.0) for _ in range(n)] for _ in range(n)]
+
+
+def _response_field(path: str):
+    return next(route.response_field for route in app.routes if getattr(route, "path", "") == path)
+
+
+def _render(field, content) -> bytes:
+    """What FastAPI does with an endpoint's return value"""
+    value = _loop.run_until_complete(
+        serialize_response(field=field, response_content=content, is_coroutine=True)
+    )
+    return JSONResponse(value).body
+
+
+@pytest.fixture(scope="module")
+def rng():
+    return random.Random(42)
+
+
+# Matrix multiplication
+
+@pytest.mark.parametrize("n", MATRIX_SIZES)
+def test_matrix_validate(benchmark, rng, n):
+    benchmark.group = "matrix_multiply:validate"
+    payload = {"matrix_a": _matrix(n, rng), "matrix_b": _matrix(n, rng)}
+    benchmark(MatrixMultiplyRequest.model_validate, payload)
+
+
+@pytest.mark.parametrize("n", MATRIX_SIZES)
+def test_matrix_to_proto(benchmark, rng, n):
+    benchmark.group = "matrix_multiply:to_proto"
+    request = MatrixMultiplyRequest(matrix_a=_matrix(n, rng), matrix_b=_matrix(n, rng))
+    benchmark(matrix_request_to_proto, request)
+
+
+@pytest.mark.parametrize("n", MATRIX_SIZES)
+def test_matrix_from_proto(benchmark, rng, n):
+    benchmark.group = "matrix_multiply:from_proto"
+    response = compute_pb2.MatrixMultiplyResponse(
+        result=[rng.random() for _ in range(n * n)], rows=n, cols=n, computation_time_ms=1.0
+    )
+    benchmark(matrix_response_from_proto, response)
+
+
+@pytest.mark.parametrize("n", MATRIX_SIZES)
+def test_matrix_serialize(benchmark, rng, n):
+    benchmark.group = "matrix_multiply:serialize"
+    response = matrix_response_from_proto(compute_pb2.MatrixMultiplyResponse(
+        result=[rng.random() for _ in range(n * n)], rows=n, cols=n, computation_time_ms=1.0
+    ))
+    benchmark(_render, _response_field("/api/v1/compute/matrix/multiply"), response)
+
+
+# Statistics
+
+@pytest.mark.parametrize("size", STATS_SIZES)
+def test_stats_validate(benchmark, rng, size):
+    benchmark.group = "statistics:validate"
+    payload = {"data": [rng.gauss(0.0, 1.0) for _ in range(size)],
+               "operations": ["mean", "median", "stddev", "percentiles"]}
+    benchmark(StatsAnalysisRequest.model_validate, payload)
+
+
+@pytest.mark.parametrize("size", STATS_SIZES)
+def test_stats_to_proto(benchmark, rng, size):
+    benchmark.group = "statistics:to_proto"
+    request = StatsAnalysisRequest(data=[rng.gauss(0.0, 1.0) for _ in range(size)])
+    benchmark(stats_request_to_proto, request)
+
+
+def test_stats_from_proto_and_serialize(benchmark):
+    benchmark.group = "statistics:serialize"
+    response = compute_pb2.StatsAnalysisResponse(
+        mean=0.1, median=0.2, stddev=1.0, variance=1.0, min=-3.0, max=3.0, count=1000,
+        percentiles={25: -0.6, 50: 0.0, 75: 0.6, 95: 1.6, 99: 2.3}, computation_time_ms=1.0
+    )
+    field = _response_field("/api/v1/compute/stats/analyze")
+    benchmark(lambda: _render(field, stats_response_from_proto(response)))
+
+
+# ML inference
+
+def test_ml_inference_validate(benchmark, rng):
+    benchmark.group = "ml_inference:validate"
+    payload = {"model_name": "mnist", "input_data": [rng.random() for _ in range(784)],
+               "input_shape": [1, 1, 28, 28]}
+    benchmark(MLInferenceRequest.model_validate, payload)
+
+
+def test_ml_inference_to_proto(benchmark, rng):
+    benchmark.group = "ml_inference:to_proto"
+    request = MLInferenceRequest(model_name="mnist", input_data=[rng.random() for _ in range(784)],
+                                 input_shape=[1, 1, 28, 28])
+    benchmark(lambda: compute_pb2.MLInferenceRequest(
+        model_name=request.model_name, input_data=request.input_data,
+        input_shape=request.input_shape, apply_softmax=request.apply_softmax, top_k=request.top_k
+    ))
@@ -0,0 +1,119 @@
+"""
+Gateway cold-start benchmark.
+
+Reports where import time goes (python -X importtime, aggregated per
+top-level package and as the slowest individual modules) and measures
+time-to-first-request: from spawning `python -m app.serve` until the first
+request is answered. Exits non-zero when the median exceeds --target-ms.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5 --target-ms 1500
+    python -m benchmarks.bench_startup --imports-only --top 30
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.loadtest import GATEWAY_DIR, _free_port
+
+DEFAULT_TARGET_MS = 1500.0
+
+
+def import_report(module: str = "app.main") -> Tuple[float, List[Tuple[str, float, float]]]:
+    """Import a module in a fresh interpreter; returns total ms and (module, self ms, cumulative ms)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=GATEWAY_DIR, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1000.0, int(cumulative_us) / 1000.0))
+    total = next(cumulative for name, _, cumulative in reversed(rows) if name == module)
+    return total, rows
+
+
+def by_package(rows: List[Tuple[str, float, float]]) -> Dict[str, float]:
+    """Self time summed per top-level package"""
+    totals: Dict[str, float] = defaultdict(float)
+    for name, self_ms, _ in rows:
+        totals[name.split(".")[0]] += self_ms
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def time_to_first_request(compute_url: str, env: Dict[str, str]) -> float:
+    """Seconds from spawning the gateway until it answers GET /"""
+    port = _free_port()
+    env = dict(os.environ, **env, COMPUTE_SERVICE_URL=compute_url, HOST="127.0.0.1",
+               PORT=str(port), WORKERS="1", LOG_LEVEL="WARNING", DEBUG="false")
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "app.serve"], cwd=GATEWAY_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError("gateway exited during startup")
+                try:
+                    client.get(f"http://127.0.0.1:{port}/")
+                    return time.perf_counter() - started
+                except httpx.HTTPError:
+                    time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS,
+                        help="fail if the median time-to-first-request is above this")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--imports-only", action="store_true")
+    parser.add_argument("--env", action="append", default=[],
+                        help="NAME=VALUE passed to the gateway, e.g. AI_ENABLED=false")
+    args = parser.parse_args()
+
+    total, rows = import_report()
+    report = {
+        "import_ms": round(total, 1),
+        "import_by_package_ms": {k: round(v, 1) for k, v in list(by_package(rows).items())[:args.top]},
+        "slowest_modules_ms": [
+            {"module": name, "self": round(self_ms, 1), "cumulative": round(cumulative, 1)}
+            for name, self_ms, cumulative in sorted(rows, key=lambda row: -row[1])[:args.top]
+        ],
+    }
+
+    if not args.imports_only:
+        from benchmarks.fake_compute import FakeComputeServer
+        env = dict(item.split("=", 1) for item in args.env)
+        with FakeComputeServer() as fake:
+            samples = [time_to_first_request(fake.address, env) * 1000 for _ in range(args.runs)]
+        median = statistics.median(samples)
+        report["time_to_first_request_ms"] = {
+            "median": round(median, 1),
+            "min": round(min(samples), 1),
+            "max": round(max(samples), 1),
+            "target": args.target_ms,
+        }
+
+    print(json.dumps(report, indent=2))
+    if not args.imports_only and median > args.target_ms:
+        print(f"time to first request {median:.0f} ms exceeds the {args.target_ms:.0f} ms target",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+"""
+Python stand-in for the C++ ComputeService, used by gateway tests and benchmarks.
+
+Results are computed with NumPy and follow the C++ service's semantics
+(which fields are set per operation, percentile interpolation, Monte Carlo
+metrics), so the gateway sees realistic payloads without the C++ build.
+
+Each RPC can be given a latency distribution, an error rate and occasional
+slowdowns, drawn from a seeded RNG so runs are repeatable:
+
+    {
+        "default": {"latency": {"distribution": "lognormal", "ms": 2, "sigma": 0.5}},
+        "MultiplyMatrices": {"error_rate": 0.01, "error_code": "UNAVAILABLE",
+                             "slowdown_rate": 0.02, "slowdown_factor": 20}
+    }
+
+Standalone server:
+    python -m benchmarks.fake_compute --port 50051 --config faults.json
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+import grpc
+import numpy as np
+
+from app import compute_pb2
+from app import compute_pb2_grpc
+
+PERCENTILES = (25, 50, 75, 95, 99)
+
+# Response fields that carry the backend's own timing
+_TIMING_FIELDS = ("computation_time_ms", "inference_time_ms", "total_inference_time_ms")
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000.0
+
+
+def _csr_to_array(matrix) -> np.ndarray:
+    """Dense array of a SparseMatrix message"""
+    result = np.zeros((matrix.rows, matrix.cols))
+    offsets = np.asarray(matrix.row_offsets, dtype=np.int64)
+    rows = np.repeat(np.arange(matrix.rows), np.diff(offsets))
+    result[rows, np.asarray(matrix.col_indices, dtype=np.int64)] = matrix.values
+    return result
+
+
+@dataclass
+class Latency:
+    """Latency distribution in milliseconds
+
+    fixed: always ms; uniform: ms +/- jitter_ms; normal: mean ms, std jitter_ms;
+    lognormal: median ms with shape sigma; exponential: mean ms.
+    """
+    distribution: str = "fixed"
+    ms: float = 0.0
+    jitter_ms: float = 0.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds"""
+        if self.distribution == "fixed":
+            value = self.ms
+        elif self.distribution == "uniform":
+            value = rng.uniform(self.ms - self.jitter_ms, self.ms + self.jitter_ms)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.ms, self.jitter_ms)
+        elif self.distribution == "lognormal":
+            value = self.ms * math.exp(rng.gauss(0.0, self.sigma))
+        elif self.distribution == "exponential":
+            value = rng.expovariate(1.0 / self.ms) if self.ms > 0 else 0.0
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+        return max(value, 0.0) / 1000.0
+
+
+@dataclass
+class RpcBehavior:
+    """Injected latency, errors and slowdowns for one RPC"""
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+    error_code: str = "UNAVAILABLE"
+    slowdown_rate: float = 0.0
+    slowdown_factor: float = 10.0  # multiplies the sampled latency
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "RpcBehavior":
+        config = dict(config)
+        latency = Latency(**config.pop("latency", {}))
+        behavior = cls(latency=latency, **config)
+        grpc.StatusCode[behavior.error_code]  # fail fast on typos
+        return behavior
+
+
+def _rpc(method):
+    """Apply the configured behaviour of an RPC around its implementation"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    async def wrapper(self, request, context):
+        async with self._slot():
+            self.calls[name] += 1
+            behavior = self.behavior(name)
+            if behavior.error_rate and self.rng.random() < behavior.error_rate:
+                self.errors[name] += 1
+                await context.abort(
+                    grpc.StatusCode[behavior.error_code], f"injected {behavior.error_code}"
+                )
+
+            delay = behavior.latency.sample(self.rng)
+            if behavior.slowdown_rate and self.rng.random() < behavior.slowdown_rate:
+                self.slowdowns[name] += 1
+                delay *= behavior.slowdown_factor
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            response = await method(self, request, context)
+            # Injected latency stands for backend work, report it as such
+            for timing_field in _TIMING_FIELDS:
+                if timing_field in type(response).DESCRIPTOR.fields_by_name:
+                    setattr(response, timing_field,
+                            getattr(response, timing_field) + delay * 1000.0)
+            return response
+
+    return wrapper
+
+
+class FakeComputeServicer(compute_pb2_grpc.ComputeServiceServicer):
+    """NumPy implementation of the ComputeService RPCs with fault injection"""
+
+    def __init__(self, config: Optional[Dict[str, dict]] = None, seed: int = 0,
+                 max_concurrency: Optional[int] = None):
+        self.started = time.monotonic()
+        self.total_requests = 0
+        self.total_response_time_ms = 0.0
+        self.rng = random.Random(seed)
+        self.behaviors: Dict[str, RpcBehavior] = {}
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.slowdowns: Counter = Counter()
+        # Emulates the C++ server's fixed thread pool
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.configure(config or {})
+
+    def configure(self, config: Dict[str, dict]):
+        """Replace RPC behaviours; "default" applies to RPCs without their own entry"""
+        self.behaviors = {name: RpcBehavior.from_dict(value) for name, value in config.items()}
+
+    def set_behavior(self, rpc: str, behavior: RpcBehavior):
+        """Change one RPC's behaviour, e.g. to start a slowdown mid-run"""
+        self.behaviors[rpc] = behavior
+
+    def behavior(self, rpc: str) -> RpcBehavior:
+        return self.behaviors.get(rpc) or self.behaviors.get("default") or RpcBehavior()
+
+    def _slot(self):
+        return self._semaphore if self._semaphore is not None else contextlib.nullcontext()
+
+    def _record(self, elapsed_ms: float):
+        self.total_requests += 1
+        self.total_response_time_ms += elapsed_ms
+
+    @_rpc
+    async def MultiplyMatrices(self, request, context):
+        start = time.perf_counter()
+        a = np.asarray(request.matrix_a, dtype=np.float64)
+        b = np.asarray(request.matrix_b, dtype=np.float64)
+        rows, inner, cols = request.rows_a, request.cols_a, request.cols_b
+        if a.size != rows * inner or b.size != inner * cols:
+            await context.abort(grpc.StatusCode.INTERNAL, "Matrix dimensions incompatible")
+        result = a.reshape(rows, inner) @ b.reshape(inner, cols)
+
+        elapsed = _elapsed_ms(start)
+        self._record(elapsed)
+        return compute_pb2.MatrixMultiplyResponse(
+            result=result.ravel().tolist(), rows=rows, cols=cols, computation_time_ms=elapsed
+        )
+
+    @_rpc
+    async def MultiplySparseMatrices(self, request, context):
+        start = time.perf_counter()
+        a = _csr_to_array(request.matrix_a)
+        if request.HasField("sparse_b"):
+            b, kernel = _csr_to_array(request.sparse_b), "spgemm"
+        else:
+            dense_b = request.dense_b
+            b = np.asarray(dense_b.values, dtype=np.float64).reshape(dense_b.rows, dense_b.cols)
+            kernel = "spmm"
+        if a.shape[1] != b.shape[0]:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Matrix dimensions incompatible")
+        result = a @ b
+
+        elapsed = _elapsed_ms(start)
+        self._record(elapsed)
+        response = compute_pb2.SparseMatrixMultiplyResponse(computation_time_ms=elapsed, kernel=kernel)
+        rows, cols = result.shape
+        nonzero = np.nonzero(result)
+        # Same choice as the C++ server: the smaller of the CSR and dense encodings
+        if nonzero[0].size * 12 < result.size * 8:
+            response.sparse_result.rows, response.sparse_result.cols = rows, cols
+            response.sparse_result.row_offsets.extend(
+                np.concatenate(([0], np.cumsum(np.bincount(nonzero[0], minlength=rows)))).tolist()
+            )
+            response.sparse_result.col_indices.extend(nonzero[1].tolist())
+            response.sparse_result.values.extend(result[nonzero].tolist())
+        else:
+            response.dense_result.rows, response.dense_result.cols = rows, cols
+            response.dense_result.values.extend(result.ravel().tolist())
+        return response
+
+    @_rpc
+    async def AnalyzeStatistics(self, request, context):
+        start = time.perf_counter()
+        data = np.asarray(request.data, dtype=np.float64)
+        if data.size == 0:
+            await context.abort(grpc.StatusCode.INTERNAL, "Cannot analyze empty dataset")
+
+        response = compute_pb2.StatsAnalysisResponse(
+            mean=float(data.mean()), min=float(data.min()), max=float(data.max()),
+            count=int(data.size)
+        )
+        for op in request.operations:
+            if op == "median":
+                response.median = float(np.median(data))
+            elif op == "stddev":
+                response.variance = float(data.var())
+                response.stddev = math.sqrt(response.variance)
+            elif op == "variance":
+                response.variance = float(data.var())
+            elif op == "percentiles":
+                values = np.percentile(data, PERCENTILES)
+                for p, value in zip(PERCENTILES, values):
+                    response.percentiles[p] = float(value)
+
+        response.computation_time_ms = _elapsed_ms(start)
+        self._record(response.computation_time_ms)
+        return response
+
+    @_rpc
+    async def RunMonteCarlo(self, request, context):
+        start = time.perf_counter()
+        rng = np.random.default_rng(request.seed)
+        n = int(request.iterations)
+        # Sampling strategies are not modelled: every run is plain pseudo-random
+        response = compute_pb2.MonteCarloResponse(
+            iterations_completed=n, variance_reduction_factor=1.0
+        )
+
+        if request.simulation_type == "pi_estimation":
+            inside = (rng.random(n) ** 2 + rng.random(n) ** 2) <= 1.0
+            p = inside.mean()
+            response.result = 4.0 * p
+            margin = 1.96 * 4.0 * math.sqrt(p * (1 - p) / n)
+            response.additional_metrics["actual_pi"] = math.pi
+            response.additional_metrics["error"] = abs(response.result - math.pi)
+            response.additional_metrics["error_percentage"] = (
+                abs(response.result - math.pi) / math.pi * 100.0
+            )
+        elif request.simulation_type == "option_pricing":
+            s0, strike, r, sigma, t = 100.0, 100.0, 0.05, 0.2, 1.0
+            steps = max(request.dimensions, 1)
+            dt = t / steps
+            z = rng.standard_normal((n, steps))
+            log_paths = ((r - 0.5 * sigma ** 2) * dt + sigma * math.sqrt(dt) * z).sum(axis=1)
+            payoffs = np.maximum(s0 * np.exp(log_paths) - strike, 0.0)
+            discount = math.exp(-r * t)
+            response.result = discount * float(payoffs.mean())
+            margin = 1.96 * discount * float(payoffs.std(ddof=1)) / math.sqrt(n)
+            response.additional_metrics["strike"] = strike
+            response.additional_metrics["spot"] = s0
+            response.additional_metrics["volatility"] = sigma
+            response.additional_metrics["time_steps"] = float(steps)
+        elif request.simulation_type == "integration":
+            dims = max(request.dimensions, 1)
+            samples = np.exp(-(rng.random((n, dims)) ** 2).sum(axis=1))
+            response.result = float(samples.mean())
+            std_error = float(samples.std(ddof=1)) / math.sqrt(n)
+            margin = 1.96 * std_error
+            response.additional_metrics["dimensions"] = float(dims)
+            response.additional_metrics["std_error"] = std_error
+        else:
+            await context.abort(
+                grpc.StatusCode.INTERNAL, f"Unknown simulation type: {request.simulation_type}"
+            )
+
+        response.confidence_interval_lower = response.result - margin
+        response.confidence_interval_upper = response.result + margin
+        response.computation_time_ms = _elapsed_ms(start)
+        self._record(response.computation_time_ms)
+        return response
+
+    @_rpc
+    async def VectorOperation(self, request, context):
+        start = time.perf_counter()
+        a = np.asarray(request.vector_a, dtype=np.float64)
+        b = np.asarray(request.vector_b, dtype=np.float64)
+        response = compute_pb2.VectorOperationResponse()
+        if request.operation == "dot_product":
+            response.result_scalar = float(a @ b)
+        elif request.operation == "cross_product":
+            response.result_vector.extend(np.cross(a, b).tolist())
+        elif request.operation == "norm":
+            response.result_scalar = float(np.linalg.norm(a))
+        elif request.operation == "distance":
+            response.result_scalar = float(np.linalg.norm(a - b))
+
+        response.computation_time_ms = _elapsed_ms(start)
+        self._record(response.computation_time_ms)
+        return response
+
+    @staticmethod
+    def _infer(request) -> compute_pb2.MLInferenceResponse:
+        start = time.perf_counter()
+        # Deterministic 10-class "model": per-class sums over strided input slices
+        data = np.asarray(request.input_data, dtype=np.float32)
+        logits = np.array([data[i::10].sum() for i in range(10)], dtype=np.float32)
+        if request.apply_softmax:
+            probabilities = np.exp(logits - logits.max())
+            probabilities /= probabilities.sum()
+        else:
+            probabilities = logits
+
+        response = compute_pb2.MLInferenceResponse(
+            output=logits.tolist(),
+            probabilities=probabilities.tolist(),
+            model_info="Input: [1,1,28,28] Output: [1,10]"
+        )
+        if request.top_k > 0:
+            top = np.argsort(-probabilities)[:request.top_k]
+            response.top_classes.extend(int(i) for i in top)
+            response.top_probabilities.extend(float(probabilities[i]) for i in top)
+
+        response.inference_time_ms = _elapsed_ms(start)
+        return response
+
+    @_rpc
+    async def MLInference(self, request, context):
+        response = self._infer(request)
+        self._record(response.inference_time_ms)
+        return response
+
+    @_rpc
+    async def MLBatchInference(self, request, context):
+        start = time.perf_counter()
+        response = compute_pb2.MLBatchInferenceResponse(
+            batch_responses=[self._infer(item) for item in request.batch_requests]
+        )
+        response.total_inference_time_ms = _elapsed_ms(start)
+        self._record(response.total_inference_time_ms)
+        return response
+
+    async def HealthCheck(self, request, context):
+        # Counted, but not subject to injected faults
+        self.calls["HealthCheck"] += 1
+        return compute_pb2.HealthCheckResponse(
+            status="healthy",
+            uptime_seconds=time.monotonic() - self.started,
+            total_requests=self.total_requests,
+            avg_response_time_ms=(
+                self.total_response_time_ms / self.total_requests if self.total_requests else 0.0
+            ),
+            models=[compute_pb2.ModelStats(
+                model_name="mnist",
+                loaded=True,
+                inference_count=self.calls["MLInference"]
+            )]
+        )
+
+
+def create_server(servicer: FakeComputeServicer, address: str):
+    """grpc.aio server for the servicer; returns (server, bound port)"""
+    server = grpc.aio.server(options=[
+        ('grpc.max_send_message_length', 100 * 1024 * 1024),
+        ('grpc.max_receive_message_length', 100 * 1024 * 1024),
+    ])
+    compute_pb2_grpc.add_ComputeServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port(address)
+    return server, port
+
+
+class FakeComputeServer:
+    """Runs a FakeComputeServicer on a grpc.aio server in a background thread"""
+
+    def __init__(self, servicer: Optional[FakeComputeServicer] = None, port: int = 0):
+        self.servicer = servicer or FakeComputeServicer()
+        self.port = port
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fake-compute",
+                                        daemon=True)
+        self._server: Optional[grpc.aio.Server] = None
+
+    @property
+    def address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    async def _start(self):
+        self._server, self.port = create_server(self.servicer, f"127.0.0.1:{self.port}")
+        await self._server.start()
+
+    def start(self) -> "FakeComputeServer":
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            asyncio.run_coroutine_threadsafe(self._server.stop(None), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def __enter__(self) -> "FakeComputeServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def load_config(value: str) -> Dict[str, dict]:
+    """Parse an inline JSON config or read it from a file"""
+    text = value if value.lstrip().startswith("{") else Path(value).read_text()
+    return json.loads(text)
+
+
+async def serve(host: str, port: int, servicer: FakeComputeServicer):
+    server, _ = create_server(servicer, f"{host}:{port}")
+    await server.start()
+    print(f"fake compute service listening on {host}:{port}")
+    await server.wait_for_termination()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake ComputeService with fault injection")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument("--config", help="JSON behaviour config (inline or file path)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-concurrency", type=int)
+    args = parser.parse_args()
+
+    servicer = FakeComputeServicer(
+        load_config(args.config) if args.config else None, args.seed, args.max_concurrency
+    )
+    asyncio.run(serve(args.host, args.port, servicer))
+
+
+if __name__ == "__main__":
+    main()
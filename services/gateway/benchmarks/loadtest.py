@@ -0,0 +1,302 @@
+"""
+Open-loop load test for the gateway.
+
+Starts the gateway (uvicorn subprocess) against an in-process fake
+ComputeService or a real one, sends requests at a fixed target rate
+regardless of how fast responses come back, and reports throughput and
+latency percentiles per endpoint and payload size as JSON.
+
+Latency is measured from each request's scheduled send time, so client-side
+queueing under overload is included (no coordinated omission).
+
+Usage:
+    python -m benchmarks.loadtest --rps 100 --duration 20 --output results.json
+    python -m benchmarks.loadtest --compute-url localhost:50051 \\
+        --scenario matrix_multiply:16,128 --scenario statistics:100000
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+GATEWAY_DIR = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class Scenario:
+    """One endpoint with a payload generator parameterised by size"""
+    name: str
+    path: str
+    payload: Callable[[int, random.Random], dict]
+    sizes: List[int]
+
+
+def _matrix(n: int, rng: random.Random) -> List[List[float]]:
+    return [[rng.uniform(-1.0, 1.0) for _ in range(n)] for _ in range(n)]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "matrix_multiply": Scenario(
+        "matrix_multiply", "/api/v1/compute/matrix/multiply",
+        lambda n, rng: {"matrix_a": _matrix(n, rng), "matrix_b": _matrix(n, rng)},
+        [8, 64, 128]
+    ),
+    "statistics": Scenario(
+        "statistics", "/api/v1/compute/stats/analyze",
+        lambda n, rng: {
+            "data": [rng.gauss(0.0, 1.0) for _ in range(n)],
+            "operations": ["mean", "median", "stddev", "percentiles"]
+        },
+        [100, 10_000, 100_000]
+    ),
+    "monte_carlo": Scenario(
+        "monte_carlo", "/api/v1/compute/simulation/monte-carlo",
+        lambda n, rng: {"iterations": n, "simulation_type": "pi_estimation", "seed": 42},
+        [10_000, 1_000_000]
+    ),
+    "ml_inference": Scenario(
+        "ml_inference", "/api/v1/ml/inference",
+        lambda n, rng: {
+            "model_name": "mnist",
+            "input_data": [rng.random() for _ in range(n)],
+            "input_shape": [1, 1, 28, 28],
+            "top_k": 3
+        },
+        [784]
+    ),
+    # Size is the batch size; compare images/s against ml_inference
+    "ml_batch_inference": Scenario(
+        "ml_batch_inference", "/api/v1/ml/inference/batch",
+        lambda n, rng: {
+            "model_name": "mnist",
+            "inputs": [[rng.random() for _ in range(784)] for _ in range(n)],
+            "input_shape": [1, 1, 28, 28],
+            "top_k": 3
+        },
+        [8, 32]
+    ),
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = min(max(math.ceil(q / 100.0 * len(sorted_values)), 1), len(sorted_values))
+    return sorted_values[rank - 1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gateway(compute_url: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    """Start the gateway (multi-process mode if workers > 1) and wait until it answers"""
+    port = _free_port()
+    # The load test is a single client: lift the per-client rate limit and quota
+    env = dict(os.environ, COMPUTE_SERVICE_URL=compute_url, LOG_LEVEL="WARNING",
+               RATE_LIMIT_ENABLED="false", SCHEDULER_KEY_MAX_SHARE="1.0",
+               HOST="127.0.0.1", PORT=str(port), WORKERS=str(workers), DEBUG="false")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        cwd=GATEWAY_DIR, env=env, stdout=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("gateway exited during startup")
+        try:
+            httpx.get(f"{url}/", timeout=1.0)
+            return process, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gateway did not start within 30s")
+
+
+async def run_open_loop(client: httpx.AsyncClient, path: str, body: bytes, rps: float,
+                        duration: float, warmup: float, poisson: bool,
+                        rng: random.Random, timeout: float) -> dict:
+    """Send requests on a fixed schedule and collect latencies of the measured window"""
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    headers = {"Content-Type": "application/json"}
+
+    async def send(scheduled: float, measured: bool):
+        try:
+            response = await client.post(path, content=body, headers=headers, timeout=timeout)
+            outcome = str(response.status_code)
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        if measured:
+            statuses[outcome] += 1
+            if outcome == "200":
+                latencies.append(loop.time() - scheduled)
+
+    tasks = []
+    start = loop.time() + 0.01
+    offset = 0.0
+    while offset < warmup + duration:
+        scheduled = start + offset
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(scheduled, offset >= warmup)))
+        offset += rng.expovariate(rps) if poisson else 1.0 / rps
+    await asyncio.gather(*tasks)
+
+    latencies.sort()
+    ok = statuses.get("200", 0)
+    sent = sum(statuses.values())
+    return {
+        "sent": sent,
+        "ok": ok,
+        "errors": sent - ok,
+        "statuses": dict(statuses),
+        "throughput_rps": round(ok / duration, 2),
+        "latency_ms": {
+            name: round(value * 1000, 3) if value is not None else None
+            for name, value in [
+                ("mean", sum(latencies) / len(latencies) if latencies else None),
+                ("p50", percentile(latencies, 50)),
+                ("p95", percentile(latencies, 95)),
+                ("p99", percentile(latencies, 99)),
+                ("p999", percentile(latencies, 99.9)),
+                ("max", latencies[-1] if latencies else None),
+            ]
+        },
+    }
+
+
+def _parse_scenarios(specs: List[str]) -> List[Scenario]:
+    if not specs:
+        return list(SCENARIOS.values())
+    selected = []
+    for spec in specs:
+        name, _, sizes = spec.partition(":")
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}, choose from {sorted(SCENARIOS)}")
+        base = SCENARIOS[name]
+        selected.append(Scenario(
+            base.name, base.path, base.payload,
+            [int(s) for s in sizes.split(",")] if sizes else base.sizes
+        ))
+    return selected
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=GATEWAY_DIR, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_suite(args, gateway_url: str, compute: Union[str, dict]) -> dict:
+    scenarios = _parse_scenarios(args.scenario)
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=None)
+    results = []
+    async with httpx.AsyncClient(base_url=gateway_url, limits=limits) as client:
+        for scenario in scenarios:
+            for size in scenario.sizes:
+                rng = random.Random(f"{args.seed}:{scenario.name}:{size}")
+                body = json.dumps(scenario.payload(size, rng)).encode()
+                stats = await run_open_loop(
+                    client, scenario.path, body, args.rps, args.duration, args.warmup,
+                    args.arrival == "poisson", rng, args.timeout
+                )
+                result = {"scenario": scenario.name, "payload_size": size,
+                          "payload_bytes": len(body), "target_rps": args.rps, **stats}
+                results.append(result)
+                print(f"{scenario.name:>16} size={size:<8} ok={stats['ok']:<6} "
+                      f"errors={stats['errors']:<5} p50={stats['latency_ms']['p50']}ms "
+                      f"p99={stats['latency_ms']['p99']}ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "gateway_url": gateway_url,
+            "compute": compute,
+            "rps": args.rps,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "arrival": args.arrival,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rps", type=float, default=50.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds per run")
+    parser.add_argument("--arrival", choices=["poisson", "constant"], default="poisson")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--scenario", action="append", default=[],
+                        help="NAME[:SIZE,SIZE] (repeatable), default: all scenarios")
+    parser.add_argument("--compute-url", help="use a real compute service instead of the fake")
+    parser.add_argument("--fake-config",
+                        help="fake service latency/error config (inline JSON or file)")
+    parser.add_argument("--fake-max-concurrency", type=int)
+    parser.add_argument("--gateway-url", help="use a running gateway instead of starting one")
+    parser.add_argument("--gateway-workers", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    fake = None
+    gateway = None
+    try:
+        if args.compute_url:
+            compute_url, compute = args.compute_url, args.compute_url
+        else:
+            from benchmarks.fake_compute import FakeComputeServer, FakeComputeServicer, load_config
+            config = load_config(args.fake_config) if args.fake_config else {}
+            servicer = FakeComputeServicer(config, args.seed, args.fake_max_concurrency)
+            fake = FakeComputeServer(servicer).start()
+            compute_url, compute = fake.address, {"fake": config}
+
+        if args.gateway_url:
+            gateway_url = args.gateway_url
+        else:
+            gateway, gateway_url = start_gateway(compute_url, args.gateway_workers)
+
+        report = asyncio.run(run_suite(args, gateway_url, compute))
+    finally:
+        if gateway is not None:
+            gateway.terminate()
+            gateway.wait(timeout=10)
+        if fake is not None:
+            fake.stop()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,52 @@
 import pytest
 
+from app.config import get_settings
+from app.services import concurrency_limiter, retry_policy
+from app.services.compute_client import ComputeServiceClient, close_compute_client
+from benchmarks.fake_compute import FakeComputeServer, FakeComputeServicer
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_compute():
+    """Serve the API tests from the in-process fake ComputeService"""
+    settings = get_settings()
+    original_url = settings.compute_service_url
+    original_rate_limit = settings.rate_limit_enabled
+    settings.rate_limit_enabled = False
+    with FakeComputeServer() as server:
+        settings.compute_service_url = server.address
+        close_compute_client()
+        yield server
+        close_compute_client()
+    settings.compute_service_url = original_url
+    settings.rate_limit_enabled = original_rate_limit
+
+
+@pytest.fixture
+def compute_backend(monkeypatch):
+    """Client against a dedicated fake backend with fresh retry state"""
+    servers = []
+    clients = []
+    monkeypatch.setattr(retry_policy, "_budget", None)
+    monkeypatch.setattr(retry_policy, "_latencies", {})
+    monkeypatch.setattr(concurrency_limiter, "_limiters", {})
+
+    def start(config, **settings):
+        server = FakeComputeServer(FakeComputeServicer(config)).start()
+        servers.append(server)
+        monkeypatch.setattr(get_settings(), "compute_service_url", server.address)
+        for name, value in settings.items():
+            monkeypatch.setattr(get_settings(), name, value)
+        client = ComputeServiceClient()
+        clients.append(client)
+        return server.servicer, client
+
+    yield start
+    for client in clients:
+        client.close()
+    for server in servers:
+        server.stop()
+
 
 @pytest.fixture
 def sample_matrix():
@@ -1,6 +1,7 @@
 import pytest
 from httpx import AsyncClient
 from app.main import app
+from app.routers import compute
 
 
 @pytest.mark.asyncio
@@ -46,6 +47,65 @@ async def test_stats_analysis():
         assert "stddev" in data
 
 
+@pytest.mark.asyncio
+async def test_monte_carlo_sampling():
+    """Test sampling strategy validation and the variance reduction factor"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        payload = {"iterations": 10000, "simulation_type": "option_pricing", "sampling": "sobol"}
+        response = await client.post("/api/v1/compute/simulation/monte-carlo", json=payload)
+        
+        assert response.status_code == 200
+        assert response.json()["variance_reduction_factor"] > 0
+        
+        invalid = [
+            {**payload, "sampling": "latin_hypercube"},
+            {**payload, "simulation_type": "pi_estimation", "sampling": "control_variate"},
+            {**payload, "iterations": 100, "sampling": "stratified"},
+        ]
+        for body in invalid:
+            response = await client.post("/api/v1/compute/simulation/monte-carlo", json=body)
+            assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_monte_carlo_invalid_argument_from_service(compute_backend, monkeypatch):
+    """Parameters the compute service rejects come back as 422 with its message"""
+    _, backend = compute_backend(
+        {"RunMonteCarlo": {"error_rate": 1.0, "error_code": "INVALID_ARGUMENT"}}
+    )
+    monkeypatch.setattr(compute, "get_compute_client", lambda: backend)
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/compute/simulation/monte-carlo",
+            json={"iterations": 10000, "simulation_type": "pi_estimation"}
+        )
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "injected INVALID_ARGUMENT"
+
+
+@pytest.mark.asyncio
+async def test_ml_batch_inference():
+    """Test batch inference returns one result per input"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        payload = {
+            "model_name": "mnist",
+            "inputs": [[0.0] * 784, [1.0] * 784, [0.5] * 784],
+            "input_shape": [1, 1, 28, 28],
+            "top_k": 3
+        }
+        response = await client.post("/api/v1/ml/inference/batch", json=payload)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["results"]) == 3
+        assert all(len(result["top_classes"]) == 3 for result in data["results"])
+        assert "total_inference_time_ms" in data
+        
+        empty = await client.post("/api/v1/ml/inference/batch", json={**payload, "inputs": []})
+        assert empty.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_invalid_matrix():
     """Test validation for invalid matrix"""
@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import grpc
+import pytest
+from httpx import AsyncClient
+
+from app.main import app
+from app.models.schemas import StatsAnalysisRequest
+from app.services import compute_client
+from app.services.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+)
+
+REQUEST = StatsAnalysisRequest(data=[1.0, 2.0, 3.0], operations=["mean"])
+
+
+class FakeRpcError(grpc.RpcError):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+def _breaker(probe_result=True, **kwargs):
+    async def probe():
+        return probe_result
+    options = dict(window_size=4, min_calls=4, open_seconds=0.05)
+    options.update(kwargs)
+    return CircuitBreaker("backend:1", probe, **options)
+
+
+@pytest.mark.asyncio
+async def test_trips_on_error_rate_and_recovers_after_probe():
+    """Backend errors open the circuit; a healthy probe closes it again"""
+    breaker = _breaker()
+    breaker.record(0.01)
+    breaker.record(0.01, FakeRpcError(grpc.StatusCode.INVALID_ARGUMENT))
+    breaker.record(0.01, FakeRpcError(grpc.StatusCode.UNAVAILABLE))
+    assert breaker.state == CLOSED
+    breaker.record(0.01, FakeRpcError(grpc.StatusCode.UNAVAILABLE))
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.check("statistics")
+
+    await asyncio.sleep(0.06)
+    assert not breaker.allows()
+    assert breaker.state == HALF_OPEN
+    await breaker._probe_task
+    assert breaker.state == CLOSED
+    breaker.check("statistics")
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_keeps_the_circuit_open():
+    """An unhealthy probe restarts the open period"""
+    breaker = _breaker(probe_result=False, slow_call_seconds=0.1, slow_call_rate=0.5)
+    for _ in range(2):
+        breaker.record(0.01)
+        breaker.record(0.5)
+    assert breaker.state == OPEN
+
+    await asyncio.sleep(0.06)
+    breaker.allows()
+    await breaker._probe_task
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_requests_fail_fast_while_backend_is_down(compute_backend):
+    """Once the circuit is open the backend is no longer called"""
+    servicer, client = compute_backend(
+        {"AnalyzeStatistics": {"error_rate": 1.0, "error_code": "UNAVAILABLE"}},
+        circuit_window_size=4, circuit_min_calls=4, circuit_open_seconds=60,
+        grpc_max_retries=1
+    )
+    for _ in range(4):
+        with pytest.raises(grpc.RpcError):
+            await client.analyze_statistics(REQUEST)
+
+    started = time.perf_counter()
+    with pytest.raises(CircuitOpenError):
+        await client.analyze_statistics(REQUEST)
+    assert time.perf_counter() - started < 0.2
+    assert servicer.calls["AnalyzeStatistics"] == 4
+    assert client.circuit_states() == {client.breaker.backend: OPEN}
+
+    health = await client.health_check()
+    assert health["status"] == "unhealthy"
+
+
+@pytest.mark.asyncio
+async def test_health_endpoints_report_open_circuit(compute_backend, monkeypatch):
+    """/health shows the breaker state and /api/v1/ml/health returns 503"""
+    _, client = compute_backend({})
+    client.breaker._transition(OPEN)
+    monkeypatch.setattr(compute_client, "_client", client)
+
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        health = await http.get("/health")
+        ml_health = await http.get("/api/v1/ml/health")
+
+    assert health.json()["circuit_breakers"] == {client.breaker.backend: "open"}
+    assert health.json()["status"] == "degraded"
+    assert ml_health.status_code == 503
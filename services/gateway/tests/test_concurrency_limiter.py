@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import get_settings
+from app.main import app
+from app.services import concurrency_limiter
+from app.services.concurrency_limiter import (
+    AdaptiveLimiter, OverloadedError, TokenBucketRateLimiter
+)
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_is_full_or_times_out():
+    """Requests over the limit queue briefly and are shed with a retry hint"""
+    limiter = AdaptiveLimiter("test", initial_limit=2, min_limit=2, max_queue=1,
+                              queue_timeout=0.05)
+    await limiter.acquire()
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError) as full:
+        await limiter.acquire()
+    assert full.value.reason == "queue_full"
+    assert full.value.retry_after >= 1
+
+    with pytest.raises(OverloadedError) as timed_out:
+        await waiter
+    assert timed_out.value.reason == "queue_timeout"
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_released_slot_goes_to_the_next_waiter():
+    """A finished call hands its slot to the oldest queued request"""
+    limiter = AdaptiveLimiter("test", algorithm="aimd", initial_limit=2, min_limit=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    limiter.release(0.01)
+    await asyncio.wait_for(waiter, 1.0)
+    assert limiter.inflight == 2
+    assert limiter.queued == 0
+
+
+def test_aimd_backs_off_on_drops():
+    """Congestion signals shrink the limit multiplicatively"""
+    limiter = AdaptiveLimiter("test", algorithm="aimd", initial_limit=20, backoff_ratio=0.5)
+    limiter.inflight = 1
+    limiter.release(0.01, dropped=True)
+    assert limiter.limit == 10
+
+
+def test_gradient_follows_latency():
+    """The limit grows while latency is flat and shrinks when it rises"""
+    limiter = AdaptiveLimiter("test", initial_limit=16, min_limit=2, max_limit=256)
+    for _ in range(20):
+        limiter.inflight = 1
+        limiter.release(0.010)
+    grown = limiter.limit
+    assert grown > 16
+
+    for _ in range(20):
+        limiter.inflight = 1
+        limiter.release(0.200)
+    assert limiter.limit < grown
+
+
+def test_token_bucket():
+    """Each client gets `burst` requests, then waits for the refill rate"""
+    bucket = TokenBucketRateLimiter(per_minute=60, burst=2)
+    assert bucket.check("a") is None
+    assert bucket.check("a") is None
+    retry_after = bucket.check("a")
+    assert retry_after is not None and 0 < retry_after <= 1.0
+    assert bucket.check("b") is None
+
+
+@pytest.mark.asyncio
+async def test_overloaded_backend_returns_503(monkeypatch):
+    """A saturated limiter sheds requests with 503 and Retry-After"""
+    limiter = AdaptiveLimiter("statistics", initial_limit=2, min_limit=2, max_queue=0)
+    limiter.inflight = 2
+    monkeypatch.setitem(concurrency_limiter._limiters, "statistics", limiter)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/api/v1/compute/stats/analyze",
+                                      json={"data": [1.0, 2.0, 3.0]})
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_returns_429(monkeypatch):
+    """Clients over their rate limit get 429 with Retry-After"""
+    monkeypatch.setattr(get_settings(), "rate_limit_enabled", True)
+    monkeypatch.setattr(concurrency_limiter, "_rate_limiter",
+                        TokenBucketRateLimiter(per_minute=60, burst=1))
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        payload = {"data": [1.0, 2.0, 3.0]}
+        first = await client.post("/api/v1/compute/stats/analyze", json=payload)
+        second = await client.post("/api/v1/compute/stats/analyze", json=payload)
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_only_known_api_keys_get_their_own_bucket(monkeypatch):
+    """Unknown keys share the address's bucket; valid keys are limited separately"""
+    monkeypatch.setattr(get_settings(), "rate_limit_enabled", True)
+    monkeypatch.setattr(get_settings(), "valid_api_keys", ["team-key"])
+    monkeypatch.setattr(concurrency_limiter, "_rate_limiter",
+                        TokenBucketRateLimiter(per_minute=60, burst=1))
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        payload = {"data": [1.0, 2.0, 3.0]}
+        statuses = [
+            (await client.post(
+                "/api/v1/compute/stats/analyze", json=payload, headers={"X-API-Key": key}
+            )).status_code
+            for key in ("random-1", "random-2", "team-key")
+        ]
+
+    assert statuses == [200, 429, 200]
@@ -0,0 +1,91 @@
+import random
+import time
+
+import grpc
+import pytest
+
+from app import compute_pb2
+from app import compute_pb2_grpc
+from benchmarks.fake_compute import FakeComputeServer, FakeComputeServicer, Latency
+
+
+def _stub(server: FakeComputeServer):
+    channel = grpc.insecure_channel(server.address)
+    return channel, compute_pb2_grpc.ComputeServiceStub(channel)
+
+
+def test_fake_computes_real_results():
+    """Results match the C++ service semantics"""
+    with FakeComputeServer() as server:
+        channel, stub = _stub(server)
+        product = stub.MultiplyMatrices(compute_pb2.MatrixMultiplyRequest(
+            matrix_a=[1, 2, 3, 4], matrix_b=[5, 6, 7, 8], rows_a=2, cols_a=2, cols_b=2
+        ))
+        stats = stub.AnalyzeStatistics(compute_pb2.StatsAnalysisRequest(
+            data=[1.0, 2.0, 3.0, 4.0], operations=["variance", "percentiles"]
+        ))
+        channel.close()
+
+    assert list(product.result) == [19.0, 22.0, 43.0, 50.0]
+    assert stats.variance == pytest.approx(1.25)
+    assert stats.percentiles[50] == pytest.approx(2.5)
+
+
+def test_injected_errors_are_deterministic():
+    """Seeded error injection fails the same calls on every run"""
+    config = {"AnalyzeStatistics": {"error_rate": 0.3, "error_code": "UNAVAILABLE"}}
+
+    def run():
+        outcomes = []
+        with FakeComputeServer(FakeComputeServicer(config, seed=7)) as server:
+            channel, stub = _stub(server)
+            for _ in range(30):
+                try:
+                    stub.AnalyzeStatistics(compute_pb2.StatsAnalysisRequest(data=[1.0]))
+                    outcomes.append("ok")
+                except grpc.RpcError as e:
+                    outcomes.append(e.code().name)
+            # Other RPCs keep the default behaviour
+            stub.HealthCheck(compute_pb2.HealthCheckRequest())
+            channel.close()
+        return outcomes
+
+    first = run()
+    assert first == run()
+    assert 0 < first.count("UNAVAILABLE") < 30
+    assert set(first) == {"ok", "UNAVAILABLE"}
+
+
+def test_latency_and_slowdown_injection():
+    """Injected latency delays the call and is reported as backend time"""
+    config = {"default": {"latency": {"distribution": "fixed", "ms": 30}}}
+    servicer = FakeComputeServicer(config)
+    with FakeComputeServer(servicer) as server:
+        channel, stub = _stub(server)
+        started = time.perf_counter()
+        response = stub.RunMonteCarlo(compute_pb2.MonteCarloRequest(
+            iterations=1000, dimensions=2, seed=1, simulation_type="pi_estimation"
+        ))
+        elapsed = time.perf_counter() - started
+
+        servicer.configure({"default": {"latency": {"ms": 5}, "slowdown_rate": 1.0,
+                                        "slowdown_factor": 10}})
+        started = time.perf_counter()
+        stub.RunMonteCarlo(compute_pb2.MonteCarloRequest(
+            iterations=1000, dimensions=2, seed=1, simulation_type="pi_estimation"
+        ))
+        slowed = time.perf_counter() - started
+        channel.close()
+
+    assert elapsed >= 0.03
+    assert response.computation_time_ms >= 30.0
+    assert slowed >= 0.05
+    assert servicer.slowdowns["RunMonteCarlo"] == 1
+
+
+def test_latency_distributions_are_non_negative():
+    """Sampled latencies are clamped at zero"""
+    rng = random.Random(0)
+    for distribution in ["fixed", "uniform", "normal", "lognormal", "exponential"]:
+        latency = Latency(distribution=distribution, ms=1.0, jitter_ms=5.0)
+        assert all(latency.sample(rng) >= 0.0 for _ in range(100))
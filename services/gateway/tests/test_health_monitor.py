@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from app.main import app
+from app.services import compute_client, health_monitor
+from app.services.health_monitor import HealthMonitor
+
+
+@pytest.fixture
+def monitored(compute_backend, monkeypatch):
+    """Fresh health monitor watching a dedicated fake backend"""
+    servicer, client = compute_backend({})
+    monitor = HealthMonitor(interval=0.05, stale_after=1.0)
+    monkeypatch.setattr(compute_client, "_client", client)
+    monkeypatch.setattr(health_monitor, "_monitor", monitor)
+    return servicer, monitor
+
+
+@pytest.mark.asyncio
+async def test_health_is_served_from_cache(monitored):
+    """Repeated /health polls do not call the compute service again"""
+    servicer, _ = monitored
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        first = await http.get("/health")
+        second = await http.get("/health")
+        deep = await http.get("/health", params={"deep": "true"})
+
+    assert first.json()["compute_service_status"] == "healthy"
+    assert second.json()["stale"] is False
+    assert second.json()["age_seconds"] >= 0
+    assert deep.json()["status"] == "healthy"
+    assert servicer.calls["HealthCheck"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_degraded(monitored):
+    """A snapshot older than stale_after no longer counts as healthy"""
+    _, monitor = monitored
+    await monitor.refresh()
+    monitor.checked_at = time.time() - 10
+
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        response = await http.get("/health")
+
+    assert response.json()["stale"] is True
+    assert response.json()["status"] == "degraded"
+
+
+@pytest.mark.asyncio
+async def test_background_refresh(monitored):
+    """The monitor refreshes on its interval and tracks channel state"""
+    servicer, monitor = monitored
+    monitor.start()
+    await asyncio.sleep(0.2)
+    await monitor.stop()
+
+    assert servicer.calls["HealthCheck"] >= 2
+    assert monitor.compute["status"] == "healthy"
+    assert monitor.channel_state in ("ready", "connecting", "idle")
+
+
+@pytest.mark.asyncio
+async def test_ml_health_reports_model_stats(monitored):
+    """Per-model stats from the compute HealthCheck are exposed by /api/v1/ml/health"""
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        await http.post("/api/v1/ml/inference", json={
+            "model_name": "mnist", "input_data": [0.0] * 784, "input_shape": [1, 1, 28, 28]
+        })
+        response = await http.get("/api/v1/ml/health", params={"deep": "true"})
+
+    assert response.status_code == 200
+    models = response.json()["models"]
+    assert models[0]["model_name"] == "mnist"
+    assert models[0]["loaded"] is True
+    assert models[0]["inference_count"] == 1
@@ -0,0 +1,172 @@
+import asyncio
+import contextlib
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from app.main import app
+from app.services import compute_client, jobs
+from app.services.job_store import (
+    CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, MAX_ATTEMPTS, Job, JobStore, MemoryJobStore,
+    SQLiteJobStore
+)
+from app.services.jobs import JobManager
+
+JOBS_URL = "/api/v1/jobs"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    store = MemoryJobStore() if request.param == "memory" else SQLiteJobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+def add_job(store, job_id, created_at):
+    store.create(Job(id=job_id, operation="statistics", payload={"data": [1.0]},
+                     created_at=created_at))
+
+
+@contextlib.asynccontextmanager
+async def running_jobs(monkeypatch, **options):
+    """Job manager with an in-memory store serving the API"""
+    manager = JobManager(MemoryJobStore(), poll_interval=0.02, **options)
+    monkeypatch.setattr(jobs, "_manager", manager)
+    manager.start()
+    try:
+        yield manager
+    finally:
+        await manager.stop()
+
+
+async def wait_for_status(http, job_id, statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = (await http.get(f"{JOBS_URL}/{job_id}")).json()
+        if job["status"] in statuses or time.monotonic() > deadline:
+            return job
+        await asyncio.sleep(0.02)
+
+
+def test_store_claims_in_order_and_guards_ownership(store):
+    add_job(store, "a", 1.0)
+    add_job(store, "b", 2.0)
+    assert store.count_queued() == 2
+
+    job = store.claim("worker-1", 30)
+    assert (job.id, job.status, job.attempts) == ("a", RUNNING, 1)
+    assert store.renew("a", "worker-1", 30)
+    assert not store.renew("a", "worker-2", 30)
+    assert not store.finish("a", "worker-2", SUCCEEDED, {"mean": 2.0})
+    assert store.finish("a", "worker-1", SUCCEEDED, {"mean": 1.0})
+    assert store.get("a").result == {"mean": 1.0}
+
+    store.claim("worker-1", 30)
+    store.release("b", "worker-1")
+    assert (store.get("b").status, store.get("b").attempts) == (QUEUED, 0)
+
+
+def test_cancel_only_affects_unfinished_jobs(store):
+    add_job(store, "a", 1.0)
+    add_job(store, "b", 2.0)
+    store.claim("worker", 30)
+    store.finish("a", "worker", FAILED, error="boom")
+
+    assert store.cancel("a").status == FAILED
+    assert store.cancel("b").status == CANCELLED
+    assert store.claim("worker", 30) is None
+    assert store.cancel("missing") is None
+    assert store.purge(time.time() + 1) == 2
+
+
+def test_expired_lease_is_claimed_again_until_abandoned(store):
+    add_job(store, "a", 1.0)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        job = store.claim(f"worker-{attempt}", -1)
+        assert (job.id, job.attempts) == ("a", attempt)
+
+    assert store.claim("worker", 30) is None
+    assert store.get("a").status == FAILED
+
+
+def test_incomplete_store_cannot_be_created():
+    class DictJobStore(JobStore):
+        def create(self, job):
+            pass
+
+    with pytest.raises(TypeError):
+        DictJobStore()
+
+
+@pytest.mark.asyncio
+async def test_job_result_is_fetched_later(monkeypatch):
+    async with running_jobs(monkeypatch):
+        async with AsyncClient(app=app, base_url="http://test") as http:
+            response = await http.post(JOBS_URL, json={
+                "operation": "statistics",
+                "payload": {"data": [1.0, 2.0, 3.0, 4.0, 5.0], "operations": ["mean"]}
+            })
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            assert response.headers["Location"] == f"{JOBS_URL}/{job_id}"
+
+            job = await wait_for_status(http, job_id, {SUCCEEDED, FAILED})
+
+    assert job["status"] == SUCCEEDED
+    assert job["result"]["mean"] == pytest.approx(3.0)
+    assert job["finished_at"] >= job["started_at"] >= job["created_at"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_jobs_are_rejected_at_submission(monkeypatch):
+    async with running_jobs(monkeypatch):
+        async with AsyncClient(app=app, base_url="http://test") as http:
+            bad_operation = await http.post(JOBS_URL, json={"operation": "sort", "payload": {}})
+            bad_payload = await http.post(JOBS_URL, json={
+                "operation": "monte_carlo", "payload": {"iterations": 0}
+            })
+            missing = await http.get(f"{JOBS_URL}/unknown")
+
+    assert bad_operation.status_code == 422
+    assert bad_payload.status_code == 422
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_a_running_job(compute_backend, monkeypatch):
+    servicer, client = compute_backend({"RunMonteCarlo": {"latency": {"ms": 5000}}})
+    monkeypatch.setattr(compute_client, "_client", client)
+    async with running_jobs(monkeypatch) as manager:
+        async with AsyncClient(app=app, base_url="http://test") as http:
+            response = await http.post(JOBS_URL, json={
+                "operation": "monte_carlo", "payload": {"iterations": 1000}
+            })
+            job_id = response.json()["job_id"]
+            assert (await wait_for_status(http, job_id, {RUNNING}))["status"] == RUNNING
+
+            cancelled = await http.delete(f"{JOBS_URL}/{job_id}")
+            await asyncio.sleep(0.1)
+            again = await http.delete(f"{JOBS_URL}/{job_id}")
+            job = (await http.get(f"{JOBS_URL}/{job_id}")).json()
+
+        assert not manager._running
+
+    assert cancelled.json()["status"] == CANCELLED
+    assert again.status_code == 200
+    assert job["status"] == CANCELLED and job["result"] is None
+    assert servicer.calls["RunMonteCarlo"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_submissions(monkeypatch):
+    manager = JobManager(MemoryJobStore(), max_queued=1)
+    monkeypatch.setattr(jobs, "_manager", manager)  # not started: jobs stay queued
+    payload = {"operation": "statistics", "payload": {"data": [1.0]}}
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        first = await http.post(JOBS_URL, json=payload)
+        second = await http.post(JOBS_URL, json=payload)
+
+    assert first.status_code == 202
+    assert second.status_code == 503
+    assert "Retry-After" in second.headers
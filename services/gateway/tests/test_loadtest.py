@@ -0,0 +1,35 @@
+import json
+import random
+
+import httpx
+import pytest
+
+from app.main import app
+from benchmarks.loadtest import SCENARIOS, percentile, run_open_loop
+
+
+def test_percentile_nearest_rank():
+    """Percentiles use the nearest-rank definition"""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 99.9) == 100.0
+    assert percentile([], 50) is None
+
+
+@pytest.mark.asyncio
+async def test_open_loop_against_fake_compute():
+    """A short open-loop run through the gateway reports latency percentiles"""
+    scenario = SCENARIOS["matrix_multiply"]
+    rng = random.Random(1)
+    body = json.dumps(scenario.payload(8, rng)).encode()
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        stats = await run_open_loop(
+            client, scenario.path, body, rps=100, duration=0.3, warmup=0.1,
+            poisson=False, rng=rng, timeout=5.0
+        )
+
+    assert stats["errors"] == 0
+    assert stats["ok"] >= 20
+    latency = stats["latency_ms"]
+    assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["p999"] <= latency["max"]
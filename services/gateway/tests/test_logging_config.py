@@ -0,0 +1,54 @@
+import io
+import json
+
+import structlog
+
+from app.logging_config import AsyncLogSink, SuccessLogSampler
+from app.metrics import LOG_RECORDS_DROPPED
+
+
+def test_sampler_keeps_whole_requests_and_all_errors():
+    """Sampling is decided per request_id; warnings and errors are never dropped"""
+    sampler = SuccessLogSampler(0.25)
+    kept = set()
+    for i in range(2000):
+        event = {"event": "request_completed", "request_id": f"{i:032x}"}
+        try:
+            sampler(None, "info", dict(event))
+            kept.add(i)
+        except structlog.DropEvent:
+            pass
+        # The same request always gets the same decision
+        try:
+            sampler(None, "debug", dict(event))
+            assert i in kept
+        except structlog.DropEvent:
+            assert i not in kept
+        assert sampler(None, "error", dict(event)) == event
+
+    assert 0.15 < len(kept) / 2000 < 0.35
+
+
+def test_async_sink_writes_all_lines_on_stop():
+    """Queued lines are written out before the writer thread exits"""
+    stream = io.StringIO()
+    sink = AsyncLogSink(stream, maxsize=1000)
+    for i in range(500):
+        sink.write(json.dumps({"event": "line", "n": i}))
+    sink.stop()
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["n"] for line in lines] == list(range(500))
+
+
+def test_async_sink_drops_when_full():
+    """A full queue drops lines instead of blocking the caller"""
+    stream = io.StringIO()
+    sink = AsyncLogSink(stream, maxsize=1)
+    before = LOG_RECORDS_DROPPED._value.get()
+    for _ in range(10000):
+        sink.write("x")
+    sink.stop()
+
+    dropped = LOG_RECORDS_DROPPED._value.get() - before
+    assert dropped + len(stream.getvalue().splitlines()) == 10000
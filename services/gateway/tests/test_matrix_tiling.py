@@ -0,0 +1,151 @@
+import random
+from contextlib import ExitStack
+
+import pytest
+
+from app.models.schemas import MatrixMultiplyRequest
+from app.services.matrix_tiling import BlockAssembler, message_bytes, plan_tiles, slice_block
+from benchmarks.fake_compute import FakeComputeServer, FakeComputeServicer
+
+
+def random_matrix(rows, cols, rng):
+    return [[rng.uniform(-1, 1) for _ in range(cols)] for _ in range(rows)]
+
+
+def multiply(a, b):
+    columns = list(zip(*b))
+    return [[sum(x * y for x, y in zip(row, column)) for column in columns] for row in a]
+
+
+def test_small_products_stay_whole():
+    plan = plan_tiles(10, 20, 30, backends=1, max_block_bytes=16 * 1024 * 1024)
+    assert plan.grid == (1, 1, 1)
+
+
+def test_plan_splits_output_per_backend_and_respects_message_cap():
+    max_block_bytes = 1024 * 1024
+    plan = plan_tiles(1000, 3000, 800, backends=3, max_block_bytes=max_block_bytes)
+    row_blocks, col_blocks, _ = plan.grid
+    assert row_blocks * col_blocks >= 6
+
+    covered = set()
+    for block in plan.blocks():
+        assert message_bytes(len(block.rows), len(block.inner), len(block.cols)) <= max_block_bytes
+        covered.update(
+            (r, k, c) for r in block.rows[:1] for k in block.inner[:1] for c in block.cols[:1]
+        )
+    assert len(covered) == plan.block_count
+    assert sum(len(b.rows) * len(b.inner) * len(b.cols) for b in plan.blocks()) == 1000 * 3000 * 800
+
+
+def test_plan_rejects_cap_below_one_value():
+    with pytest.raises(ValueError):
+        plan_tiles(4, 4, 4, backends=1, max_block_bytes=16)
+
+
+def test_assembler_sums_inner_blocks_in_any_arrival_order():
+    rng = random.Random(1)
+    a, b = random_matrix(37, 29, rng), random_matrix(29, 23, rng)
+    plan = plan_tiles(37, 29, 23, backends=2, max_block_bytes=message_bytes(10, 8, 10),
+                      min_block=4)
+    assert plan.grid[2] > 1
+
+    blocks = list(plan.blocks())
+    rng.shuffle(blocks)
+    assembler = BlockAssembler(plan)
+    for block in blocks:
+        part = multiply(
+            [row[block.inner.start:block.inner.stop] for row in a[block.rows.start:block.rows.stop]],
+            [row[block.cols.start:block.cols.stop] for row in b[block.inner.start:block.inner.stop]]
+        )
+        assert not assembler.complete
+        assembler.add(block, [value for row in part for value in row])
+
+    assert assembler.complete
+    expected = multiply(a, b)
+    for row, expected_row in zip(assembler.result, expected):
+        assert row == pytest.approx(expected_row)
+
+
+def test_slice_block_is_row_major():
+    matrix = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert slice_block(matrix, range(1, 3), range(0, 2)) == [4, 5, 7, 8]
+
+
+@pytest.fixture
+def shard_servers():
+    """Several fake compute backends for block products"""
+    with ExitStack() as stack:
+        def start(*configs):
+            return [
+                stack.enter_context(FakeComputeServer(FakeComputeServicer(config)))
+                for config in configs
+            ]
+        yield start
+
+
+@pytest.mark.asyncio
+async def test_distributed_multiply_spreads_blocks_over_backends(compute_backend, shard_servers):
+    """Every backend computes blocks and the assembled product is exact"""
+    shards = shard_servers({}, {}, {})
+    primary, client = compute_backend(
+        {},
+        compute_shard_urls=[server.address for server in shards],
+        distributed_matmul_min_cost=0,
+        distributed_matmul_max_block_bytes=message_bytes(16, 32, 16)
+    )
+    rng = random.Random(7)
+    request = MatrixMultiplyRequest(
+        matrix_a=random_matrix(60, 70, rng), matrix_b=random_matrix(70, 50, rng)
+    )
+
+    response = await client.multiply_matrices(request)
+
+    assert (response.rows, response.cols) == (60, 50)
+    for row, expected_row in zip(response.result, multiply(request.matrix_a, request.matrix_b)):
+        assert row == pytest.approx(expected_row)
+    assert primary.calls["MultiplyMatrices"] == 0
+    assert all(server.servicer.calls["MultiplyMatrices"] > 0 for server in shards)
+
+
+@pytest.mark.asyncio
+async def test_blocks_of_a_failing_backend_move_to_healthy_ones(compute_backend, shard_servers):
+    """Failed blocks are requeued until the failing backend's circuit opens"""
+    failing, healthy = shard_servers(
+        {"MultiplyMatrices": {"error_rate": 1.0, "error_code": "UNAVAILABLE"}}, {}
+    )
+    _, client = compute_backend(
+        {},
+        compute_shard_urls=[failing.address, healthy.address],
+        distributed_matmul_min_cost=0,
+        distributed_matmul_max_block_bytes=message_bytes(8, 16, 8),
+        circuit_window_size=4, circuit_min_calls=4, circuit_open_seconds=60
+    )
+    rng = random.Random(3)
+    request = MatrixMultiplyRequest(
+        matrix_a=random_matrix(32, 16, rng), matrix_b=random_matrix(16, 32, rng)
+    )
+
+    response = await client.multiply_matrices(request)
+
+    for row, expected_row in zip(response.result, multiply(request.matrix_a, request.matrix_b)):
+        assert row == pytest.approx(expected_row)
+    assert failing.servicer.errors["MultiplyMatrices"] >= 4
+    assert healthy.servicer.calls["MultiplyMatrices"] == 16
+    assert client.circuit_states()[failing.address] == "open"
+
+
+@pytest.mark.asyncio
+async def test_products_over_the_message_cap_are_tiled(compute_backend):
+    """A single backend still multiplies matrices too large for one message"""
+    servicer, client = compute_backend({}, grpc_max_message_bytes=message_bytes(20, 20, 20))
+    rng = random.Random(5)
+    request = MatrixMultiplyRequest(
+        matrix_a=random_matrix(40, 30, rng), matrix_b=random_matrix(30, 40, rng)
+    )
+
+    response = await client.multiply_matrices(request)
+
+    for row, expected_row in zip(response.result, multiply(request.matrix_a, request.matrix_b)):
+        assert row == pytest.approx(expected_row)
+    assert servicer.calls["MultiplyMatrices"] > 1
@@ -0,0 +1,18 @@
+import pytest
+from httpx import AsyncClient
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_metrics_use_route_templates():
+    """HTTP metrics are labelled with the route template, not the raw path"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await client.get("/api/v1/ml/models")
+        await client.get("/does-not-exist/12345")
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        body = response.text
+        assert 'endpoint="/api/v1/ml/models"' in body
+        assert 'endpoint="unmatched"' in body
+        assert "/does-not-exist/12345" not in body
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import app
+from app.profiling import profile_thread, render_flamegraph
+
+client = TestClient(app)
+
+
+def busy_function(stop: threading.Event):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_profile_thread_collapses_stacks():
+    """Samples of a busy thread end in the function doing the work"""
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_function, args=(stop,))
+    worker.start()
+    try:
+        time.sleep(0.05)
+        stacks = profile_thread(worker.ident, seconds=0.3, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert sum(stacks.values()) > 10
+    assert all(";" in stack for stack in stacks)
+    assert any("test_profiling:busy_function" in stack for stack in stacks)
+
+    svg = render_flamegraph(stacks)
+    assert svg.startswith("<svg") and "busy_function" in svg
+
+
+def test_profile_endpoint_requires_admin_key():
+    """/debug/profile is rejected without the configured admin key"""
+    settings = get_settings()
+    original = settings.admin_api_key
+    try:
+        settings.admin_api_key = ""
+        assert client.get("/debug/profile?seconds=0.1").status_code == 403
+
+        settings.admin_api_key = "secret"
+        response = client.get("/debug/profile?seconds=0.1", headers={"X-Admin-Key": "wrong"})
+        assert response.status_code == 403
+
+        response = client.get(
+            "/debug/profile?seconds=0.2&interval_ms=5",
+            headers={"X-Admin-Key": "secret"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text.strip()
+    finally:
+        settings.admin_api_key = original
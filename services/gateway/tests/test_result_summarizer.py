@@ -0,0 +1,89 @@
+import json
+import math
+
+from app.services.result_summarizer import ResultSummarizer, estimate_tokens
+
+
+def test_small_result_is_unchanged():
+    """Small results are passed through as-is"""
+    summarizer = ResultSummarizer()
+    result = {"result": [[1.0, 2.0], [3.0, 4.0]], "computation_time_ms": 0.5}
+
+    assert summarizer.summarize(result) == result
+
+
+def test_large_matrix_is_summarized():
+    """Large matrices are reduced to shape, statistics, sampled rows and histogram"""
+    summarizer = ResultSummarizer(max_sample_rows=3, max_sample_items=4, histogram_bins=5)
+    matrix = [[float(i * 200 + j) for j in range(200)] for i in range(200)]
+
+    digest = summarizer.summarize({"result": matrix})["result"]
+
+    assert digest["type"] == "matrix"
+    assert digest["shape"] == [200, 200]
+    assert digest["stats"]["count"] == 40000
+    assert digest["stats"]["min"] == 0.0
+    assert digest["stats"]["max"] == 39999.0
+    assert list(digest["sample_rows"].keys()) == ["0", "100", "199"]
+    assert all(len(row) == 4 for row in digest["sample_rows"].values())
+    assert sum(digest["histogram"]["counts"]) == 40000
+
+
+def test_render_respects_token_budget():
+    """Prompt size stays within the budget regardless of result size"""
+    summarizer = ResultSummarizer(token_budget=200)
+    small = summarizer.render({"data": list(range(1000))})
+    large = summarizer.render({"data": list(range(1_000_000)), "note": "x" * 10_000})
+
+    assert estimate_tokens(small) <= 200
+    assert estimate_tokens(large) <= 200
+    assert json.loads(large)["data"]["length"] == 1_000_000
+
+
+def test_render_shrinks_instead_of_truncating():
+    """Results with many keys and long strings still render as valid JSON"""
+    summarizer = ResultSummarizer(token_budget=50)
+    result = {f"key_{i}": "x" * 500 for i in range(100)}
+
+    text = summarizer.render(result)
+
+    assert estimate_tokens(text) <= 50
+    assert json.loads(text)["_omitted_keys"] > 0
+
+
+def test_non_finite_values_are_counted_separately():
+    """NaN and infinity are left out of statistics and histogram"""
+    summarizer = ResultSummarizer(max_sample_items=2, histogram_bins=4)
+    values = [float(i) for i in range(100)] + [math.inf, -math.inf, math.nan]
+
+    digest = summarizer.summarize({"data": values})["data"]
+
+    assert digest["non_finite"] == 3
+    assert digest["stats"]["count"] == 100
+    assert digest["stats"]["max"] == 99.0
+    assert sum(digest["histogram"]["counts"]) == 100
+    text = summarizer.render({"data": values})
+    assert "NaN" not in text and "Infinity" not in text
+    json.loads(text)
+
+
+def test_render_scans_each_value_once(monkeypatch):
+    """Shrinking the digest reuses statistics and histograms instead of rescanning"""
+    scans = []
+    statistics = ResultSummarizer._statistics
+    histograms = ResultSummarizer._histograms
+    monkeypatch.setattr(ResultSummarizer, "_statistics",
+                        staticmethod(lambda values: scans.append("stats") or statistics(values)))
+    monkeypatch.setattr(ResultSummarizer, "_histograms",
+                        staticmethod(lambda values, bins: scans.append("hist")
+                                     or histograms(values, bins)))
+    summarizer = ResultSummarizer(token_budget=100)
+    result = {
+        "a": [[float(i * 300 + j) for j in range(300)] for i in range(300)],
+        "b": [float(i) for i in range(100_000)],
+    }
+
+    text = summarizer.render(result)
+
+    assert json.loads(text)["a"]["shape"] == [300, 300]
+    assert sorted(scans) == ["hist", "hist", "stats", "stats"]
@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import grpc
+import pytest
+
+from app.models.schemas import StatsAnalysisRequest
+from app.services.compute_client import call_timeout
+from app.services import retry_policy
+from app.services.retry_policy import RetryBudget
+from benchmarks.fake_compute import FakeComputeServer
+
+REQUEST = StatsAnalysisRequest(data=[1.0, 2.0, 3.0], operations=["mean"])
+
+
+@pytest.mark.asyncio
+async def test_invalid_argument_is_not_retried(compute_backend):
+    """Non-transient errors fail on the first attempt"""
+    servicer, client = compute_backend({"AnalyzeStatistics": {"error_rate": 1.0,
+                                                      "error_code": "INVALID_ARGUMENT"}})
+    with pytest.raises(grpc.RpcError) as error:
+        await client.analyze_statistics(REQUEST)
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert servicer.calls["AnalyzeStatistics"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unavailable_is_retried_quickly(compute_backend):
+    """Transient errors are retried with sub-second backoff"""
+    servicer, client = compute_backend({"AnalyzeStatistics": {"error_rate": 1.0,
+                                                      "error_code": "UNAVAILABLE"}})
+    started = time.perf_counter()
+    with pytest.raises(grpc.RpcError) as error:
+        await client.analyze_statistics(REQUEST)
+    assert error.value.code() == grpc.StatusCode.UNAVAILABLE
+    assert servicer.calls["AnalyzeStatistics"] == 3
+    assert time.perf_counter() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_attempts_share_the_request_deadline(compute_backend):
+    """A slow backend cannot stretch a request beyond grpc_timeout"""
+    servicer, client = compute_backend({"AnalyzeStatistics": {"latency": {"ms": 2000}}}, grpc_timeout=1)
+    started = time.perf_counter()
+    with pytest.raises(grpc.RpcError) as error:
+        await client.analyze_statistics(REQUEST)
+    assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert time.perf_counter() - started < 1.5
+    assert servicer.calls["AnalyzeStatistics"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queueing_for_a_slot_counts_against_the_deadline(compute_backend):
+    """A call queued behind the concurrency limit only gets the time left afterwards"""
+    servicer, client = compute_backend(
+        {"AnalyzeStatistics": {"latency": {"ms": 700}}}, grpc_timeout=1,
+        concurrency_initial_limit=1, concurrency_min_limit=1, concurrency_max_limit=1
+    )
+    started = time.perf_counter()
+    first, second = await asyncio.gather(
+        client.analyze_statistics(REQUEST), client.analyze_statistics(REQUEST),
+        return_exceptions=True
+    )
+
+    assert first.mean == 2.0
+    assert isinstance(second, grpc.RpcError)
+    assert second.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert time.perf_counter() - started < 1.3
+
+
+@pytest.mark.asyncio
+async def test_exhausted_call_timeout_is_not_replaced_by_the_default(compute_backend):
+    """A call with no time left fails at once instead of getting the full grpc_timeout"""
+    servicer, client = compute_backend({}, grpc_timeout=30)
+    call_timeout.set(0.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client.analyze_statistics(REQUEST)
+    assert servicer.calls["AnalyzeStatistics"] == 0
+
+
+def test_retry_budget():
+    """Retries are limited to a fraction of requests once the reserve is spent"""
+    budget = RetryBudget(ratio=0.5, min_per_second=0.0, max_tokens=1.0)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_goes_to_the_second_backend(compute_backend):
+    """A call outliving the p95 is answered by a hedged copy on the other backend"""
+    with FakeComputeServer() as fast:
+        slow, client = compute_backend({"AnalyzeStatistics": {"latency": {"ms": 1000}}},
+                               hedging_enabled=True, hedge_min_delay_ms=20,
+                               compute_service_hedge_url=fast.address)
+        tracker = retry_policy.get_latency_tracker("statistics")
+        for _ in range(50):
+            tracker.record(0.02)
+
+        started = time.perf_counter()
+        response = await client.analyze_statistics(REQUEST)
+        elapsed = time.perf_counter() - started
+
+    assert response.mean == pytest.approx(2.0)
+    assert elapsed < 0.5
+    assert slow.calls["AnalyzeStatistics"] == 1
+    assert fast.servicer.calls["AnalyzeStatistics"] == 1
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from app import compute_pb2
+from app.services.concurrency_limiter import AdaptiveLimiter, OverloadedError
+from app.services.scheduler import FairQueue, Waiter, classify, estimate_cost
+
+
+def test_cost_estimate_and_lanes():
+    """Cheap requests are interactive, huge ones go to the batch lane"""
+    small = compute_pb2.MatrixMultiplyRequest(rows_a=2, cols_a=2, cols_b=2)
+    simulation = compute_pb2.MonteCarloRequest(iterations=10_000_000, dimensions=2)
+    stats = compute_pb2.StatsAnalysisRequest(data=[0.0] * 10_000)
+
+    assert estimate_cost("matrix_multiply", small) == 8
+    assert classify(estimate_cost("matrix_multiply", small)) == "interactive"
+    assert classify(estimate_cost("statistics", stats)) == "standard"
+    assert classify(estimate_cost("monte_carlo", simulation)) == "batch"
+
+
+def test_sparse_cost_scales_with_nonzeros():
+    """Sparse products cost per stored entry, not per dense multiply-add"""
+    a = compute_pb2.SparseMatrix(rows=1000, cols=1000, values=[1.0] * 5000)
+    b = compute_pb2.SparseMatrix(rows=1000, cols=1000, values=[1.0] * 2000)
+    dense_b = compute_pb2.DenseMatrix(rows=1000, cols=16)
+
+    assert estimate_cost(
+        "sparse_matrix_multiply", compute_pb2.SparseMatrixMultiplyRequest(matrix_a=a, dense_b=dense_b)
+    ) == 5000 * 16
+    assert estimate_cost(
+        "sparse_matrix_multiply", compute_pb2.SparseMatrixMultiplyRequest(matrix_a=a, sparse_b=b)
+    ) == 5000 * 2
+
+def test_fair_queue_dispatches_by_weight():
+    """Backlogged lanes get dispatches in proportion to their weights"""
+    queue = FairQueue({"interactive": 4.0, "batch": 1.0})
+    for _ in range(20):
+        queue.push(Waiter(None, "batch", "a"))
+    for _ in range(20):
+        queue.push(Waiter(None, "interactive", "a"))
+
+    first = [queue.pop(lambda w: True).lane for _ in range(10)]
+    assert first.count("interactive") == 8
+    assert first.count("batch") == 2
+
+
+def test_fair_queue_skips_ineligible_clients():
+    """A client over its quota does not block other clients in the same lane"""
+    queue = FairQueue({"standard": 1.0})
+    queue.push(Waiter(None, "standard", "greedy"))
+    queue.push(Waiter(None, "standard", "polite"))
+
+    assert queue.pop(lambda w: w.client != "greedy").client == "polite"
+    assert queue.pop(lambda w: w.client != "greedy") is None
+    assert len(queue) == 1
+
+
+@pytest.mark.asyncio
+async def test_interactive_request_overtakes_queued_batch_work():
+    """When a slot frees up, a cheap request goes before earlier batch requests"""
+    limiter = AdaptiveLimiter("test", initial_limit=2, min_limit=2, max_limit=2,
+                              lane_weights={"interactive": 8.0, "standard": 4.0, "batch": 1.0})
+    await limiter.acquire("batch", "a")
+    await limiter.acquire("batch", "a")
+
+    order = []
+
+    async def request(lane):
+        await limiter.acquire(lane, "b")
+        order.append(lane)
+
+    tasks = [asyncio.create_task(request("batch")) for _ in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("interactive")))
+    await asyncio.sleep(0)
+
+    limiter.release(0.01, client="a")
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert order == ["interactive"]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_per_key_quota():
+    """One API key cannot hold more than its share of the limit"""
+    limiter = AdaptiveLimiter("test", initial_limit=4, min_limit=4, max_limit=4,
+                              key_max_share=0.5, queue_timeout=0.05)
+    await limiter.acquire("standard", "greedy")
+    await limiter.acquire("standard", "greedy")
+
+    with pytest.raises(OverloadedError):
+        await limiter.acquire("standard", "greedy")
+    await limiter.acquire("standard", "other")
+    assert limiter.inflight == 3
+
+
+@pytest.mark.asyncio
+async def test_free_slot_is_not_blocked_by_a_client_over_quota():
+    """Another client gets a free slot while an over-quota client has requests queued"""
+    limiter = AdaptiveLimiter("test", initial_limit=4, min_limit=4, max_limit=4,
+                              key_max_share=0.5, max_queue=1)
+    await limiter.acquire("standard", "greedy")
+    await limiter.acquire("standard", "greedy")
+    queued = asyncio.create_task(limiter.acquire("standard", "greedy"))
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    await asyncio.wait_for(limiter.acquire("standard", "other"), 0.1)
+
+    assert limiter.inflight == 3
+    assert limiter.queued == 1
+    queued.cancel()
+    await asyncio.gather(queued, return_exceptions=True)
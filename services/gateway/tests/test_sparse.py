@@ -0,0 +1,154 @@
+import random
+
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from app.config import get_settings
+from app.main import app
+from app.models.schemas import MatrixMultiplyRequest, SparseMatrix
+from app.services.sparse import density, from_coo, from_dense, to_csr, to_dense
+
+
+def sparse_matrix(rows, cols, fill, rng):
+    return [[rng.uniform(-1, 1) if rng.random() < fill else 0.0 for _ in range(cols)]
+            for _ in range(rows)]
+
+
+def multiply(a, b):
+    columns = list(zip(*b))
+    return [[sum(x * y for x, y in zip(row, column)) for column in columns] for row in a]
+
+
+def test_coo_is_sorted_with_duplicates_summed_and_zeros_dropped():
+    csr = from_coo(3, 3, row=[2, 0, 0, 1, 1], col=[1, 2, 2, 0, 1], data=[5.0, 1.0, 2.0, 3.0, 0.0])
+
+    assert csr.indptr == [0, 1, 2, 3]
+    assert csr.indices == [2, 0, 1]
+    assert csr.data == [3.0, 3.0, 5.0]
+    assert to_dense(csr) == [[0.0, 0.0, 3.0], [3.0, 0.0, 0.0], [0.0, 5.0, 0.0]]
+
+
+def test_csr_input_is_canonicalized():
+    matrix = SparseMatrix(shape=[2, 3], indptr=[0, 2, 3], indices=[2, 0, 1], data=[1.0, 2.0, 3.0])
+
+    csr = to_csr(matrix)
+
+    assert csr.indices == [0, 2, 1]
+    assert csr.data == [2.0, 1.0, 3.0]
+    assert to_dense(matrix) == [[2.0, 0.0, 1.0], [0.0, 3.0, 0.0]]
+
+
+def test_dense_round_trip_and_density():
+    dense = [[0.0, 1.5], [0.0, 0.0], [-2.0, 0.0]]
+
+    assert to_dense(from_dense(dense)) == dense
+    assert density(dense) == pytest.approx(2 / 6)
+    sparse = SparseMatrix(format="coo", shape=[3, 2], row=[0], col=[1], data=[1.5])
+    assert density(sparse) == pytest.approx(1 / 6)
+
+
+@pytest.mark.parametrize("matrix", [
+    {"shape": [2, 2], "indptr": [0, 1], "indices": [0], "data": [1.0]},
+    {"shape": [2, 2], "indptr": [0, 1, 1], "indices": [2], "data": [1.0]},
+    {"format": "coo", "shape": [2, 2], "row": [0, 2], "col": [0, 0], "data": [1.0, 1.0]},
+    {"format": "coo", "shape": [2, 2], "data": [1.0]},
+    {"format": "ell", "shape": [2, 2], "data": []},
+    {"format": "coo", "shape": [2, 2_000_000], "row": [], "col": [], "data": []},
+    {"format": "coo", "shape": [100_000, 100_000], "row": [], "col": [], "data": []},
+])
+def test_inconsistent_sparse_matrices_are_rejected(matrix):
+    with pytest.raises(ValidationError):
+        MatrixMultiplyRequest(matrix_a=matrix, matrix_b=[[1.0], [1.0]])
+
+
+def test_sparse_dimensions_are_checked_against_the_other_factor():
+    with pytest.raises(ValidationError):
+        MatrixMultiplyRequest(
+            matrix_a={"shape": [2, 3], "indptr": [0, 0, 0], "indices": [], "data": []},
+            matrix_b=[[1.0], [1.0]]
+        )
+
+
+@pytest.mark.asyncio
+async def test_sparse_factors_run_on_the_sparse_kernels(compute_backend):
+    """Sparse A runs as spmm against dense B and as spgemm against sparse B"""
+    servicer, client = compute_backend({}, sparse_density_threshold=0.1)
+    rng = random.Random(3)
+    a = sparse_matrix(30, 40, 0.05, rng)
+    dense_b = sparse_matrix(40, 20, 1.0, rng)
+    sparse_b = sparse_matrix(40, 20, 0.05, rng)
+
+    spmm = await client.multiply_matrices(MatrixMultiplyRequest(matrix_a=a, matrix_b=dense_b))
+    spgemm = await client.multiply_matrices(MatrixMultiplyRequest(matrix_a=a, matrix_b=sparse_b))
+
+    assert servicer.calls["MultiplySparseMatrices"] == 2
+    assert spmm.kernel == "spmm"
+    for row, expected_row in zip(spmm.result, multiply(a, dense_b)):
+        assert row == pytest.approx(expected_row)
+    assert spgemm.kernel == "spgemm"
+    for row, expected_row in zip(spgemm.result, multiply(a, sparse_b)):
+        assert row == pytest.approx(expected_row)
+
+
+@pytest.mark.asyncio
+async def test_dense_factors_and_disabled_threshold_stay_dense(compute_backend):
+    servicer, client = compute_backend({}, sparse_density_threshold=0.0)
+    request = MatrixMultiplyRequest(
+        matrix_a={"format": "coo", "shape": [2, 2], "row": [1], "col": [0], "data": [2.0]},
+        matrix_b=[[1.0, 2.0], [3.0, 4.0]]
+    )
+
+    response = await client.multiply_matrices(request)
+
+    assert servicer.calls["MultiplySparseMatrices"] == 0
+    assert response.kernel == "dense"
+    # A sparse input makes the result sparse unless asked otherwise
+    assert response.result is None
+    assert to_dense(response.sparse_result) == [[0.0, 0.0], [2.0, 4.0]]
+
+
+@pytest.mark.asyncio
+async def test_sparse_multiplication_endpoint():
+    """CSR and COO inputs in, CSR or dense out"""
+    payload = {
+        "matrix_a": {
+            "format": "coo", "shape": [4, 4], "row": [0, 3], "col": [1, 2], "data": [2.0, 3.0]
+        },
+        "matrix_b": {
+            "shape": [4, 4], "indptr": [0, 0, 1, 2, 2], "indices": [3, 0], "data": [5.0, 7.0]
+        }
+    }
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        sparse = await client.post("/api/v1/compute/matrix/multiply", json=payload)
+        dense = await client.post(
+            "/api/v1/compute/matrix/multiply", json={**payload, "result_format": "dense"}
+        )
+
+    assert sparse.status_code == 200
+    result = sparse.json()["sparse_result"]
+    assert result["shape"] == [4, 4]
+    assert result["indptr"] == [0, 1, 1, 1, 2]
+    assert result["indices"] == [3, 0]
+    assert result["data"] == [10.0, 21.0]
+    assert dense.status_code == 200
+    assert dense.json()["result"] == [
+        [0.0, 0.0, 0.0, 10.0], [0.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0], [21.0, 0.0, 0.0, 0.0]
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("threshold, result_format", [(0.0, "auto"), (0.1, "dense")])
+async def test_sparse_inputs_are_not_densified_past_the_limit(monkeypatch, threshold,
+                                                               result_format):
+    """Products that would expand a huge sparse matrix are refused with 413"""
+    monkeypatch.setattr(get_settings(), "sparse_density_threshold", threshold)
+    monkeypatch.setattr(get_settings(), "dense_matrix_max_elements", 1_000_000)
+    identity = {"format": "coo", "shape": [20_000, 20_000],
+                "row": list(range(100)), "col": list(range(100)), "data": [1.0] * 100}
+    payload = {"matrix_a": identity, "matrix_b": identity, "result_format": result_format}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/api/v1/compute/matrix/multiply", json=payload)
+
+    assert response.status_code == 413
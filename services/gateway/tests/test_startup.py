@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.bench_startup import by_package, import_report
+
+GATEWAY_DIR = Path(__file__).resolve().parent.parent
+
+CHECK = """
+import sys
+import app.main
+print(",".join(sorted(m for m in ("openai", "app.routers.ai", "app.routers.ml") if m in sys.modules)))
+"""
+
+
+def _loaded(**env) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", CHECK], cwd=GATEWAY_DIR, env=dict(os.environ, **env),
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_openai_is_not_imported_at_startup():
+    """The AI router is mounted without importing the OpenAI SDK"""
+    assert _loaded() == "app.routers.ai,app.routers.ml"
+
+
+def test_disabled_routers_are_not_imported():
+    """AI_ENABLED / ML_ENABLED=false skip the routers entirely"""
+    assert _loaded(AI_ENABLED="false", ML_ENABLED="false") == ""
+
+
+def test_import_report():
+    """The import-time report attributes time to packages"""
+    total, rows = import_report("app.config")
+    assert total > 0
+    assert "pydantic_settings" in by_package(rows)
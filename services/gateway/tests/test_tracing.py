@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app import tracing
+from app.config import Settings
+from app.main import app
+from app.tracing import grpc_metadata, setup_tracing, shutdown_tracing, tracer
+
+exporter = InMemorySpanExporter()
+provider = TracerProvider()
+provider.add_span_processor(SimpleSpanProcessor(exporter))
+trace.set_tracer_provider(provider)
+
+
+@pytest.mark.asyncio
+async def test_request_spans():
+    """A request produces a server span with validate/handler/serialize children"""
+    exporter.clear()
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/ml/models", headers={"X-Request-ID": "abc123"})
+
+    assert response.headers["X-Request-ID"] == "abc123"
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    server = spans["GET /api/v1/ml/models"]
+    assert server.attributes["http.route"] == "/api/v1/ml/models"
+    assert server.attributes["request_id"] == "abc123"
+    for name in ("validate", "handler list_models", "serialize"):
+        assert spans[name].parent.span_id == server.context.span_id
+
+
+def test_grpc_metadata_carries_trace_context():
+    """Trace context and request ID are propagated in gRPC metadata"""
+    with tracer.start_as_current_span("parent") as span:
+        metadata = dict(grpc_metadata(request_id="req-1"))
+
+    trace_id = format(span.get_span_context().trace_id, "032x")
+    assert trace_id in metadata["traceparent"]
+    assert metadata["x-request-id"] == "req-1"
+
+
+def test_file_exporter_is_flushed_and_closed_on_shutdown(tmp_path):
+    """Spans reach the trace file and the exporter closes it with the provider"""
+    path = tmp_path / "traces.jsonl"
+    setup_tracing(Settings(tracing_enabled=True, tracing_exporter="file",
+                           tracing_file_path=str(path), tracing_sample_ratio=1.0))
+    with tracing._provider.get_tracer("test").start_as_current_span("batch job"):
+        pass
+    shutdown_tracing()
+
+    assert tracing._provider is None
+    assert json.loads(path.read_text().splitlines()[0])["name"] == "batch job"
+    exporter = tracing._file_exporter(str(path))
+    exporter.shutdown()
+    assert exporter.out.closed
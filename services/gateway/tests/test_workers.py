@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.services import compute_client
+from app.services.health_monitor import HealthMonitor
+from app.workers import LeaderLock, SharedFile, prepare_multiprocess_dir
+
+GATEWAY_DIR = Path(__file__).resolve().parent.parent
+
+WORKER = """
+from app.metrics import REQUEST_COUNT
+REQUEST_COUNT.labels(method="GET", endpoint="/health", status="200").inc(5)
+"""
+
+SCRAPE = """
+from app.metrics import render_latest
+print(render_latest().decode())
+"""
+
+
+def _run(code: str, directory: str) -> str:
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory)
+    return subprocess.run([sys.executable, "-c", code], cwd=GATEWAY_DIR, env=env,
+                          capture_output=True, text=True, check=True).stdout
+
+
+def test_metrics_are_aggregated_over_workers(tmp_path):
+    """/metrics reports totals over every worker process"""
+    directory = prepare_multiprocess_dir(str(tmp_path / "metrics"))
+    _run(WORKER, directory)
+    _run(WORKER, directory)
+
+    output = _run(SCRAPE, directory)
+    assert 'http_requests_total{endpoint="/health",method="GET",status="200"} 10.0' in output
+
+
+def test_leader_lock_and_shared_file(tmp_path):
+    """Only one holder of the leader lock; shared documents round-trip"""
+    first = LeaderLock(str(tmp_path / "leader.lock"))
+    second = LeaderLock(str(tmp_path / "leader.lock"))
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
+
+    shared = SharedFile(str(tmp_path / "state.json"))
+    assert shared.read() is None
+    shared.write({"status": "healthy"})
+    assert shared.read() == {"status": "healthy"}
+
+
+@pytest.mark.asyncio
+async def test_follower_uses_the_leaders_health_snapshot(compute_backend, monkeypatch, tmp_path):
+    """Only the leader worker polls compute health"""
+    servicer, client = compute_backend({})
+    monkeypatch.setattr(compute_client, "_client", client)
+    leader = HealthMonitor(interval=0.05, shared_dir=str(tmp_path))
+    follower = HealthMonitor(interval=0.05, shared_dir=str(tmp_path))
+
+    assert leader._leader.acquire()
+    await leader.refresh()
+    follower.start()
+    snapshot = await follower.snapshot()
+    await follower.stop()
+    leader._leader.release()
+
+    assert snapshot["compute_status"] == "healthy"
+    assert snapshot["checked_at"] == leader.checked_at
+    assert servicer.calls["HealthCheck"] == 1